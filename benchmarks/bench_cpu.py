@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+'''Time per update of cpu usage sampling, psutil calls against a single read of /proc/stat
+usage: python3 benchmarks/bench_cpu.py [iterations]'''
+
+import os, sys
+from time import perf_counter
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+import bpytop
+from bpytop import CpuStat
+
+ITERATIONS: int = int(ARGS[0]) if ARGS else 2000
+
+def with_psutil():
+	psutil.cpu_percent(percpu=False)
+	psutil.cpu_times_percent()
+	psutil.cpu_percent(percpu=True)
+	psutil.getloadavg()
+	psutil.boot_time()
+
+def with_proc_stat():
+	CpuStat.sample()
+	CpuStat.load_avg()
+
+def main():
+	if bpytop.SYSTEM != "Linux":
+		print("/proc/stat sampling is only available on Linux")
+		return
+	print(f'{ITERATIONS} updates with {bpytop.THREADS} threads')
+	for name, function in [("psutil", with_psutil), ("/proc/stat", with_proc_stat)]:
+		function()
+		start = perf_counter()
+		for _ in range(ITERATIONS):
+			function()
+		print(f'{name:<12} {(perf_counter() - start) / ITERATIONS * 1000000:>8.1f} us/update')
+
+if __name__ == "__main__":
+	main()
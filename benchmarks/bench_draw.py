@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+'''Bytes per frame and frame time for the default four box layout, with and without diff_draw
+usage: python3 benchmarks/bench_draw.py [frames] [width] [height]'''
+
+import os, sys, io
+from time import perf_counter, sleep
+from contextlib import redirect_stdout
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpytop
+from bpytop import Box, Draw, Screen, Term, CpuCollector, MemCollector, NetCollector, ProcCollector
+
+FRAMES: int = int(ARGS[0]) if len(ARGS) > 0 else 30
+WIDTH: int = int(ARGS[1]) if len(ARGS) > 1 else 200
+HEIGHT: int = int(ARGS[2]) if len(ARGS) > 2 else 60
+COLLECTORS = [CpuCollector, MemCollector, NetCollector, ProcCollector]
+
+def capture_frames():
+	'''Collect and draw FRAMES frames, returns the strings sent to the terminal and the time spent drawing boxes'''
+	frames, draw_times = [], []
+	bpytop.CONFIG.diff_draw = False
+	Term.width, Term.height = WIDTH, HEIGHT
+	bpytop.THEME = bpytop.Theme("Default")
+	Box.calc_sizes()
+	Box.draw_bg(now=False)
+	for collector in COLLECTORS:
+		collector._collect()
+	for _ in range(FRAMES):
+		for collector in COLLECTORS:
+			collector._collect()
+		start = perf_counter()
+		for collector in COLLECTORS:
+			collector._draw()
+		buffer = io.StringIO()
+		with redirect_stdout(buffer):
+			Draw.out()
+		draw_times.append(perf_counter() - start)
+		frames.append(buffer.getvalue())
+		sleep(0.1)
+	return frames, draw_times
+
+def main():
+	frames, draw_times = capture_frames()
+	Screen.reset()
+	diffs, render_times = [], []
+	for frame in frames:
+		start = perf_counter()
+		diffs.append(Screen.render(frame))
+		render_times.append(perf_counter() - start)
+
+	def report(name: str, outputs, times):
+		size = [len(out.encode("utf-8")) for out in outputs[1:]]
+		print(f'{name:<8} first frame {len(outputs[0].encode("utf-8")):>8} bytes   '
+			f'avg {sum(size) // len(size):>8} bytes/frame   avg {sum(times[1:]) / len(times[1:]) * 1000:>7.2f} ms/frame')
+
+	print(f'{FRAMES} frames at {WIDTH}x{HEIGHT}, default four box layout')
+	report("string", frames, draw_times)
+	report("cells", diffs, [d + r for d, r in zip(draw_times, render_times)])
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+'''Bytes written per frame with and without minimize_escapes for every theme, drawing all boxes with live data.
+The raw and minimized output of each frame are run through the Screen terminal emulator to check that they draw the same screen
+usage: python3 benchmarks/bench_escapes.py [frames] [width] [height]'''
+
+import os, sys, io
+from time import perf_counter, sleep
+from contextlib import redirect_stdout
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpytop
+from bpytop import Box, Draw, Term, Theme, Screen, Minimizer, CONFIG, CpuCollector, MemCollector, NetCollector, ProcCollector
+
+FRAMES: int = int(ARGS[0]) if len(ARGS) > 0 else 10
+WIDTH: int = int(ARGS[1]) if len(ARGS) > 1 else 200
+HEIGHT: int = int(ARGS[2]) if len(ARGS) > 2 else 60
+
+def emulate(state, string: str):
+	'''Returns the screen state after drawing <string> on a screen in <state>, None for an empty screen'''
+	if state is None:
+		Screen.resize()
+		Screen.style = Screen.default_style
+	else:
+		Screen.glyphs, Screen.styles = [row[:] for row in state[0]], [row[:] for row in state[1]]
+		Screen.y, Screen.x, Screen.saved, Screen.style = state[2:]
+	Screen.render(string)
+	return (Screen.glyphs, Screen.styles, Screen.y, Screen.x, Screen.saved, Screen.style)
+
+def frame(first: bool) -> str:
+	'''Returns the raw output of drawing all boxes'''
+	if first: Box.draw_bg(now=False)
+	for collector in [CpuCollector, MemCollector, NetCollector, ProcCollector]:
+		collector._collect()
+		collector._draw()
+	out = io.StringIO()
+	with redirect_stdout(out):
+		Draw.out()
+	return out.getvalue()
+
+def main():
+	CONFIG.diff_draw = CONFIG.minimize_escapes = CONFIG.sync_output = False
+	CONFIG.shown_boxes = "cpu mem net proc"
+	Term.width, Term.height = WIDTH, HEIGHT
+	with redirect_stdout(io.StringIO()):
+		bpytop.THEME = Theme("Default")
+	print(f'{FRAMES} frames per theme, {WIDTH}x{HEIGHT}, bytes of first frame and average of the following frames')
+	print(f'{"theme":<20} {"first raw":>10} {"minimized":>10} {"update raw":>11} {"minimized":>10} {"saved":>6} {"ms/frame":>9}')
+	total_raw = total_min = 0
+	for name in Theme.themes:
+		with redirect_stdout(io.StringIO()):
+			bpytop.THEME(name)
+			Box.calc_sizes()
+		Minimizer.reset()
+		raw_state = min_state = None
+		sizes, seconds = [], 0.0
+		for n in range(FRAMES + 1):
+			raw: str = frame(first=n == 0)
+			start = perf_counter()
+			minimized: str = Minimizer.render(raw)
+			seconds += perf_counter() - start
+			raw_state, min_state = emulate(raw_state, raw), emulate(min_state, minimized)
+			if raw_state[:2] != min_state[:2]:
+				print(f'{name}: frame {n} differs after minimizing!')
+				raise SystemExit(1)
+			sizes.append((len(raw.encode("utf-8")), len(minimized.encode("utf-8"))))
+			if n < FRAMES: sleep(0.1)
+		update_raw = sum(size[0] for size in sizes[1:]) // FRAMES
+		update_min = sum(size[1] for size in sizes[1:]) // FRAMES
+		total_raw, total_min = total_raw + update_raw, total_min + update_min
+		print(f'{name:<20} {sizes[0][0]:>10} {sizes[0][1]:>10} {update_raw:>11} {update_min:>10} {100 - update_min * 100 // max(update_raw, 1):>5}% {seconds / (FRAMES + 1) * 1000:>9.2f}')
+	print(f'{"all themes":<20} {"":>10} {"":>10} {total_raw:>11} {total_min:>10} {100 - total_min * 100 // max(total_raw, 1):>5}%')
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+'''Time per process list update through psutil and through the native /proc reader (Linux only)
+usage: python3 benchmarks/bench_proc.py [updates]'''
+
+import os, sys
+from time import perf_counter, sleep
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpytop
+from bpytop import ProcCollector
+
+UPDATES: int = int(ARGS[0]) if len(ARGS) > 0 else 20
+
+def run(native: bool) -> float:
+	'''Returns average seconds per ProcCollector._collect() with proc_native set to <native>'''
+	bpytop.CONFIG.proc_native = native
+	bpytop.CONFIG.proc_tree = False
+	bpytop.Box.boxes = ["proc"]
+	ProcCollector._collect()
+	times = []
+	for _ in range(UPDATES):
+		sleep(0.05)
+		start = perf_counter()
+		ProcCollector._collect()
+		times.append(perf_counter() - start)
+	return sum(times) / len(times)
+
+def main():
+	if bpytop.SYSTEM != "Linux":
+		print("The native /proc reader is only available on Linux")
+		return
+	print(f'{UPDATES} updates, {sum(1 for pid in os.listdir("/proc") if pid.isdigit())} processes')
+	for name, native in (("psutil", False), ("native", True)):
+		print(f'{name:<8} avg {run(native) * 1000:>7.2f} ms/update')
+
+if __name__ == "__main__":
+	main()
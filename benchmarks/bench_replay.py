@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+'''Collect and draw time per update for each collector, replaying samples recorded with "bpytop.py --record FILE"
+usage: python3 benchmarks/bench_replay.py recording [width] [height]'''
+
+import os, sys, io
+from time import perf_counter
+from contextlib import redirect_stdout
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpytop
+from bpytop import Box, Draw, Term, Recorder, CpuCollector, MemCollector, NetCollector, ProcCollector
+
+if not ARGS:
+	print(__doc__.splitlines()[-1])
+	raise SystemExit(1)
+RECORDING: str = ARGS[0]
+WIDTH: int = int(ARGS[1]) if len(ARGS) > 1 else 200
+HEIGHT: int = int(ARGS[2]) if len(ARGS) > 2 else 60
+
+def main():
+	Recorder.load(RECORDING)
+	collectors = [collector for collector in [CpuCollector, MemCollector, NetCollector, ProcCollector] if Recorder.ticks(collector)]
+	bpytop.CONFIG.diff_draw = False
+	bpytop.CONFIG.shown_boxes = " ".join(collector.buffer for collector in collectors)
+	Term.width, Term.height = WIDTH, HEIGHT
+	bpytop.THEME = bpytop.Theme("Default")
+	Box.calc_sizes()
+	Box.draw_bg(now=False)
+
+	print(f'{RECORDING}, {WIDTH}x{HEIGHT}, config from recording')
+	for collector in collectors:
+		ticks: int = Recorder.ticks(collector)
+		collect_time = draw_time = 0.0
+		size: int = 0
+		for _ in range(ticks):
+			start = perf_counter()
+			Recorder.collect(collector)
+			collect_time += perf_counter() - start
+			start = perf_counter()
+			collector._draw()
+			buffer = io.StringIO()
+			with redirect_stdout(buffer):
+				Draw.out(collector.buffer)
+			draw_time += perf_counter() - start
+			size += len(buffer.getvalue().encode("utf-8"))
+		print(f'{collector.buffer:<5} {ticks:>5} samples   collect avg {collect_time / ticks * 1000:>7.2f} ms   draw avg {draw_time / ticks * 1000:>7.2f} ms   avg {size // ticks:>7} bytes')
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+'''Collector and draw times against a generated /proc and /sys tree, for sizes not available on the machine running it (Linux only)
+Results are appended as a json line to [results] if given, to be able to follow them over time
+usage: python3 benchmarks/bench_scale.py [cpus] [processes] [disks] [updates] [results]'''
+
+import os, sys, io, json, tempfile
+from time import perf_counter, time
+from contextlib import redirect_stdout
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpytop
+from bpytop import Box, CpuBox, Term, CONFIG, CpuCollector, MemCollector, ProcCollector, ProcReader
+from tests.fakeroot import FakeRoot
+
+CPUS: int = int(ARGS[0]) if len(ARGS) > 0 else 512
+PROCESSES: int = int(ARGS[1]) if len(ARGS) > 1 else 50000
+DISKS: int = int(ARGS[2]) if len(ARGS) > 2 else 64
+UPDATES: int = int(ARGS[3]) if len(ARGS) > 3 else 5
+RESULTS: str = ARGS[4] if len(ARGS) > 4 else ""
+
+def timed(fake: FakeRoot, func) -> float:
+	'''Returns average seconds per call of <func>, with counters in the tree advanced before each call'''
+	func()
+	times = []
+	for _ in range(UPDATES):
+		fake.tick(1.0)
+		start = perf_counter()
+		func()
+		times.append(perf_counter() - start)
+	return sum(times) / len(times)
+
+def draw_cpu():
+	CpuCollector._collect()
+	with redirect_stdout(io.StringIO()):
+		CpuBox._draw_fg()
+
+def main():
+	if bpytop.SYSTEM != "Linux":
+		print("Reading a generated /proc and /sys tree is only supported on Linux")
+		return
+	results = {}
+	with tempfile.TemporaryDirectory() as root:
+		start = perf_counter()
+		fake = FakeRoot(root, cpus=CPUS, processes=PROCESSES, depth=64, disks=DISKS, nics=4, sensors=4, batteries=1)
+		fake.create()
+		print(f'Generated {CPUS} cpus, {PROCESSES} processes, {DISKS} disks in {perf_counter() - start:.1f} s')
+
+		bpytop.set_fs_root(root)
+		Term.width, Term.height = 200, 60
+		bpytop.THEME = bpytop.Theme("Default")
+		CONFIG.shown_boxes = "cpu mem net proc"
+		CONFIG.check_temp, CONFIG.cpu_sensor = True, "Auto"
+		CONFIG.show_disks, CONFIG.io_mode = True, False
+		CpuCollector.get_sensors()
+		Box.calc_sizes()
+
+		results["cpu collect+draw"] = timed(fake, draw_cpu)
+		results["cpu temps"] = timed(fake, CpuCollector._collect_temps)
+		MemCollector.collect_disks = True
+		results["mem disks"] = timed(fake, MemCollector._collect)
+		results["proc read"] = timed(fake, ProcReader.process_iter)
+		procs = ProcReader.process_iter()
+		ProcCollector._process_iter = classmethod(lambda cls, err: procs)
+		CONFIG.proc_tree, CONFIG.tree_depth = False, 3
+		results["proc list"] = timed(fake, ProcCollector._collect)
+		CONFIG.proc_tree = True
+		results["proc tree"] = timed(fake, ProcCollector._collect)
+		bpytop.set_fs_root("")
+
+	for name, seconds in results.items():
+		print(f'{name:<17} avg {seconds * 1000:>8.2f} ms')
+	if RESULTS:
+		with open(RESULTS, "a") as f:
+			f.write(json.dumps({ "time" : round(time()), "version" : bpytop.VERSION, "cpus" : CPUS, "processes" : PROCESSES, "disks" : DISKS,
+				"ms" : { name : round(seconds * 1000, 3) for name, seconds in results.items() }}) + "\n")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+'''Memory and append time of full graph histories kept in Series against plain lists trimmed with del list[0]
+usage: python3 benchmarks/bench_series.py [threads] [width] [updates]'''
+
+import os, sys
+from time import perf_counter
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bpytop import Series
+
+THREADS: int = int(ARGS[0]) if len(ARGS) > 0 else 256
+WIDTH: int = int(ARGS[1]) if len(ARGS) > 1 else 400
+UPDATES: int = int(ARGS[2]) if len(ARGS) > 2 else 2000
+
+def size_of(obj) -> int:
+	'''Size of a list of ints including the int objects not shared by the small int cache, or of a Series with its array'''
+	if isinstance(obj, Series): return sys.getsizeof(obj) + sys.getsizeof(obj.data)
+	return sys.getsizeof(obj) + sum(sys.getsizeof(value) for value in obj if not -5 <= value <= 256)
+
+def run_lists() -> float:
+	history = [[0] * WIDTH * 2 for _ in range(THREADS)]
+	start = perf_counter()
+	for update in range(UPDATES):
+		for n, values in enumerate(history):
+			values.append((update * 7 + n) % 101)
+			if len(values) > WIDTH * 2:
+				del values[0]
+	seconds = perf_counter() - start
+	run_lists.size = sum(size_of(values) for values in history)
+	return seconds
+
+def run_series() -> float:
+	history = [Series(WIDTH * 2) for _ in range(THREADS)]
+	for values in history:
+		for _ in range(WIDTH * 2):
+			values.append(0)
+	start = perf_counter()
+	for update in range(UPDATES):
+		for n, values in enumerate(history):
+			values.append((update * 7 + n) % 101)
+	seconds = perf_counter() - start
+	run_series.size = sum(size_of(values) for values in history)
+	return seconds
+
+def main():
+	print(f'{THREADS} threads, {WIDTH * 2} values each, {UPDATES} updates')
+	for name, func in [("list", run_lists), ("Series", run_series)]:
+		seconds = func()
+		print(f'{name:<7} append+trim avg {seconds / UPDATES * 1000:>7.3f} ms per update   memory {func.size // 1024:>7} KiB')
+
+if __name__ == "__main__":
+	main()
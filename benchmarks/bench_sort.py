@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+'''Sort cost per update for a synthetic process list, eval() expressions against key functions and top-N selection, and list against tree mode
+usage: python3 benchmarks/bench_sort.py [processes] [updates] [sorting]'''
+
+import os, sys, random
+from heapq import nlargest
+from time import perf_counter, time
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bpytop
+from bpytop import ProcInfo, ProcCollector, ProcBox, CONFIG, THREADS
+
+PROCESSES: int = int(ARGS[0]) if len(ARGS) > 0 else 10000
+UPDATES: int = int(ARGS[1]) if len(ARGS) > 1 else 20
+SORTING: str = ARGS[2] if len(ARGS) > 2 else "cpu lazy"
+
+#* The eval() expressions ProcCollector used before sort_key()
+SORT_EXPR = {
+	"pid" : "p.info['pid']",
+	"program" : "'' if p.info['name'] == 0.0 else p.info['name']",
+	"arguments" : "' '.join(str(p.info['cmdline'])) or ('' if p.info['name'] == 0.0 else p.info['name'])",
+	"threads" : "0 if p.info['num_threads'] == 0.0 else p.info['num_threads']",
+	"user" : "'' if p.info['username'] == 0.0 else p.info['username']",
+	"memory" : "p.info['memory_percent']",
+	"cpu lazy" : "(sum(p.info['cpu_times'][:2] if not p.info['cpu_times'] == 0.0 else [0.0, 0.0]) * 1000 / (time() - p.info['create_time']))",
+	"cpu responsive" : "(p.info['cpu_percent'] if CONFIG.proc_per_core else (p.info['cpu_percent'] / THREADS))" }
+
+def create_processes():
+	'''Synthetic processes where a few use a lot of cpu and most are idle'''
+	now = time()
+	return [ProcInfo(pid, {
+		"pid" : pid,
+		"ppid" : random.randint(max(0, pid - 100), pid - 1),
+		"name" : f'proc{random.randint(0, 999)}',
+		"cmdline" : [f'/usr/bin/proc{pid}', "--arg", str(pid)],
+		"num_threads" : random.randint(1, 64),
+		"username" : random.choice(["root", "user", "www-data"]),
+		"memory_percent" : random.random() ** 4 * 10,
+		"memory_info" : None,
+		"cpu_percent" : random.random() ** 8 * 100,
+		"cpu_times" : (random.random() * 100, random.random() * 10),
+		"create_time" : now - random.random() * 100000 }) for pid in range(1, PROCESSES + 1)]
+
+def update(procs):
+	'''Small changes to cpu usage of a fifth of the processes'''
+	for p in random.sample(procs, len(procs) // 5):
+		p.info["cpu_percent"] = max(0.0, p.info["cpu_percent"] + random.uniform(-2.0, 2.0))
+		p.info["cpu_times"] = (p.info["cpu_times"][0] + random.random(), p.info["cpu_times"][1])
+
+def timed(procs, func) -> float:
+	times = []
+	for _ in range(UPDATES):
+		update(procs)
+		start = perf_counter()
+		func()
+		times.append(perf_counter() - start)
+	return sum(times) / len(times)
+
+def main():
+	random.seed(0)
+	procs = create_processes()
+	CONFIG.proc_sorting = SORTING
+	CONFIG.proc_tree = False
+	CONFIG.proc_mem_bytes = False
+	bpytop.Box.boxes = ["proc"]
+	ProcBox.start, ProcBox.select_max = 1, 40
+	ProcCollector._process_iter = classmethod(lambda cls, err: procs)
+	sort_cmd = compile(SORT_EXPR[SORTING], "str", "eval")
+	namespace = {"time" : time, "CONFIG" : CONFIG, "THREADS" : THREADS}
+
+	results = {
+		"eval sorted" : timed(procs, lambda: sorted(procs, key=lambda p: eval(sort_cmd, namespace, {"p" : p}), reverse=True)),
+		"key sorted" : timed(procs, lambda: sorted(procs, key=ProcCollector.sort_key(SORTING), reverse=True)),
+		"key top-N" : timed(procs, lambda: nlargest(ProcBox.select_max * 3, procs, key=ProcCollector.sort_key(SORTING))) }
+	ProcBox.select_max = PROCESSES
+	results["collect all"] = timed(procs, ProcCollector._collect)
+	ProcBox.select_max = 40
+	results["collect top"] = timed(procs, ProcCollector._collect)
+	CONFIG.proc_tree = True
+	CONFIG.tree_depth = 3
+	results["collect tree"] = timed(procs, ProcCollector._collect)
+
+	print(f'{PROCESSES} processes, {UPDATES} updates, sorting by "{SORTING}", {ProcBox.select_max} visible rows')
+	for name, seconds in results.items():
+		print(f'{name:<12} avg {seconds * 1000:>7.2f} ms/update')
+
+if __name__ == "__main__":
+	main()
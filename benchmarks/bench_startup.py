@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+'''Cold start times in fresh processes: import of bpytop, first frame with boxes drawn and first full data with all boxes collected and drawn
+usage: python3 benchmarks/bench_startup.py [runs] [width] [height]'''
+
+import os, sys, io, json, subprocess
+from time import perf_counter
+from contextlib import redirect_stdout
+
+ARGS = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHILD: bool = ARGS[:1] == ["--child"]
+if CHILD: ARGS = ARGS[1:]
+RUNS: int = int(ARGS[0]) if len(ARGS) > 0 else 10
+WIDTH: int = int(ARGS[1]) if len(ARGS) > 1 else 200
+HEIGHT: int = int(ARGS[2]) if len(ARGS) > 2 else 60
+
+def child():
+	'''Runs the same steps as main() without a terminal and prints seconds since start for each as json'''
+	start = perf_counter()
+	import bpytop
+	from bpytop import Box, Draw, Term, Probe, CpuCollector, MemCollector, NetCollector, ProcCollector
+	times = { "import" : perf_counter() - start }
+	with redirect_stdout(io.StringIO()):
+		Probe.start()
+		bpytop.CONFIG.shown_boxes = "cpu mem net proc"
+		Term.width, Term.height = WIDTH, HEIGHT
+		bpytop.THEME = bpytop.Theme(bpytop.CONFIG.color_theme)
+		Probe.wait()
+		Box.calc_sizes()
+		Box.draw_bg(now=False)
+		Draw.out()
+		times["first frame"] = perf_counter() - start
+		for collector in [CpuCollector, MemCollector, NetCollector, ProcCollector]:
+			collector._collect()
+			collector._draw()
+		Draw.out()
+		times["first full data"] = perf_counter() - start
+	print(json.dumps(times))
+
+def main():
+	results = {}
+	for _ in range(RUNS):
+		start = perf_counter()
+		out = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--child", str(RUNS), str(WIDTH), str(HEIGHT)], universal_newlines=True)
+		total = perf_counter() - start
+		for name, seconds in list(json.loads(out.splitlines()[-1]).items()) + [("process", total)]:
+			results.setdefault(name, []).append(seconds)
+	print(f'{RUNS} runs, {WIDTH}x{HEIGHT}, seconds since start of import, "process" includes interpreter startup and exit')
+	for name, times in results.items():
+		times.sort()
+		print(f'{name:<16} median {times[len(times) // 2] * 1000:>8.1f} ms   min {times[0] * 1000:>8.1f} ms   max {times[-1] * 1000:>8.1f} ms')
+
+if __name__ == "__main__":
+	if CHILD: child()
+	else: main()
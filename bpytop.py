@@ -17,19 +17,20 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import os, sys, io, threading, signal, re, subprocess, logging, logging.handlers, argparse
-import urllib.request
-from time import time, sleep, strftime, tzset
+import os, sys, io, threading, signal, re, subprocess, logging, logging.handlers, argparse, json, csv, gzip, pickle, types, mmap
+from time import time, sleep, strftime, tzset, perf_counter
 from datetime import timedelta
 from _thread import interrupt_main
-from collections import defaultdict
+from collections import defaultdict, namedtuple, deque, OrderedDict
+from array import array
 from select import select
-from distutils.util import strtobool
 from string import Template
 from math import ceil, floor
+from heapq import nlargest, nsmallest
+from itertools import islice
 from random import randint
 from shutil import which
-from typing import List, Dict, Tuple, Union, Any, Iterable
+from typing import List, Dict, Tuple, Union, Any, Iterable, Callable
 
 errors: List[str] = []
 try: import fcntl, termios, tty, pwd
@@ -63,16 +64,63 @@ args.add_argument("-b", "--boxes",		action="store",	dest="boxes", 	help = "which
 args.add_argument("-lc", "--low-color", action="store_true", 			help = "disable truecolor, converts 24-bit colors to 256-color")
 args.add_argument("-v", "--version",	action="store_true", 			help = "show version info and exit")
 args.add_argument("--debug",			action="store_true", 			help = "start with loglevel set to DEBUG overriding value set in config")
-stdargs = args.parse_args()
-
-if stdargs.version:
-	print(f'bpytop version: {VERSION}\n'
-		f'psutil version: {".".join(str(x) for x in psutil.version_info)}')
-	raise SystemExit(0)
+args.add_argument("--headless",		action="store_true", 			help = "run without the tui and write one record per update to stdout or --output")
+args.add_argument("--format",			action="store",	dest="format", default="json", choices=["json", "csv"], help = "record format in headless mode, \"json\" (one json object per line) or \"csv\"")
+args.add_argument("-o", "--output",	action="store",	dest="output", 	help = "file to append records to in headless mode, defaults to stdout")
+args.add_argument("--fields",			action="store",	dest="fields", 	help = "fields to write in headless mode separated by commas, example: --fields \"cpu,mem_used,procs\", \"--fields list\" lists available fields")
+args.add_argument("--record",			action="store",	dest="record", 	help = "record the data read by collectors to a file that can be replayed with benchmarks/bench_replay.py")
+args.add_argument("--top",			action="store",	dest="top", type=int, default=10, help = "number of processes included in the procs field in headless mode or in the table in batch mode, sorted by proc_sorting, 0 for all")
+args.add_argument("-n", "--count",		action="store",	dest="count", type=int, default=0, help = "batch mode, print a plain text summary and process table this many times and exit")
+args.add_argument("-d", "--delay",		action="store",	dest="delay", type=float, help = "seconds between updates in batch mode, defaults to update_ms from config")
+args.add_argument("--refresh-probes",	action="store_true", help = "ignore cached hardware probe results from earlier runs and probe again")
+args.add_argument("--filter",			action="store",	dest="filter", default="", help = "process filter in batch mode, same format as the filter in the process box")
+
+#* Defaults until parse_args() is called when started, importing bpytop doesn't read sys.argv
+ARG_BOXES: str = ""
+LOW_COLOR: bool = False
+DEBUG: bool = False
+HEADLESS: bool = False
+ARG_FORMAT: str = "json"
+ARG_OUTPUT: str = ""
+ARG_FIELDS: str = ""
+ARG_TOP: int = 10
+ARG_RECORD: str = ""
+ARG_COUNT: int = 0
+ARG_DELAY: Union[float, None] = None
+ARG_FILTER: str = ""
+ARG_REFRESH_PROBES: bool = False
+
+def parse_args(argv: Union[List[str], None] = None):
+	'''Parse <argv> (defaults to sys.argv) into the ARG_* globals, set debug logging and shown boxes from them, exits after printing version with -v'''
+	global ARG_BOXES, LOW_COLOR, DEBUG, HEADLESS, ARG_FORMAT, ARG_OUTPUT, ARG_FIELDS, ARG_TOP, ARG_RECORD, ARG_COUNT, ARG_DELAY, ARG_FILTER, ARG_REFRESH_PROBES
+	stdargs = args.parse_args(argv)
+
+	if stdargs.version:
+		print(f'bpytop version: {VERSION}\n'
+			f'psutil version: {".".join(str(x) for x in psutil.version_info)}')
+		raise SystemExit(0)
+
+	ARG_BOXES = stdargs.boxes or ""
+	LOW_COLOR = stdargs.low_color
+	HEADLESS = stdargs.headless
+	ARG_FORMAT = stdargs.format
+	ARG_OUTPUT = stdargs.output or ""
+	ARG_FIELDS = stdargs.fields or ""
+	ARG_TOP = stdargs.top
+	ARG_RECORD = stdargs.record or ""
+	ARG_COUNT = stdargs.count
+	ARG_DELAY = stdargs.delay
+	ARG_FILTER = stdargs.filter
+	ARG_REFRESH_PROBES = stdargs.refresh_probes
+
+	if stdargs.debug:
+		DEBUG = True
+		errlog.setLevel(logging.DEBUG)
+		errlog.info("Loglevel set to DEBUG")
+	errlog.debug(f'CMD: {" ".join(sys.argv if argv is None else argv)}')
 
-ARG_BOXES: str = stdargs.boxes
-LOW_COLOR: bool = stdargs.low_color
-DEBUG: bool = stdargs.debug
+	if ARG_BOXES:
+		CONFIG.shown_boxes = " ".join(box for box in ARG_BOXES.split() if box in ["cpu", "mem", "net", "proc"])
 
 #? Variables ------------------------------------------------------------------------------------->
 
@@ -108,6 +156,18 @@ update_ms=$update_ms
 #* Set to 2 or higher to greatly decrease bpytop cpu usage. (Only integers)
 proc_update_mult=$proc_update_mult
 
+#* Set separate update times in milliseconds for single collectors, collectors not set here uses "update_ms" ("update_ms" times "proc_update_mult" for processes).
+#* Available collectors "cpu" "mem" "disks" "net" "proc", use format "collector:ms" separate with a comma ",". Example: "cpu:250, net:250, proc:5000, disks:5000"
+collector_intervals="$collector_intervals"
+
+#* Stretch the update time of collectors that are slow to collect and draw, up to 10 times their normal update time,
+#* so that no collector spends more than a tenth of its update time working. Cheap collectors keeps their normal update time.
+adaptive_intervals=$adaptive_intervals
+
+#* Time in milliseconds to wait for collectors running in parallel before drawing, boxes with collectors not done in time keeps their last values
+#* and gets a greyed out title until the collector finishes. Set to 0 to run collectors one after another.
+collect_timeout=$collect_timeout
+
 #* Processes sorting, "pid" "program" "arguments" "threads" "user" "memory" "cpu lazy" "cpu responsive",
 #* "cpu lazy" updates top process over time, "cpu responsive" updates top process directly.
 proc_sorting="$proc_sorting"
@@ -133,6 +193,9 @@ proc_per_core=$proc_per_core
 #* Show process memory as bytes instead of percent
 proc_mem_bytes=$proc_mem_bytes
 
+#* Read process info directly from /proc instead of through psutil, lowers cpu usage with a lot of processes. (Linux only)
+proc_native=$proc_native
+
 #* Sets the CPU stat shown in upper half of the CPU graph, "total" is always available, see:
 #* https://psutil.readthedocs.io/en/latest/#psutil.cpu_times for attributes available on specific platforms.
 #* Select from a list of detected attributes from the options menu
@@ -152,6 +215,13 @@ cpu_single_graph=$cpu_single_graph
 #* Shows the system uptime in the CPU box.
 show_uptime=$show_uptime
 
+#* Show cpu usage, memory, threads and terminal output rate of bpytop itself in the bottom of the CPU box.
+show_self=$show_self
+
+#* Raise "update_ms" automatically while bpytop uses more than this percent of one cpu core, 0 to disable.
+#* The raise is removed again when usage drops below half of this value.
+self_limit=$self_limit
+
 #* Check cpu temperature, needs "osx-cpu-temp" on MacOS X.
 check_temp=$check_temp
 
@@ -173,6 +243,15 @@ draw_clock="$draw_clock"
 #* Update main ui in background when menus are showing, set this to false if the menus is flickering too much for comfort.
 background_update=$background_update
 
+#* Only send the characters that changed since last update to the terminal, greatly lowers the amount of data sent over slow connections like ssh.
+diff_draw=$diff_draw
+
+#* Remove color changes and cursor moves not changing anything from the output when diff_draw is off, sends about 9-16% less data for around 2 ms of cpu time per update.
+minimize_escapes=$minimize_escapes
+
+#* Wrap each update in the synchronized output sequences, terminals supporting it shows the whole update at once instead of drawing it in parts.
+sync_output=$sync_output
+
 #* Custom cpu model name, empty string to disable.
 custom_cpu_name="$custom_cpu_name"
 
@@ -227,6 +306,9 @@ net_color_fixed=$net_color_fixed
 #* Starts with the Network Interface specified here.
 net_iface="$net_iface"
 
+#* Keep cpu, memory, network and disk io graph history in memory mapped files in "~/.config/bpytop/history" to show it again after a restart, only the first running instance uses them.
+persist_history=$persist_history
+
 #* Show battery stats in top right if battery is present
 show_battery=$show_battery
 
@@ -263,6 +345,10 @@ else:
 			break
 USER_THEME_DIR: str = f'{CONFIG_DIR}/themes'
 
+#* Roots of procfs and sysfs read by collectors, changed with set_fs_root() to read from a generated tree
+PROC_PATH: str = "/proc"
+SYS_PATH: str = "/sys"
+
 CORES: int = psutil.cpu_count(logical=False) or 1
 THREADS: int = psutil.cpu_count(logical=True) or 1
 
@@ -404,8 +490,95 @@ def timeit_decorator(func):
 		return out
 	return timed
 
+class Stats:
+	'''Rolling samples of what bpytop itself costs, kept for each box and for the terminal writes under "frame"
+	* .add(name, stat, value) : Add a sample of <stat> ("collect", "draw", "write", "bytes" or "rw_calls") for <name>
+	* .percentiles(name, stat) : Returns p50, p95 and max of the samples in the ring
+	* .rw_calls() : Returns read and write calls (syscr + syscw) made by the calling thread so far, 0 if /proc/thread-self/io isn't available
+	* .draw() : Draws the overlay box to the "stats" buffer
+	* .dump() : Writes all percentiles to CONFIG_DIR/stats.json
+	'''
+	size: int = 256
+	shown: bool = False
+	samples: Dict[str, Dict[str, deque]] = {}
+	names: List[str] = ["cpu", "mem", "net", "proc", "frame"]
+	local = threading.local()
+
+	@classmethod
+	def add(cls, name: str, stat: str, value: Union[int, float]):
+		if not name in cls.samples:
+			cls.samples[name] = {}
+		if not stat in cls.samples[name]:
+			cls.samples[name][stat] = deque(maxlen=cls.size)
+		cls.samples[name][stat].append(value)
+
+	@classmethod
+	def percentiles(cls, name: str, stat: str) -> Tuple[float, float, float]:
+		ring: List[float] = sorted(cls.samples.get(name, {}).get(stat, []))
+		if not ring: return 0.0, 0.0, 0.0
+		return ring[len(ring) // 2], ring[min(len(ring) - 1, len(ring) * 95 // 100)], ring[-1]
+
+	@classmethod
+	def rw_calls(cls) -> int:
+		#* The file is kept open per thread and read with pread, the read itself is subtracted by the callers taking deltas
+		fd: int = getattr(cls.local, "fd", None)
+		if fd is None:
+			try:
+				fd = os.open("/proc/thread-self/io", os.O_RDONLY)
+			except OSError:
+				fd = -1
+			cls.local.fd = fd
+		if fd < 0: return 0
+		count: int = 0
+		for line in os.pread(fd, 512, 0).split(b"\n"):
+			if line.startswith(b"syscr") or line.startswith(b"syscw"):
+				count += int(line.split()[1])
+		return count
+
+	@classmethod
+	def draw(cls):
+		width: int = 60
+		if Term.width < width + 2 or Term.height < len(cls.names) + 5: return
+		x, y = Term.width - width, 2
+		out: str = (f'{create_box(x, y, width, len(cls.names) + 4, "stats")}'
+			f'{Mv.to(y + 1, x + 2)}{THEME.title}{Fx.b}{"":<5}{"collect ms":>17} {"draw/write ms":>17}{"bytes":>8}{"r/w":>6}'
+			f'{Mv.to(y + 2, x + 2)}{THEME.main_fg}{Fx.ub}{"":<5}' + f'{"p50":>6}{"p95":>6}{"max":>6}' * 2 + f'{"p50":>8}{"p50":>6}')
+		for n, name in enumerate(cls.names, start=3):
+			out += f'{Mv.to(y + n, x + 2)}{THEME.title}{name:<5}{THEME.main_fg}'
+			for stat in ["collect", "write" if name == "frame" else "draw"]:
+				if not stat in cls.samples.get(name, {}):
+					out += " " * 18
+					continue
+				out += "".join(f'{value:>6.1f}' if value < 1000 else f'{value:>6.0f}' for value in cls.percentiles(name, stat))
+			out += f'{floating_humanizer(cls.percentiles(name, "bytes")[0], short=True):>8}{cls.percentiles(name, "rw_calls")[0]:>6.0f}'
+		Draw.buffer("stats", out, z=1)
+
+	@classmethod
+	def dump(cls, *args):
+		'''Write percentiles of all samples to CONFIG_DIR/stats.json, takes signal handler arguments to be usable for SIGUSR1'''
+		out: Dict[str, Dict[str, Dict[str, float]]] = {}
+		for name, stats in cls.samples.items():
+			out[name] = {}
+			for stat in stats:
+				p50, p95, high = cls.percentiles(name, stat)
+				out[name][stat] = { "p50" : p50, "p95" : p95, "max" : high, "samples" : len(stats[stat]) }
+		try:
+			with open(f'{CONFIG_DIR}/stats.json', "w") as f:
+				json.dump({ "time" : round(time()), "version" : VERSION, "update_ms" : CONFIG.update_ms, "stats" : out }, f, indent=2)
+		except Exception as e:
+			errlog.exception(f'Failed to write stats: {e}')
+		else:
+			errlog.info(f'Wrote stats to {CONFIG_DIR}/stats.json')
+
 #? Set up config class and load config ----------------------------------------------------------->
 
+def strtobool(val: str) -> bool:
+	'''Convert a string representation of truth to True or False, same values as distutils.util.strtobool without importing distutils'''
+	val = val.lower()
+	if val in ("y", "yes", "t", "true", "on", "1"): return True
+	if val in ("n", "no", "f", "false", "off", "0"): return False
+	raise ValueError(f'invalid truth value {val!r}')
+
 class Config:
 	'''Holds all config variables and functions for loading from and saving to disk'''
 	keys: List[str] = ["color_theme", "update_ms", "proc_sorting", "proc_reversed", "proc_tree", "check_temp", "draw_clock", "background_update", "custom_cpu_name",
@@ -413,7 +586,9 @@ class Config:
 						"swap_disk", "show_disks", "use_fstab", "net_download", "net_upload", "net_auto", "net_color_fixed", "show_init", "theme_background",
 						"net_sync", "show_battery", "tree_depth", "cpu_sensor", "show_coretemp", "proc_update_mult", "shown_boxes", "net_iface", "only_physical",
 						"truecolor", "io_mode", "io_graph_combined", "io_graph_speeds", "show_io_stat", "cpu_graph_upper", "cpu_graph_lower", "cpu_invert_lower",
-						"cpu_single_graph", "show_uptime", "temp_scale", "show_cpu_freq"]
+						"cpu_single_graph", "show_uptime", "temp_scale", "show_cpu_freq", "diff_draw", "proc_native", "collector_intervals", "collect_timeout",
+						"show_self", "self_limit", "adaptive_intervals", "persist_history",
+						"minimize_escapes", "sync_output"]
 	conf_dict: Dict[str, Union[str, int, bool]] = {}
 	color_theme: str = "Default"
 	theme_background: bool = True
@@ -421,6 +596,10 @@ class Config:
 	shown_boxes: str = "cpu mem net proc"
 	update_ms: int = 2000
 	proc_update_mult: int = 2
+	collector_intervals: str = ""
+	collect_timeout: int = 1000
+	adaptive_intervals: bool = False
+	persist_history: bool = False
 	proc_sorting: str = "cpu lazy"
 	proc_reversed: bool = False
 	proc_tree: bool = False
@@ -429,11 +608,14 @@ class Config:
 	proc_gradient: bool = True
 	proc_per_core: bool = False
 	proc_mem_bytes: bool = True
+	proc_native: bool = False
 	cpu_graph_upper: str = "total"
 	cpu_graph_lower: str = "total"
 	cpu_invert_lower: bool = True
 	cpu_single_graph: bool = False
 	show_uptime: bool = True
+	show_self: bool = False
+	self_limit: int = 0
 	check_temp: bool = True
 	cpu_sensor: str = "Auto"
 	show_coretemp: bool = True
@@ -441,6 +623,9 @@ class Config:
 	show_cpu_freq: bool = True
 	draw_clock: str = "%X"
 	background_update: bool = True
+	diff_draw: bool = False
+	minimize_escapes: bool = False
+	sync_output: bool = True
 	custom_cpu_name: str = ""
 	disks_filter: str = ""
 	update_check: bool = True
@@ -470,22 +655,11 @@ class Config:
 	sorting_options: List[str] = ["pid", "program", "arguments", "threads", "user", "memory", "cpu lazy", "cpu responsive"]
 	log_levels: List[str] = ["ERROR", "WARNING", "INFO", "DEBUG"]
 	cpu_percent_fields: List = ["total"]
-	cpu_percent_fields.extend(getattr(psutil.cpu_times_percent(), "_fields", []))
 	temp_scales: List[str] = ["celsius", "fahrenheit", "kelvin", "rankine"]
+	collector_names: List[str] = ["cpu", "mem", "disks", "net", "proc"]
 
 	cpu_sensors: List[str] = [ "Auto" ]
 
-	if hasattr(psutil, "sensors_temperatures"):
-		try:
-			_temps = psutil.sensors_temperatures()
-			if _temps:
-				for _name, _entries in _temps.items():
-					for _num, _entry in enumerate(_entries, 1):
-						if hasattr(_entry, "current"):
-							cpu_sensors.append(f'{_name}:{_num if _entry.label == "" else _entry.label}')
-		except:
-			pass
-
 	changed: bool = False
 	recreate: bool = False
 	config_file: str = ""
@@ -564,27 +738,55 @@ class Config:
 		if "update_ms" in new_config and int(new_config["update_ms"]) < 100:
 			new_config["update_ms"] = 100
 			self.warnings.append(f'Config key "update_ms" can\'t be lower than 100!')
+		if "collector_intervals" in new_config and not new_config["collector_intervals"] == "":
+			for interval in new_config["collector_intervals"].split(","): #type: ignore
+				name, _, ms = interval.partition(":")
+				if not name.strip() in self.collector_names or not ms.strip().isdigit():
+					new_config["collector_intervals"] = "_error_"
+					self.warnings.append(f'Config key "collector_intervals" contains invalid collector names or values!')
+					break
 		for net_name in ["net_download", "net_upload"]:
 			if net_name in new_config and not new_config[net_name][0].isdigit(): # type: ignore
 				new_config[net_name] = "_error_"
-		if "cpu_sensor" in new_config and not new_config["cpu_sensor"] in self.cpu_sensors:
-			new_config["cpu_sensor"] = "_error_"
-			self.warnings.append(f'Config key "cpu_sensor" does not contain an available sensor!')
 		if "shown_boxes" in new_config and not new_config["shown_boxes"] == "":
 			for box in new_config["shown_boxes"].split(): #type: ignore
 				if not box in ["cpu", "mem", "net", "proc"]:
 					new_config["shown_boxes"] = "_error_"
 					self.warnings.append(f'Config key "shown_boxes" contains invalid box names!')
 					break
-		for cpu_graph in ["cpu_graph_upper", "cpu_graph_lower"]:
-			if cpu_graph in new_config and not new_config[cpu_graph] in self.cpu_percent_fields:
-				new_config[cpu_graph] = "_error_"
-				self.warnings.append(f'Config key "{cpu_graph}" does not contain an available cpu stat attribute!')
 		if "temp_scale" in new_config and not new_config["temp_scale"] in self.temp_scales:
 			new_config["temp_scale"] = "_error_"
 			self.warnings.append(f'Config key "temp_scale" does not contain a recognized temperature scale!')
 		return new_config
 
+	def probe(self):
+		'''Get available cpu stat attributes and sensors and check the config values using them, run by Probe instead of at import since reading sensors can be slow'''
+		if len(self.cpu_percent_fields) > 1: return
+		self.cpu_percent_fields.extend(Probe.get("cpu_percent_fields", lambda: list(getattr(psutil.cpu_times_percent(), "_fields", []))))
+		self.cpu_sensors.extend(Probe.get("cpu_sensors", self._get_sensors))
+		if not self.cpu_sensor in self.cpu_sensors:
+			errlog.warning(f'Config key "cpu_sensor" does not contain an available sensor!')
+			self.cpu_sensor = "Auto"
+		for cpu_graph in ["cpu_graph_upper", "cpu_graph_lower"]:
+			if not getattr(self, cpu_graph) in self.cpu_percent_fields:
+				errlog.warning(f'Config key "{cpu_graph}" does not contain an available cpu stat attribute!')
+				setattr(self, cpu_graph, "total")
+
+	@staticmethod
+	def _get_sensors() -> List[str]:
+		sensors: List[str] = []
+		if hasattr(psutil, "sensors_temperatures"):
+			try:
+				temps = psutil.sensors_temperatures()
+				if temps:
+					for name, entries in temps.items():
+						for num, entry in enumerate(entries, 1):
+							if hasattr(entry, "current"):
+								sensors.append(f'{name}:{num if entry.label == "" else entry.label}')
+			except:
+				pass
+		return sensors
+
 	def save_config(self):
 		'''Save current config to config file if difference in values or version, creates a new file if not found'''
 		if not self.changed and not self.recreate: return
@@ -596,15 +798,11 @@ class Config:
 
 try:
 	CONFIG: Config = Config(CONFIG_FILE)
-	if DEBUG:
-		errlog.setLevel(logging.DEBUG)
-	else:
-		errlog.setLevel(getattr(logging, CONFIG.log_level))
-		DEBUG = CONFIG.log_level == "DEBUG"
+	errlog.setLevel(getattr(logging, CONFIG.log_level))
+	DEBUG = CONFIG.log_level == "DEBUG"
 	errlog.info(f'New instance of bpytop version {VERSION} started with pid {os.getpid()}')
-	errlog.info(f'Loglevel set to {"DEBUG" if DEBUG else CONFIG.log_level}')
+	errlog.info(f'Loglevel set to {CONFIG.log_level}')
 	errlog.debug(f'Using psutil version {".".join(str(x) for x in psutil.version_info)}')
-	errlog.debug(f'CMD: {" ".join(sys.argv)}')
 	if CONFIG.info:
 		for info in CONFIG.info:
 			errlog.info(info)
@@ -617,14 +815,6 @@ except Exception as e:
 	errlog.exception(f'{e}')
 	raise SystemExit(1)
 
-if ARG_BOXES:
-	_new_boxes: List = []
-	for _box in ARG_BOXES.split():
-		if _box in ["cpu", "mem", "net", "proc"]:
-			_new_boxes.append(_box)
-	CONFIG.shown_boxes = " ".join(_new_boxes)
-	del _box, _new_boxes
-
 if SYSTEM == "Linux" and not os.path.isdir("/sys/class/power_supply"):
 	CONFIG.show_battery = False
 
@@ -654,6 +844,8 @@ class Term:
 	mouse_off			= "\033[?1002l" 						#* Disable mouse reporting
 	mouse_direct_on		= "\033[?1003h"							#* Enable reporting of mouse position at any movement
 	mouse_direct_off	= "\033[?1003l"							#* Disable direct mouse reporting
+	sync_start			= "\033[?2026h"							#* Begin synchronized update, terminal holds drawing until sync_end
+	sync_end			= "\033[?2026l"							#* End synchronized update
 	winch = threading.Event()
 	old_boxes: List = []
 	min_width: int = 0
@@ -710,7 +902,7 @@ class Term:
 
 		Key.mouse = {}
 		Box.calc_sizes()
-		Collector.proc_counter = 1
+		ProcCollector.due = 0.0
 		if Menu.active: Menu.resized = True
 		Box.draw_bg(now=False)
 		cls.resized = False
@@ -927,6 +1119,7 @@ class Key:
 	@classmethod
 	def _get_key(cls):
 		"""Get a key or escape sequence from stdin, convert to readable format and save to keys list. Meant to be run in it's own thread."""
+		SelfStat.register("key")
 		input_key: str = ""
 		clean_key: str = ""
 		try:
@@ -1010,19 +1203,54 @@ class Draw:
 	idle.set()
 
 	@classmethod
-	def now(cls, *args):
-		'''Wait for input reader and self to be idle then print to screen'''
+	def now(cls, *args, sync: bool = False):
+		'''Wait for input reader and self to be idle then print to screen, <sync> wraps a full frame in synchronized update sequences'''
 		Key.idle.wait()
 		cls.idle.wait()
 		cls.idle.clear()
-		try:
-			print(*args, sep="", end="", flush=True)
-		except BlockingIOError:
-			pass
-			Key.idle.wait()
-			print(*args, sep="", end="", flush=True)
+		if CONFIG.diff_draw:
+			args = (Screen.render("".join(str(arg) for arg in args)),)
+		elif CONFIG.minimize_escapes:
+			args = (Minimizer.render("".join(str(arg) for arg in args)),)
+		out: str = "".join(str(arg) for arg in args)
+		if sync and CONFIG.sync_output and out: out = f'{Term.sync_start}{out}{Term.sync_end}'
+		data: bytes = out.encode("utf-8")
+		start: float = perf_counter()
+		rw_calls: int = Stats.rw_calls()
+		cls.write(data)
+		written: int = len(data)
+		SelfStat.written += written
+		Stats.add("frame", "write", (perf_counter() - start) * 1000)
+		Stats.add("frame", "rw_calls", max(Stats.rw_calls() - rw_calls - 1, 0))
+		Stats.add("frame", "bytes", written)
 		cls.idle.set()
 
+	@classmethod
+	def write(cls, data: bytes):
+		'''Write <data> to stdout file descriptor, continues after partial writes and waits for the terminal if it would block.
+		Goes through sys.stdout.write instead when stdout has been redirected'''
+		try:
+			fd: int = sys.stdout.fileno() if sys.stdout is sys.__stdout__ else -1
+		except (AttributeError, ValueError, io.UnsupportedOperation):
+			fd = -1
+		if fd < 0:
+			sys.stdout.write(data.decode("utf-8"))
+			sys.stdout.flush()
+			return
+		while True:
+			try:
+				sys.stdout.flush()
+				break
+			except BlockingIOError:
+				select([], [fd], [], 0.1)
+		view = memoryview(data)
+		pos: int = 0
+		while pos < len(view):
+			try:
+				pos += os.write(fd, view[pos:])
+			except BlockingIOError:
+				select([], [fd], [], 0.1)
+
 	@classmethod
 	def buffer(cls, name: str, *args: str, append: bool = False, now: bool = False, z: int = 100, only_save: bool = False, no_save: bool = False, once: bool = False):
 		string: str = ""
@@ -1057,7 +1285,7 @@ class Draw:
 						cls.saved[name] = cls.strings[name]
 					if clear or cls.once[name]:
 						cls.clear(name)
-			cls.now(out)
+			cls.now(out, sync=True)
 		else:
 			for name in sorted(cls.z_order, key=cls.z_order.get, reverse=True): #type: ignore
 				if name in cls.strings:
@@ -1068,7 +1296,7 @@ class Draw:
 						cls.clear(name)
 			if clear:
 				cls.clear()
-			cls.now(out)
+			cls.now(out, sync=True)
 
 	@classmethod
 	def saved_buffer(cls) -> str:
@@ -1102,6 +1330,352 @@ class Draw:
 				cls.saved = {}
 				cls.z_order = {}
 
+class Screen:
+	'''Emulates the terminal as a grid of cells, a back buffer with the wanted screen and a front buffer with what the terminal shows
+	* .render(string) : Apply string to back buffer and return the escape sequences needed to update the changed cells
+	* .reset() : Forget the front buffer, next render redraws all cells
+	'''
+	width: int = 0
+	height: int = 0
+	glyphs: List[List[str]] = []
+	styles: List[List[Tuple[str, str, int]]] = []
+	front_glyphs: List[List[Union[str, None]]] = []
+	front_styles: List[List[Union[Tuple[str, str, int], None]]] = []
+	y: int = 0
+	x: int = 0
+	saved: Tuple[int, int] = (0, 0)
+	default_style: Tuple[str, str, int] = ("39", "49", 0)
+	style: Tuple[str, str, int] = default_style
+	pen: Union[Tuple[str, str, int], None] = None	#* Style currently set in the terminal, None if unknown
+	cursor: Union[Tuple[int, int], None] = None		#* Cursor position in the terminal, None if unknown
+	max_gap: int = 3								#* Unchanged cells between changed cells to rewrite instead of moving the cursor
+	style_cache: Dict[Tuple[Tuple[str, str, int], str], Tuple[str, str, int]] = {}
+	sgr_cache: Dict[Tuple[Union[Tuple[str, str, int], None], Tuple[str, str, int]], str] = {}
+
+	#* Bit values for text attributes and the sgr codes turning them on and off
+	attr_on: Dict[int, int] = { 1 : 1, 2 : 2, 3 : 4, 4 : 8, 5 : 16, 7 : 32, 9 : 64 }
+	attr_off: Dict[int, int] = { 22 : 1 | 2, 23 : 4, 24 : 8, 25 : 16, 27 : 32, 29 : 64 }
+	attr_codes: List[Tuple[int, str]] = [(1, "1"), (2, "2"), (4, "3"), (8, "4"), (16, "5"), (32, "7"), (64, "9")]
+
+	#* Precompiled regex for splitting a string in csi sequences, other escape sequences, text, newlines and carriage returns
+	token_re = re.compile(r'\033\[([0-9;?]*)([@-~])|(\033\][^\a]*\a|\033[^\[\]]?)|([^\033\n\r]+)|(\n)|(\r)')
+	#* Precompiled regex for finding characters taking up two cells
+	wide_re = re.compile('[\u1100-\u115f\u2e80-\u303e\u3041-\u33ff\u3400-\u4dbf\u4e00-\u9fff\ua000-\ua4cf\uac00-\ud7a3'
+						'\uf900-\ufaff\ufe30-\ufe4f\uff00-\uff60\uffe0-\uffe6\U0001f300-\U0001f64f\U0001f900-\U0001f9ff\U00020000-\U0003fffd]')
+
+	@classmethod
+	def resize(cls):
+		'''Create new buffers for current terminal size'''
+		cls.width, cls.height = Term.width, Term.height
+		cls.glyphs = [[" "] * cls.width for _ in range(cls.height)]
+		cls.styles = [[cls.default_style] * cls.width for _ in range(cls.height)]
+		cls.y, cls.x = min(cls.y, max(cls.height - 1, 0)), min(cls.x, cls.width)
+		cls.reset()
+
+	@classmethod
+	def reset(cls):
+		cls.front_glyphs = [[None] * cls.width for _ in range(cls.height)]
+		cls.front_styles = [[None] * cls.width for _ in range(cls.height)]
+		cls.pen = None
+		cls.cursor = None
+
+	@classmethod
+	def render(cls, string: str) -> str:
+		out: List[str] = []
+		if cls.width != Term.width or cls.height != Term.height: cls.resize()
+		for params, command, other, text, newline, carriage in cls.token_re.findall(string):
+			if text:
+				cls._write(text)
+			elif command == "m":
+				cls.style = cls.next_style(cls.style, params)
+			elif command in ["f", "H"]:
+				line, _, col = params.partition(";")
+				cls.y = min(max(int(line or 1), 1), cls.height) - 1
+				cls.x = min(max(int(col or 1), 1), cls.width) - 1
+			elif command in ["A", "B", "C", "D"]:
+				steps: int = int(params or 1)
+				if command == "A": cls.y = max(cls.y - steps, 0)
+				elif command == "B": cls.y = min(cls.y + steps, cls.height - 1)
+				elif command == "C": cls.x = min(cls.x + steps, cls.width - 1)
+				else: cls.x = max(min(cls.x, cls.width - 1) - steps, 0)
+			elif command == "s":
+				cls.saved = (cls.y, cls.x)
+			elif command == "u":
+				cls.y, cls.x = cls.saved
+			elif command == "J" and params == "2":
+				if cls.pen != cls.style: out.append(cls._sgr(cls.style))
+				out.append("\033[2J")
+				blank: Tuple[str, str, int] = (cls.style[0], cls.style[1], 0)
+				cls.glyphs = [[" "] * cls.width for _ in range(cls.height)]
+				cls.styles = [[blank] * cls.width for _ in range(cls.height)]
+				cls.front_glyphs = [[" "] * cls.width for _ in range(cls.height)]
+				cls.front_styles = [[blank] * cls.width for _ in range(cls.height)]
+			elif newline:
+				cls.y, cls.x = min(cls.y + 1, cls.height - 1), 0
+			elif carriage:
+				cls.x = 0
+			elif command and params.startswith("?") and params[1:] in ["1049", "1047", "47"]:
+				#* Switching between normal and alternate screen, draw pending changes before switching
+				cls._flush(out)
+				out.append(f'\033[{params}{command}')
+				if command == "h":
+					cls.reset()
+				else:
+					cls.front_glyphs = [row[:] for row in cls.glyphs]
+					cls.front_styles = [row[:] for row in cls.styles]
+					cls.cursor = None
+			elif command and params.startswith("?"):
+				out.append(f'\033[{params}{command}')
+			elif command:
+				#* Unknown sequence, pass it on and redraw everything on next flush
+				cls._flush(out)
+				out.append(f'\033[{params}{command}')
+				cls.reset()
+			else:
+				out.append(other)
+		cls._flush(out)
+		return "".join(out)
+
+	@classmethod
+	def _write(cls, text: str):
+		y, x = cls.y, cls.x
+		if y >= cls.height or x >= cls.width: return
+		if cls.wide_re.search(text):
+			glyphs, styles = cls.glyphs[y], cls.styles[y]
+			for char in text:
+				if x >= cls.width: break
+				glyphs[x] = char
+				styles[x] = cls.style
+				x += 1
+				if cls.wide_re.match(char) and x < cls.width:
+					glyphs[x] = ""
+					styles[x] = cls.style
+					x += 1
+		else:
+			end: int = min(x + len(text), cls.width)
+			cls.glyphs[y][x:end] = text[:end - x]
+			cls.styles[y][x:end] = [cls.style] * (end - x)
+			x = end
+		cls.x = x
+
+	@classmethod
+	def next_style(cls, style: Tuple[str, str, int], params: str) -> Tuple[str, str, int]:
+		'''Returns style after applying sgr sequence with <params> to <style>'''
+		new_style = cls.style_cache.get((style, params))
+		if new_style: return new_style
+		if len(cls.style_cache) > 4096: cls.style_cache.clear()
+		fg, bg, attrs = style
+		codes: List[str] = params.split(";")
+		i: int = 0
+		while i < len(codes):
+			code: int = int(codes[i]) if codes[i].isdigit() else 0
+			if code == 0:
+				fg, bg, attrs = cls.default_style
+			elif code in cls.attr_on:
+				attrs |= cls.attr_on[code]
+			elif code in cls.attr_off:
+				attrs &= ~cls.attr_off[code]
+			elif code in [38, 48]:
+				length: int = 5 if codes[i + 1:i + 2] == ["2"] else 3
+				color: str = ";".join(codes[i:i + length])
+				i += length - 1
+				if code == 38: fg = color
+				else: bg = color
+			elif code == 39 or 30 <= code <= 37 or 90 <= code <= 97:
+				fg = str(code)
+			elif code == 49 or 40 <= code <= 47 or 100 <= code <= 107:
+				bg = str(code)
+			i += 1
+		cls.style_cache[(style, params)] = (fg, bg, attrs)
+		return (fg, bg, attrs)
+
+	@classmethod
+	def sgr(cls, pen: Union[Tuple[str, str, int], None], style: Tuple[str, str, int]) -> str:
+		'''Returns the shortest sgr sequence changing terminal style from <pen> to <style>, <pen> None if unknown'''
+		out: Union[str, None] = cls.sgr_cache.get((pen, style))
+		if out: return out
+		if len(cls.sgr_cache) > 4096: cls.sgr_cache.clear()
+		key: Tuple[Union[Tuple[str, str, int], None], Tuple[str, str, int]] = (pen, style)
+		codes: List[str] = []
+		if pen is None or pen[2] & ~style[2]:
+			codes.append("0")
+			pen = cls.default_style
+		for bit, code in cls.attr_codes:
+			if style[2] & bit and not pen[2] & bit: codes.append(code)
+		if style[0] != pen[0]: codes.append(style[0])
+		if style[1] != pen[1]: codes.append(style[1])
+		out = cls.sgr_cache[key] = f'\033[{";".join(codes)}m'
+		return out
+
+	@classmethod
+	def _sgr(cls, style: Tuple[str, str, int]) -> str:
+		out: str = cls.sgr(cls.pen, style)
+		cls.pen = style
+		return out
+
+	@classmethod
+	def _flush(cls, out: List[str]):
+		'''Append escape sequences for all cells differing between back and front buffer to out'''
+		width: int = cls.width
+		for y in range(cls.height):
+			glyphs, styles = cls.glyphs[y], cls.styles[y]
+			front_glyphs, front_styles = cls.front_glyphs[y], cls.front_styles[y]
+			if glyphs == front_glyphs and styles == front_styles: continue
+			x: int = 0
+			while x < width:
+				if glyphs[x] == front_glyphs[x] and styles[x] == front_styles[x]:
+					x += 1
+					continue
+				end: int = x + 1
+				gap: int = 0
+				while end < width and gap <= cls.max_gap:
+					gap = gap + 1 if glyphs[end] == front_glyphs[end] and styles[end] == front_styles[end] else 0
+					end += 1
+				end -= gap
+				if x > 0 and glyphs[x] == "": x -= 1
+				if end < width and glyphs[end] == "": end += 1
+				if cls.cursor != (y, x):
+					if cls.cursor and cls.cursor[0] == y and x > cls.cursor[1]:
+						out.append(f'\033[{x - cls.cursor[1]}C')
+					else:
+						out.append(f'\033[{y + 1};{x + 1}f')
+				for i in range(x, end):
+					if not glyphs[i]: continue
+					if styles[i] != cls.pen: out.append(cls._sgr(styles[i]))
+					out.append(glyphs[i])
+				front_glyphs[x:end] = glyphs[x:end]
+				front_styles[x:end] = styles[x:end]
+				cls.cursor = (y, end) if end < width else None
+				x = end
+
+class Minimizer:
+	'''Removes escape sequences not changing anything from output not going through Screen, keeps track of the style and cursor
+	position in the terminal and only sends style changes and cursor moves when text is written or the screen erased, as the shortest
+	sequences getting there
+	* .render(string) : Returns string with redundant sgr sequences and cursor moves removed and the rest combined
+	* .reset() : Forget the terminal state, next style change and cursor move are sent in full
+	'''
+	width: int = 0
+	height: int = 0
+	style: Union[Tuple[str, str, int], None] = None	#* Style wanted by the output, None before the first sgr sequence
+	pen: Union[Tuple[str, str, int], None] = None		#* Style set in the terminal, None if unknown
+	target: Union[Tuple[int, int], None] = None			#* Cursor position wanted by the output, None if unknown
+	cursor: Union[Tuple[int, int], None] = None			#* Cursor position in the terminal, None if unknown
+	saved: Union[Tuple[int, int], None] = None			#* Cursor position saved in the terminal, None if unknown
+	moves: List[str] = []								#* Relative moves from an unknown position not sent yet
+
+	@classmethod
+	def reset(cls):
+		cls.pen = cls.target = cls.cursor = cls.saved = None
+		cls.moves = []
+
+	@classmethod
+	def render(cls, string: str) -> str:
+		out: List[str] = []
+		if cls.width != Term.width or cls.height != Term.height:
+			cls.width, cls.height = Term.width, Term.height
+			cls.reset()
+		width, height = cls.width, cls.height
+		style, pen, target, cursor, saved, moves = cls.style, cls.pen, cls.target, cls.cursor, cls.saved, cls.moves
+		next_style, default_style, wide_re, append = Screen.next_style, Screen.default_style, Screen.wide_re, out.append
+
+		def flush(with_style: bool = True):
+			'''Append the cursor move and style change waiting to be sent to out'''
+			nonlocal pen, cursor, moves
+			if target is not None:
+				if target != cursor:
+					append(cls._move(cursor, target))
+					cursor = target
+			elif moves:
+				out.extend(moves)
+				moves = []
+				cursor = None
+			if with_style and style is not None and style != pen:
+				append(Screen.sgr(pen, style))
+				pen = style
+
+		for params, command, other, text, newline, carriage in Screen.token_re.findall(string):
+			if text:
+				flush()
+				append(text)
+				if cursor:
+					x: int = cursor[1] + len(text)
+					if x < width and not text.isascii(): x += len(wide_re.findall(text))
+					#* Cursor position at the right margin depends on the terminal
+					cursor = (cursor[0], x) if x < width else None
+				target = cursor
+			elif command == "m":
+				style = next_style(style or default_style, params)
+			elif command in "fHABCD" and command:
+				if command in "fH":
+					line, _, col = params.partition(";")
+					target = (min(max(int(line or 1), 1), height) - 1, min(max(int(col or 1), 1), width) - 1)
+					moves = []
+				elif target is None:
+					moves.append(f'\033[{params}{command}')
+				else:
+					steps: int = int(params or 1)
+					y, x = target
+					if command == "A": y = max(y - steps, 0)
+					elif command == "B": y = min(y + steps, height - 1)
+					elif command == "C": x = min(x + steps, width - 1)
+					else: x = max(x - steps, 0)
+					target = (y, x)
+			elif command == "s":
+				flush(with_style=False)
+				append("\033[s")
+				saved = target
+			elif command == "u":
+				if saved is None:
+					flush(with_style=False)
+					append("\033[u")
+					cursor = None
+				target = saved
+				moves = []
+			elif newline or carriage:
+				flush()
+				append(newline or carriage)
+				if cursor: cursor = (min(cursor[0] + 1, height - 1) if newline else cursor[0], 0)
+				target = cursor
+			elif command in ["J", "K"]:
+				#* Erased cells gets the background color set
+				flush()
+				append(f'\033[{params}{command}')
+			elif command and params.startswith("?") and params[1:] in ["1049", "1047", "47"]:
+				flush()
+				append(f'\033[{params}{command}')
+				pen = target = cursor = saved = None
+				moves = []
+			elif command and params.startswith("?"):
+				append(f'\033[{params}{command}')
+			elif command:
+				#* Unknown sequence, pass it on and forget the cursor position
+				flush()
+				append(f'\033[{params}{command}')
+				target = cursor = None
+			else:
+				flush()
+				append(other)
+				if not other.startswith("\033]"): target = cursor = None
+		flush()
+		cls.style, cls.pen, cls.target, cls.cursor, cls.saved, cls.moves = style, pen, target, cursor, saved, moves
+		return "".join(out)
+
+	@staticmethod
+	def _move(cursor: Union[Tuple[int, int], None], target: Tuple[int, int]) -> str:
+		'''Returns the shortest sequence moving the cursor from <cursor> to <target>'''
+		y, x = target
+		move: str = f'\033[{y + 1};{x + 1}f'
+		if cursor is None: return move
+		relative: str = ""
+		if cursor[0] == y:
+			if x == 0: relative = "\r"
+			elif x > cursor[1]: relative = f'\033[{x - cursor[1]}C'
+			else: relative = f'\033[{cursor[1] - x}D'
+		elif cursor[1] == x:
+			relative = f'\033[{y - cursor[0]}B' if y > cursor[0] else f'\033[{cursor[0] - y}A'
+		return relative if relative and len(relative) < len(move) else move
+
 class Color:
 	'''Holds representations for a 24-bit color value
 	__init__(color, depth="fg", default=False)
@@ -1169,6 +1743,18 @@ class Color:
 	def __iter__(self) -> Iterable:
 		for c in self.dec: yield c
 
+	def compiled(self) -> Tuple[str, Tuple[int, int, int], str, str, bool]:
+		'''Returns a tuple of builtins that Color.from_compiled() creates the same color from without parsing'''
+		return (getattr(self, "hexa", ""), tuple(getattr(self, "dec", (-1, -1, -1))), self.escape, self.depth, self.default) #type: ignore
+
+	@staticmethod
+	def from_compiled(compiled: Tuple[str, Tuple[int, int, int], str, str, bool]) -> 'Color':
+		color: Color = Color.__new__(Color)
+		color.hexa, dec, color.escape, color.depth, color.default = compiled
+		color.dec = tuple(dec) #type: ignore
+		color.red, color.green, color.blue = color.dec
+		return color
+
 	def __call__(self, *args: str) -> str:
 		if len(args) < 1: return ""
 		return f'{self.escape}{"".join(args)}{getattr(Term, self.depth)}'
@@ -1244,6 +1830,8 @@ class Theme:
 	themes: Dict[str, str] = {}
 	cached: Dict[str, Dict[str, str]] = { "Default" : DEFAULT_THEME }
 	current: str = ""
+	generation: int = 0
+	compiled: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
 	main_bg = main_fg = title = hi_fg = selected_bg = selected_fg = inactive_fg = proc_misc = cpu_box = mem_box = net_box = proc_box = div_line = temp_start = temp_mid = temp_end = cpu_start = cpu_mid = cpu_end = free_start = free_mid = free_end = cached_start = cached_mid = cached_end = available_start = available_mid = available_end = used_start = used_mid = used_end = download_start = download_mid = download_end = upload_start = upload_mid = upload_end = graph_text = meter_bg = process_start = process_mid = process_end = Colors.default
 
@@ -1261,7 +1849,7 @@ class Theme:
 		"process" : [],
 	}
 	def __init__(self, theme: str):
-		self.refresh()
+		self.refresh(cached=True)
 		self._load_theme(theme)
 
 	def __call__(self, theme: str):
@@ -1281,6 +1869,7 @@ class Theme:
 			CONFIG.color_theme = theme
 			tdict = DEFAULT_THEME
 		self.current = theme
+		Theme.generation += 1
 		#if CONFIG.color_theme != theme: CONFIG.color_theme = theme
 		if not "graph_text" in tdict and "inactive_fg" in tdict:
 			tdict["graph_text"] = tdict["inactive_fg"]
@@ -1292,24 +1881,48 @@ class Theme:
 			tdict["process_end"] = tdict.get("cpu_end", "")
 
 
+		depth: str = "24bit" if CONFIG.truecolor and not LOW_COLOR else "256"
+		compiled: Union[Dict[str, Any], None] = self.compiled.get((theme, depth))
+		if compiled is None or compiled["source"] != tdict:
+			compiled = self._load_compiled(theme, depth, tdict)
+		if compiled is None:
+			compiled = self._compile(tdict)
+			self._save_compiled(theme, depth, compiled)
+		self.compiled[(theme, depth)] = compiled
+		for item, color in compiled["colors"].items():
+			setattr(self, item, Color.from_compiled(color))
+		for name, gradient in compiled["gradient"].items():
+			self.gradient[name] = gradient
+		self.proc_start, self.proc_mid, self.proc_end = self.main_fg, Colors.null, self.inactive_fg
+		self.proc_color_start, self.proc_color_mid, self.proc_color_end = self.inactive_fg, Colors.null, self.process_start
+
+		#* Set terminal colors
+		Term.fg = f'{self.main_fg}'
+		Term.bg = f'{self.main_bg}' if CONFIG.theme_background else "\033[49m"
+		Draw.now(self.main_fg, self.main_bg)
+
+	def _compile(self, tdict: Dict[str, str]) -> Dict[str, Any]:
+		'''Returns the colors and 101 value gradients of theme <tdict> as escape sequences in builtin types'''
+		theme_colors: Dict[str, Color] = {}
+		gradients: Dict[str, List[str]] = {}
 		#* Get key names from DEFAULT_THEME dict to not leave any color unset if missing from theme dict
 		for item, value in DEFAULT_THEME.items():
 			default = item in ["main_fg", "main_bg"]
 			depth = "bg" if item in ["main_bg", "selected_bg"] else "fg"
 			if item in tdict:
-				setattr(self, item, Color(tdict[item], depth=depth, default=default))
+				theme_colors[item] = Color(tdict[item], depth=depth, default=default)
 			else:
-				setattr(self, item, Color(value, depth=depth, default=default))
+				theme_colors[item] = Color(value, depth=depth, default=default)
 
 		#* Create color gradients from one, two or three colors, 101 values indexed 0-100
-		self.proc_start, self.proc_mid, self.proc_end = self.main_fg, Colors.null, self.inactive_fg
-		self.proc_color_start, self.proc_color_mid, self.proc_color_end = self.inactive_fg, Colors.null, self.process_start
+		theme_colors["proc_start"], theme_colors["proc_mid"], theme_colors["proc_end"] = theme_colors["main_fg"], Colors.null, theme_colors["inactive_fg"]
+		theme_colors["proc_color_start"], theme_colors["proc_color_mid"], theme_colors["proc_color_end"] = theme_colors["inactive_fg"], Colors.null, theme_colors["process_start"]
 
 		rgb: Dict[str, Tuple[int, int, int]]
 		colors: List[List[int]] = []
 		for name in self.gradient:
-			rgb = { "start" : getattr(self, f'{name}_start').dec, "mid" : getattr(self, f'{name}_mid').dec, "end" : getattr(self, f'{name}_end').dec }
-			colors = [ list(getattr(self, f'{name}_start')) ]
+			rgb = { "start" : theme_colors[f'{name}_start'].dec, "mid" : theme_colors[f'{name}_mid'].dec, "end" : theme_colors[f'{name}_end'].dec }
+			colors = [ list(theme_colors[f'{name}_start']) ]
 			if rgb["end"][0] >= 0:
 				r = 50 if rgb["mid"][0] >= 0 else 100
 				for first, second in ["start", "mid" if r == 50 else "end"], ["mid", "end"]:
@@ -1317,28 +1930,55 @@ class Theme:
 						colors += [[rgb[first][n] + i * (rgb[second][n] - rgb[first][n]) // r for n in range(3)]]
 					if r == 100:
 						break
-				self.gradient[name] += [ Color.fg(*color) for color in colors ]
+				gradients[name] = [ Color.fg(*color) for color in colors ]
 
 			else:
 				c = Color.fg(*rgb["start"])
-				self.gradient[name] += [c] * 101
-		#* Set terminal colors
-		Term.fg = f'{self.main_fg}'
-		Term.bg = f'{self.main_bg}' if CONFIG.theme_background else "\033[49m"
-		Draw.now(self.main_fg, self.main_bg)
+				gradients[name] = [c] * 101
+		for item in ["proc_start", "proc_mid", "proc_end", "proc_color_start", "proc_color_mid", "proc_color_end"]:
+			del theme_colors[item]
+		return { "version" : VERSION, "source" : dict(tdict), "colors" : { item : color.compiled() for item, color in theme_colors.items() }, "gradient" : gradients }
+
+	@staticmethod
+	def _load_compiled(theme: str, depth: str, tdict: Dict[str, str]) -> Union[Dict[str, Any], None]:
+		'''Returns compiled theme from the cache in CONFIG_DIR if made by this version from the same theme values'''
+		try:
+			with open(f'{CONFIG_DIR}/cache/theme-{theme.replace("/", "_")}-{depth}.json', "r") as f:
+				compiled: Dict[str, Any] = json.load(f)
+			if compiled.get("version") == VERSION and compiled.get("source") == tdict:
+				return compiled
+		except (OSError, ValueError, AttributeError):
+			pass
+		return None
+
+	@staticmethod
+	def _save_compiled(theme: str, depth: str, compiled: Dict[str, Any]):
+		try:
+			os.makedirs(f'{CONFIG_DIR}/cache', exist_ok=True)
+			path: str = f'{CONFIG_DIR}/cache/theme-{theme.replace("/", "_")}-{depth}.json'
+			with open(f'{path}.tmp', "w") as f:
+				json.dump(compiled, f)
+			os.replace(f'{path}.tmp', path)
+		except OSError as e:
+			errlog.warning(f'Could not write theme cache: {e}')
 
 	@classmethod
-	def refresh(cls):
-		'''Sets themes dict with names and paths to all found themes'''
-		cls.themes = { "Default" : "Default" }
+	def refresh(cls, cached: bool = False):
+		'''Sets themes dict with names and paths to all found themes, from the Probe cache if <cached>'''
+		cls.themes = Probe.get("themes", cls._find_themes) if cached else cls._find_themes()
+
+	@staticmethod
+	def _find_themes() -> Dict[str, str]:
+		themes: Dict[str, str] = { "Default" : "Default" }
 		try:
 			for d in (THEME_DIR, USER_THEME_DIR):
 				if not d: continue
 				for f in os.listdir(d):
 					if f.endswith(".theme"):
-						cls.themes[f'{"" if d == THEME_DIR else "+"}{f[:-6]}'] = f'{d}/{f}'
+						themes[f'{"" if d == THEME_DIR else "+"}{f[:-6]}'] = f'{d}/{f}'
 		except Exception as e:
 			errlog.exception(str(e))
+		return themes
 
 	@staticmethod
 	def _load_file(path: str) -> Dict[str, str]:
@@ -1362,30 +2002,34 @@ class Banner:
 	out: List[str] = []
 	c_color: str = ""
 	length: int = 0
-	if not out:
+
+	@classmethod
+	def _create(cls):
+		'''Build the colored banner lines, done on first draw to keep it out of startup for headless and batch mode'''
 		for num, (color, color2, line) in enumerate(BANNER_SRC):
-			if len(line) > length: length = len(line)
+			if len(line) > cls.length: cls.length = len(line)
 			out_var = ""
 			line_color = Color.fg(color)
 			line_color2 = Color.fg(color2)
 			line_dark = Color.fg(f'#{80 - num * 6}')
 			for n, letter in enumerate(line):
-				if letter == "█" and c_color != line_color:
-					if 5 < n < 25: c_color = line_color2
-					else: c_color = line_color
-					out_var += c_color
+				if letter == "█" and cls.c_color != line_color:
+					if 5 < n < 25: cls.c_color = line_color2
+					else: cls.c_color = line_color
+					out_var += cls.c_color
 				elif letter == " ":
 					letter = f'{Mv.r(1)}'
-					c_color = ""
-				elif letter != "█" and c_color != line_dark:
-					c_color = line_dark
+					cls.c_color = ""
+				elif letter != "█" and cls.c_color != line_dark:
+					cls.c_color = line_dark
 					out_var += line_dark
 				out_var += letter
-			out.append(out_var)
+			cls.out.append(out_var)
 
 	@classmethod
 	def draw(cls, line: int, col: int = 0, center: bool = False, now: bool = False):
 		out: str = ""
+		if not cls.out: cls._create()
 		if center: col = Term.width // 2 - cls.length // 2
 		for n, o in enumerate(cls.out):
 			out += f'{Mv.to(line + n, col)}{o}'
@@ -1432,16 +2076,156 @@ class Symbol:
 	ok: str = f'{Color.fg("#30ff50")}√{Color.fg("#cc")}'
 	fail: str = f'{Color.fg("#ff3050")}!{Color.fg("#cc")}'
 
+class Series:
+	'''Fixed capacity ring buffer of integers for graph history, values are stored in an array of <typecode> and the oldest value is dropped when full
+	* append(value: int) : adds a value
+	* resize(capacity: int) : changes capacity keeping the newest values, does nothing if unchanged
+	* len(), [index], [slice], iteration and truth value works as for a list, slices are returned as lists
+	If <name> is given and Series.path is set, values are kept in a memory mapped file "<Series.path>/<name>.ring" and loaded from it when created.
+	Series.use(path) sets Series.path while holding a lock on the directory, so only one instance at a time writes to the ring files.
+	Ring file layout: 8 uint32 header (magic, typecode, capacity, start, size, 3 unused) followed by capacity values of typecode.
+	'''
+	__slots__ = ("typecode", "capacity", "data", "start", "size", "name", "file", "header")
+	path: str = ""
+	magic: int = 0x48595042
+	lock_fd: int = -1
+
+	@classmethod
+	def use(cls, path: str) -> bool:
+		'''Set Series.path to <path> if no other process holds the lock on it, the lock is kept until exit. Returns False if it's held'''
+		fd: int = os.open(path, os.O_RDONLY)
+		try:
+			fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except BlockingIOError:
+			os.close(fd)
+			return False
+		if cls.lock_fd >= 0: os.close(cls.lock_fd)
+		cls.lock_fd, cls.path = fd, path
+		return True
+
+	def __init__(self, capacity: int, typecode: str = "h", name: str = ""):
+		self.typecode = typecode
+		self.name = name
+		self.file: Union[mmap.mmap, None] = None
+		self.header: Union[memoryview, None] = None
+		self.start: int = 0
+		self.size: int = 0
+		if name and Series.path:
+			try:
+				stored: int = self._stored()
+				values: List[int] = []
+				if stored >= capacity:
+					self._map(stored)
+					return
+				elif stored:
+					self._map(stored)
+					values = self[:]
+					self._unmap()
+				self._map(max(1, capacity), values)
+				return
+			except Exception as e:
+				errlog.warning(f'Failed to map history file for "{name}", keeping it in memory: {e}')
+				self._unmap()
+		self.capacity = max(1, capacity)
+		self.data: Union[array, memoryview] = array(typecode, bytes(array(typecode).itemsize * self.capacity))
+
+	def _stored(self) -> int:
+		'''Returns capacity of the ring file if it exists with a valid header for this typecode, else 0'''
+		path: str = f'{Series.path}/{self.name}.ring'
+		if not os.path.isfile(path): return 0
+		with open(path, "rb") as f:
+			header: array = array("I", f.read(32))
+		if len(header) < 8 or header[0] != Series.magic or header[1] != ord(self.typecode) or header[4] > header[2] or header[3] >= max(header[2], 1) \
+			or os.path.getsize(path) != 32 + header[2] * array(self.typecode).itemsize:
+			return 0
+		return header[2]
+
+	def _map(self, capacity: int, values: Union[List[int], None] = None):
+		'''Map the ring file with room for <capacity> values and write <values> to it, the stored values are kept if <values> is None'''
+		path: str = f'{Series.path}/{self.name}.ring'
+		length: int = 32 + capacity * array(self.typecode).itemsize
+		with open(path, "a+b") as f:
+			if values is not None: f.truncate(length)
+			self.file = mmap.mmap(f.fileno(), length)
+		self.header = memoryview(self.file)[:32].cast("I")
+		self.data = memoryview(self.file)[32:].cast(self.typecode)
+		self.capacity = capacity
+		if values is None:
+			self.start, self.size = self.header[3], self.header[4]
+			return
+		self.start, self.size = 0, min(len(values), capacity)
+		self.data[:self.size] = array(self.typecode, values[len(values) - self.size:])
+		self.header[0], self.header[1], self.header[2], self.header[3], self.header[4] = Series.magic, ord(self.typecode), capacity, 0, self.size
+
+	def _unmap(self):
+		if isinstance(self.data, memoryview): self.data.release()
+		if self.header is not None: self.header.release()
+		if self.file is not None: self.file.close()
+		self.file = self.header = None
+
+	def append(self, value: int):
+		#* Values are kept from index 0 until full, after that start points at the oldest value to overwrite
+		if self.size < self.capacity:
+			self.data[self.size] = value
+			self.size += 1
+		else:
+			self.data[self.start] = value
+			self.start += 1
+			if self.start == self.capacity: self.start = 0
+		if self.header is not None:
+			self.header[3], self.header[4] = self.start, self.size
+
+	def _slice(self, low: int, high: int) -> List[int]:
+		'''Returns values from position <low> to <high> in order, with 0 as the oldest value'''
+		if high <= low: return []
+		low, high = self.start + low, self.start + high
+		if high <= self.capacity: return self.data[low:high].tolist()
+		if low >= self.capacity: return self.data[low - self.capacity:high - self.capacity].tolist()
+		return self.data[low:].tolist() + self.data[:high - self.capacity].tolist()
+
+	def resize(self, capacity: int):
+		if capacity == self.capacity or capacity < 1 and self.capacity == 1: return
+		capacity = max(1, capacity)
+		values: List[int] = self._slice(max(0, self.size - capacity), self.size)
+		if self.file is not None:
+			self._unmap()
+			self._map(capacity, values)
+			return
+		self.capacity, self.start, self.size = capacity, 0, len(values)
+		self.data = array(self.typecode, values) + array(self.typecode, bytes(self.data.itemsize * (capacity - len(values))))
+
+	def __len__(self) -> int:
+		return self.size
+
+	def __getitem__(self, key: Union[int, slice]) -> Union[int, List[int]]:
+		if isinstance(key, slice):
+			low, high, step = key.indices(self.size)
+			if step == 1: return self._slice(low, high)
+			return self._slice(0, self.size)[key]
+		if key < 0: key += self.size
+		if not 0 <= key < self.size: raise IndexError("Series index out of range")
+		return self.data[(self.start + key) % self.capacity]
+
+	def __iter__(self):
+		return iter(self._slice(0, self.size))
+
+	def __eq__(self, other) -> bool:
+		return list(self) == list(other)
+
+	def __repr__(self) -> str:
+		return f'Series({self[:]!r})'
+
+
 class Graph:
-	'''Class for creating and adding to graphs
+	'''Class for creating and adding to graphs, graph rows are kept as ring buffers and only the newest column is created when adding a value
 	* __str__ : returns graph as a string
 	* add(value: int) : adds a value to graph and returns it as a string
 	* __call__ : same as add
 	'''
-	out: str
 	width: int
 	height: int
-	graphs: Dict[bool, List[str]]
+	rows: Dict[bool, List[List[str]]]
+	head: Dict[bool, int]
 	colors: List[str]
 	invert: bool
 	max_value: int
@@ -1452,10 +2236,15 @@ class Graph:
 	current: bool
 	last: int
 	lowest: int = 0
-	symbol: Dict[float, str]
+	levels: List[List[int]]
+	glyphs: List[str]
+	rendered: Union[str, None]
 
-	def __init__(self, width: int, height: int, color: Union[List[str], Color, None], data: List[int], invert: bool = False, max_value: int = 0, offset: int = 0, color_max_value: Union[int, None] = None, no_zero: bool = False, round_up_low: bool = False):
-		self.graphs: Dict[bool, List[str]] = {False : [], True : []}
+	#* Shared lookup tables for each height and orientation, levels[row][value] gives the 0-4 braille height of value in row
+	#* and glyphs[left * 5 + right] gives the braille character for a left and right level
+	tables: Dict[Tuple[int, bool], Tuple[List[List[int]], List[str]]] = {}
+
+	def __init__(self, width: int, height: int, color: Union[List[str], Color, None], data: Union[List[int], Series], invert: bool = False, max_value: int = 0, offset: int = 0, color_max_value: Union[int, None] = None, no_zero: bool = False, round_up_low: bool = False):
 		self.current: bool = True
 		self.width = width
 		self.height = height
@@ -1463,7 +2252,9 @@ class Graph:
 		self.offset = offset
 		self.round_up_low = round_up_low
 		self.no_zero = no_zero or round_up_low
-		if not data: data = [0]
+		if len(data) > width * 2 > 0: #* If the size of given data set is bigger then width of graph, shrink data set
+			data = data[-(width*2):]
+		data = list(data) or [0]
 		if max_value:
 			self.lowest = 1 if self.round_up_low else 0
 			self.max_value = max_value
@@ -1487,72 +2278,86 @@ class Graph:
 		else:
 			if isinstance(color, list): self.colors = color
 			elif isinstance(color, Color): self.colors = [ f'{color}' for _ in range(101) ]
-		if self.height == 1:
-			self.symbol = Symbol.graph_down_small if invert else Symbol.graph_up_small
-		else:
-			self.symbol = Symbol.graph_down if invert else Symbol.graph_up
-		value_width: int = ceil(len(data) / 2)
-		filler: str = ""
-		if value_width > width: #* If the size of given data set is bigger then width of graph, shrink data set
-			data = data[-(width*2):]
-			value_width = ceil(len(data) / 2)
-		elif value_width < width: #* If the size of given data set is smaller then width of graph, fill graph with whitespace
-			filler = self.symbol[0.0] * (width - value_width)
-		if len(data) % 2: data.insert(0, 0)
-		for _ in range(height):
-			for b in [True, False]:
-				self.graphs[b].append(filler)
-		self._create(data, new=True)
-
-	def _create(self, data: List[int], new: bool = False):
-		h_high: int
-		h_low: int
-		value: Dict[str, int] = { "left" : 0, "right" : 0 }
-		val: int
-		side: str
-
-		#* Create the graph
-		for h in range(self.height):
-			h_high = round(100 * (self.height - h) / self.height) if self.height > 1 else 100
-			h_low = round(100 * (self.height - (h + 1)) / self.height) if self.height > 1 else 0
-			for v in range(len(data)):
-				if new: self.current = bool(v % 2) #* Switch between True and False graphs
-				if new and v == 0: self.last = 0
-				for val, side in [self.last, "left"], [data[v], "right"]: # type: ignore
+		self.levels, self.glyphs = self._tables(height, invert)
+		self.rows = { b : [[self.glyphs[0]] * max(width, 0) for _ in range(height)] for b in [False, True] }
+		self.head = { False : 0, True : 0 }
+		if len(data) % 2: data = [0] + data
+		self.last = 0
+		for v in range(len(data)):
+			self.current = bool(v % 2) #* Switch between True and False graphs
+			self._add_column(self._column(self.last, data[v], first=v == 0))
+			self.last = data[v]
+		self.rendered = None
+
+	@classmethod
+	def _tables(cls, height: int, invert: bool) -> Tuple[List[List[int]], List[str]]:
+		if (height, invert) not in cls.tables:
+			levels: List[List[int]] = []
+			for h in range(height):
+				h_high: int = round(100 * (height - h) / height) if height > 1 else 100
+				h_low: int = round(100 * (height - (h + 1)) / height) if height > 1 else 0
+				row: List[int] = []
+				for val in range(101):
 					if val >= h_high:
-						value[side] = 4
+						row.append(4)
 					elif val <= h_low:
-						value[side] = 0
+						row.append(0)
+					elif height == 1:
+						row.append(round(val * 4 / 100 + 0.5))
 					else:
-						if self.height == 1: value[side] = round(val * 4 / 100 + 0.5)
-						else: value[side] = round((val - h_low) * 4 / (h_high - h_low) + 0.1)
-					if self.no_zero and not (new and v == 0 and side == "left") and h == self.height - 1 and value[side] < 1 and not (self.round_up_low and val == 0): value[side] = 1
-				if new: self.last = data[v]
-				self.graphs[self.current][h] += self.symbol[float(value["left"] + value["right"] / 10)]
-		if data: self.last = data[-1]
-		self.out = ""
-
+						row.append(round((val - h_low) * 4 / (h_high - h_low) + 0.1))
+				levels.append(row)
+			if height == 1:
+				symbol = Symbol.graph_down_small if invert else Symbol.graph_up_small
+			else:
+				symbol = Symbol.graph_down if invert else Symbol.graph_up
+			cls.tables[(height, invert)] = (levels, [symbol[float(left + right / 10)] for left in range(5) for right in range(5)])
+		return cls.tables[(height, invert)]
+
+	def _column(self, left: int, right: int, first: bool = False) -> List[str]:
+		'''Returns the characters for each row of a column showing values left and right'''
+		l_val: int = 0 if left < 0 else 100 if left > 100 else left
+		r_val: int = 0 if right < 0 else 100 if right > 100 else right
+		glyphs: List[str] = self.glyphs
+		column: List[str] = [glyphs[row[l_val] * 5 + row[r_val]] for row in self.levels]
+		if self.no_zero and self.height > 0:
+			l_level, r_level = self.levels[-1][l_val], self.levels[-1][r_val]
+			if l_level < 1 and not first and not (self.round_up_low and left == 0): l_level = 1
+			if r_level < 1 and not (self.round_up_low and right == 0): r_level = 1
+			column[-1] = glyphs[l_level * 5 + r_level]
+		return column
+
+	def _add_column(self, column: List[str]):
+		if self.width < 1: return
+		head: int = self.head[self.current]
+		for row, glyph in zip(self.rows[self.current], column):
+			row[head] = glyph
+		self.head[self.current] = (head + 1) % self.width
+
+	@property
+	def out(self) -> str:
+		if self.rendered is None:
+			self.rendered = self._render()
+		return self.rendered
+
+	def _render(self) -> str:
+		head: int = self.head[self.current]
+		rows: List[str] = ["".join(row[head:]) + "".join(row[:head]) for row in self.rows[self.current]]
+		out: str = ""
 		if self.height == 1:
-			self.out += f'{"" if not self.colors else (THEME.inactive_fg if self.last < 5 else self.colors[self.last])}{self.graphs[self.current][0]}'
+			out = f'{"" if not self.colors else (THEME.inactive_fg if self.last < 5 else self.colors[self.last])}{rows[0]}'
 		elif self.height > 1:
-			for h in range(self.height):
-				if h > 0: self.out += f'{Mv.d(1)}{Mv.l(self.width)}'
-				self.out += f'{"" if not self.colors else self.colors[h]}{self.graphs[self.current][h if not self.invert else (self.height - 1) - h]}'
-		if self.colors: self.out += f'{Term.fg}'
+			out = f'{Mv.d(1)}{Mv.l(self.width)}'.join(f'{"" if not self.colors else self.colors[h]}{rows[h if not self.invert else (self.height - 1) - h]}' for h in range(self.height))
+		if self.colors: out += f'{Term.fg}'
+		return out
 
 	def __call__(self, value: Union[int, None] = None) -> str:
 		if not isinstance(value, int): return self.out
 		self.current = not self.current
-		if self.height == 1:
-			if self.graphs[self.current][0].startswith(self.symbol[0.0]):
-				self.graphs[self.current][0] = self.graphs[self.current][0].replace(self.symbol[0.0], "", 1)
-			else:
-				self.graphs[self.current][0] = self.graphs[self.current][0][1:]
-		else:
-			for n in range(self.height):
-				self.graphs[self.current][n] = self.graphs[self.current][n][1:]
 		if self.max_value: value = min_max((value + self.offset) * 100 // (self.max_value + self.offset), min_max(value + self.offset, 0, self.lowest), 100)
-		self._create([value])
+		self._add_column(self._column(self.last, value))
+		self.last = value
+		self.rendered = None
 		return self.out
 
 	def add(self, value: Union[int, None] = None) -> str:
@@ -1581,32 +2386,29 @@ class Meter:
 	__init__(value, width, theme, gradient_name) to create new meter
 	__call__(value) to set value and return meter as a string
 	__str__ returns last set meter as a string
+	Strings for all 101 values are created at once and shared by meters with the same width, gradient, invert and theme,
+	the last <cache_size> of these are kept in Meter.cache
 	'''
 	out: str
-	color_gradient: List[str]
-	color_inactive: Color
 	gradient_name: str
 	width: int
 	invert: bool
-	saved: Dict[int, str]
+	saved: List[str]
+	cache: Dict[Tuple[int, str, bool, int], List[str]] = OrderedDict()
+	cache_size: int = 64
 
 	def __init__(self, value: int, width: int, gradient_name: str, invert: bool = False):
 		self.gradient_name = gradient_name
-		self.color_gradient = THEME.gradient[gradient_name]
-		self.color_inactive = THEME.meter_bg
 		self.width = width
-		self.saved = {}
 		self.invert = invert
-		self.out = self._create(value)
+		self.saved = self._saved()
+		self.out = self(value)
 
 	def __call__(self, value: Union[int, None]) -> str:
 		if not isinstance(value, int): return self.out
 		if value > 100: value = 100
 		elif value < 0: value = 100
-		if value in self.saved:
-			self.out = self.saved[value]
-		else:
-			self.out = self._create(value)
+		self.out = self.saved[value]
 		return self.out
 
 	def __str__(self) -> str:
@@ -1615,20 +2417,33 @@ class Meter:
 	def __repr__(self):
 		return repr(self.out)
 
-	def _create(self, value: int) -> str:
-		if value > 100: value = 100
-		elif value < 0: value = 100
-		out: str = ""
-		for i in range(1, self.width + 1):
-			if value >= round(i * 100 / self.width):
-				out += f'{self.color_gradient[round(i * 100 / self.width) if not self.invert else round(100 - (i * 100 / self.width))]}{Symbol.meter}'
-			else:
-				out += self.color_inactive(Symbol.meter * (self.width + 1 - i))
-				break
+	def _saved(self) -> List[str]:
+		key: Tuple[int, str, bool, int] = (self.width, self.gradient_name, self.invert, Theme.generation)
+		saved: Union[List[str], None] = self.cache.get(key)
+		if saved is None:
+			saved = self.cache[key] = self._create()
+			while len(self.cache) > self.cache_size:
+				self.cache.popitem(last=False)
 		else:
-			out += f'{Term.fg}'
-		if not value in self.saved:
-			self.saved[value] = out
+			self.cache.move_to_end(key)
+		return saved
+
+	def _create(self) -> List[str]:
+		'''Returns meter strings for values 0-100, built from the strings of the filled part up to each block'''
+		color_gradient: List[str] = THEME.gradient[self.gradient_name]
+		color_inactive: Color = THEME.meter_bg
+		steps: List[int] = [round(i * 100 / self.width) for i in range(1, self.width + 1)]
+		filled: List[str] = [""]
+		for i, step in enumerate(steps, start=1):
+			filled.append(f'{filled[-1]}{color_gradient[step if not self.invert else round(100 - (i * 100 / self.width))]}{Symbol.meter}')
+		out: List[str] = []
+		blocks: int = 0
+		for value in range(101):
+			while blocks < self.width and value >= steps[blocks]: blocks += 1
+			if blocks >= self.width:
+				out.append(f'{filled[blocks]}{Term.fg}')
+			else:
+				out.append(filled[blocks] + color_inactive(Symbol.meter * (self.width - blocks)))
 		return out
 
 class Meters:
@@ -1668,6 +2483,7 @@ class Box:
 	clock_on: bool = False
 	clock: str = ""
 	clock_len: int = 0
+	update_drawn: str = ""
 	resized: bool = False
 	clock_custom_format: Dict[str, Any] = {
 		"/host" : os.uname()[1],
@@ -1684,25 +2500,48 @@ class Box:
 		for sub in cls.__subclasses__():
 			sub._calc_size() # type: ignore
 			sub.resized = True # type: ignore
+		for collector in Collector.__subclasses__():
+			collector.resize_history = True
+
+	@classmethod
+	def draw_title(cls, stale: bool = False) -> str:
+		'''Buffer box title in italic and inactive color if <stale>, returns name of buffer'''
+		if not cls.name in cls.boxes: return ""
+		numbered: str = "" if not cls.num else f'{THEME.hi_fg(SUPERSCRIPT[cls.num])}'
+		title_color: Color = THEME.inactive_fg if stale else THEME.title
+		Draw.buffer(f'{cls.buffer}_title', f'{Mv.to(cls.y, cls.x + 2)}{getattr(THEME, f"{cls.name}_box")}{Symbol.title_left}{Fx.b}{numbered}{Fx.i if stale else ""}{title_color}{cls.name}'
+			f'{Fx.ui}{Fx.ub}{getattr(THEME, f"{cls.name}_box")}{Symbol.title_right}{Term.fg}', once=True, only_save=Menu.active)
+		return f'{cls.buffer}_title'
+
+	@classmethod
+	def update_string(cls) -> str:
+		'''Returns update_ms with the longest stretched update time among shown boxes if adaptive_intervals is set'''
+		out: str = f'{CONFIG.update_ms}ms'
+		if CONFIG.adaptive_intervals:
+			stretched: int = max((round(collector.interval() * 10) * 100 for collector in Collector.__subclasses__()
+				if collector.buffer in cls.boxes and round(collector.interval() * 10) > round(collector.interval(base=True) * 10)), default=0)
+			if stretched: out += f' ~{stretched}ms'
+		return out
 
 	@classmethod
 	def draw_update_ms(cls, now: bool = True):
 		if not "cpu" in cls.boxes: return
-		update_string: str = f'{CONFIG.update_ms}ms'
+		update_string: str = cls.update_string()
 		xpos: int = CpuBox.x + CpuBox.width - len(update_string) - 15
-		if not "+" in Key.mouse:
-			Key.mouse["+"] = [[xpos + 7 + i, CpuBox.y] for i in range(3)]
-			Key.mouse["-"] = [[CpuBox.x + CpuBox.width - 4 + i, CpuBox.y] for i in range(3)]
+		if len(update_string) != len(cls.update_drawn): CpuBox.redraw = True
+		cls.update_drawn = update_string
+		Key.mouse["+"] = [[xpos + 7 + i, CpuBox.y] for i in range(3)]
+		Key.mouse["-"] = [[CpuBox.x + CpuBox.width - 4 + i, CpuBox.y] for i in range(3)]
 		Draw.buffer("update_ms!" if now and not Menu.active else "update_ms",
 			f'{Mv.to(CpuBox.y, xpos)}{THEME.cpu_box(Symbol.h_line * 7, Symbol.title_left)}{Fx.b}{THEME.hi_fg("+")} ',
 			f'{THEME.title(update_string)} {THEME.hi_fg("-")}{Fx.ub}{THEME.cpu_box(Symbol.title_right)}', only_save=Menu.active, once=True)
 		if now and not Menu.active:
 			Draw.clear("update_ms")
-			if CONFIG.show_battery and hasattr(psutil, "sensors_battery") and psutil.sensors_battery():
+			if CONFIG.show_battery and sensors_battery():
 				Draw.out("battery")
 
 	@classmethod
-	def draw_clock(cls, force: bool = False):
+	def draw_clock(cls, force: bool = False, now: bool = True):
 		if not "cpu" in cls.boxes or not cls.clock_on: return
 		cls.c_counter += 1
 		if cls.c_counter > 3600 / (Config.update_ms / 1000):
@@ -1720,12 +2559,12 @@ class Box:
 		if cls.clock_len != clock_len and not CpuBox.resized:
 			out = f'{Mv.to(CpuBox.y, ((CpuBox.width)//2)-(cls.clock_len//2))}{Fx.ub}{THEME.cpu_box}{Symbol.h_line * cls.clock_len}'
 		cls.clock_len = clock_len
-		now: bool = False if Menu.active else not force
+		now = False if Menu.active or force else now
 		out += (f'{Mv.to(CpuBox.y, ((CpuBox.width)//2)-(clock_len//2))}{Fx.ub}{THEME.cpu_box}'
 			f'{Symbol.title_left}{Fx.b}{THEME.title(clock_string[:clock_len])}{Fx.ub}{THEME.cpu_box}{Symbol.title_right}{Term.fg}')
 		Draw.buffer("clock", out, z=1, now=now, once=not force, only_save=Menu.active)
 		if now and not Menu.active:
-			if CONFIG.show_battery and hasattr(psutil, "sensors_battery") and psutil.sensors_battery():
+			if CONFIG.show_battery and sensors_battery():
 				Draw.out("battery")
 
 	@classmethod
@@ -1779,6 +2618,7 @@ class CpuBox(Box, SubBox):
 	battery_status: str = "Unknown"
 	old_battery_pos = 0
 	old_battery_len = 0
+	old_self_len: int = 0
 	battery_path: Union[str, None] = ""
 	battery_clear: bool = False
 	battery_symbols: Dict[str, str] = {"Charging": "▲",
@@ -1834,28 +2674,32 @@ class CpuBox(Box, SubBox):
 		f'{Mv.to(cls.y, cls.x + 10)}{THEME.cpu_box(Symbol.title_left)}{Fx.b}{THEME.hi_fg("M")}{THEME.title("enu")}{Fx.ub}{THEME.cpu_box(Symbol.title_right)}'
 		f'{create_box(x=cls.box_x, y=cls.box_y, width=cls.box_width, height=cls.box_height, line_color=THEME.div_line, fill=False, title=CPU_NAME[:cls.box_width - 14] if not CONFIG.custom_cpu_name else CONFIG.custom_cpu_name[:cls.box_width - 14])}')
 
+	@staticmethod
+	def _get_battery_path() -> Union[str, None]:
+		if os.path.isdir(f'{SYS_PATH}/class/power_supply'):
+			for directory in sorted(os.listdir(f'{SYS_PATH}/class/power_supply')):
+				if directory.startswith('BAT') or 'battery' in directory.lower():
+					return f'{SYS_PATH}/class/power_supply/{directory}/'
+		return None
+
 	@classmethod
 	def battery_activity(cls) -> bool:
-		if not hasattr(psutil, "sensors_battery") or psutil.sensors_battery() == None:
+		battery = sensors_battery()
+		if battery == None:
 			if cls.battery_percent != 1000:
 				cls.battery_clear = True
 			return False
 
 		if cls.battery_path == "":
-			cls.battery_path = None
-			if os.path.isdir("/sys/class/power_supply"):
-				for directory in sorted(os.listdir("/sys/class/power_supply")):
-					if directory.startswith('BAT') or 'battery' in directory.lower():
-						cls.battery_path = f'/sys/class/power_supply/{directory}/'
-						break
+			cls.battery_path = Probe.get("battery_path", cls._get_battery_path)
 
 		return_true: bool = False
-		percent: int = ceil(getattr(psutil.sensors_battery(), "percent", 0))
+		percent: int = ceil(getattr(battery, "percent", 0))
 		if percent != cls.battery_percent:
 			cls.battery_percent = percent
 			return_true = True
 
-		seconds: int = getattr(psutil.sensors_battery(), "secsleft", 0)
+		seconds: int = getattr(battery, "secsleft", 0)
 		if seconds != cls.battery_secs:
 			cls.battery_secs = seconds
 			return_true = True
@@ -1863,9 +2707,9 @@ class CpuBox(Box, SubBox):
 		status: str = "not_set"
 		if cls.battery_path:
 			status = readfile(cls.battery_path + "status", default="not_set")
-		if status == "not_set" and getattr(psutil.sensors_battery(), "power_plugged", None) == True:
+		if status == "not_set" and getattr(battery, "power_plugged", None) == True:
 			status = "Charging" if cls.battery_percent < 100 else "Full"
-		elif status == "not_set" and getattr(psutil.sensors_battery(), "power_plugged", None) == False:
+		elif status == "not_set" and getattr(battery, "power_plugged", None) == False:
 			status = "Discharging"
 		elif status == "not_set":
 			status = "Unknown"
@@ -1927,7 +2771,7 @@ class CpuBox(Box, SubBox):
 			if not hasattr(Meters, "battery") or cls.resized:
 				Meters.battery = Meter(cls.battery_percent, 10, "cpu", invert=True)
 			battery_symbol: str = cls.battery_symbols.get(cls.battery_status, "○")
-			battery_len: int = len(f'{CONFIG.update_ms}') + (11 if cls.width >= 100 else 0) + len(battery_time) + len(f'{cls.battery_percent}')
+			battery_len: int = max(len(Box.update_drawn) - 2, 0) + (11 if cls.width >= 100 else 0) + len(battery_time) + len(f'{cls.battery_percent}')
 			battery_pos = cls.width - battery_len - 17
 			if (battery_pos != cls.old_battery_pos or battery_len != cls.old_battery_len) and cls.old_battery_pos > 0 and not cls.resized:
 				bat_out += f'{Mv.to(y-1, cls.old_battery_pos)}{THEME.cpu_box(Symbol.h_line*(cls.old_battery_len+4))}'
@@ -2010,6 +2854,18 @@ class CpuBox(Box, SubBox):
 		if CONFIG.show_uptime:
 			out += f'{Mv.to(y + (0 if not CONFIG.cpu_invert_lower or CONFIG.cpu_single_graph else h - 1), x + 1)}{THEME.graph_text}{Fx.trans("up " + cpu.uptime)}'
 
+		if CONFIG.show_self:
+			self_string: str = (f'self {SelfStat.cpu:.1f}% {floating_humanizer(SelfStat.rss, short=True)} {SelfStat.threads} thr '
+								f'{floating_humanizer(SelfStat.rate, per_second=True, short=True)}')
+			for name in ["main", "collect", "key"]:
+				if name in SelfStat.tasks and len(self_string) + 16 <= w - 6:
+					self_string += f' {name} {SelfStat.tasks[name]:.1f}%'
+			self_string = self_string[:max(0, w - 6)]
+			if cls.resized: cls.old_self_len = 0
+			out += (f'{Mv.to(cls.y + cls.height - 1, cls.x + 2)}{THEME.cpu_box(Symbol.h_line * cls.old_self_len)}{Mv.to(cls.y + cls.height - 1, cls.x + 2)}'
+					f'{THEME.cpu_box(Symbol.title_left)}{THEME.title(self_string)}{THEME.cpu_box(Symbol.title_right)}')
+			cls.old_self_len = len(self_string) + 2
+
 
 		Draw.buffer(cls.buffer, f'{out_misc}{out}{Term.fg}', only_save=Menu.active)
 		cls.resized = cls.redraw = cls.clock_block = False
@@ -2442,6 +3298,11 @@ class ProcBox(Box):
 	redraw: bool = True
 	buffer: str = "proc"
 	pid_counter: Dict[int, int] = {}
+	row_cache: Dict[Tuple, Tuple[str, str]] = OrderedDict()
+	row_cache_size: int = 1000
+	row_layout: Tuple = ()
+	row_drawn: Dict[int, Tuple] = {}
+	scroll_pos: int = 0
 	Box.buffers.append(buffer)
 
 	@classmethod
@@ -2491,32 +3352,32 @@ class ProcBox(Box):
 			if cls.selected == 0 and ProcCollector.detailed and cls.last_selection:
 				cls.selected = cls.last_selection
 				cls.last_selection = 0
-			if cls.selected == cls.select_max and cls.start < ProcCollector.num_procs - cls.select_max + 1:
+			if cls.selected == cls.select_max and cls.start < ProcCollector.snapshot.num_procs - cls.select_max + 1:
 				cls.start += 1
 			elif cls.selected < cls.select_max:
 				cls.selected += 1
 		elif key == "mouse_scroll_up" and cls.start > 1:
 			cls.start -= 5
-		elif key == "mouse_scroll_down" and cls.start < ProcCollector.num_procs - cls.select_max + 1:
+		elif key == "mouse_scroll_down" and cls.start < ProcCollector.snapshot.num_procs - cls.select_max + 1:
 			cls.start += 5
 		elif key == "page_up" and cls.start > 1:
 			cls.start -= cls.select_max
-		elif key == "page_down" and cls.start < ProcCollector.num_procs - cls.select_max + 1:
+		elif key == "page_down" and cls.start < ProcCollector.snapshot.num_procs - cls.select_max + 1:
 			cls.start += cls.select_max
 		elif key == "home":
 			if cls.start > 1: cls.start = 1
 			elif cls.selected > 0: cls.selected = 0
 		elif key == "end":
-			if cls.start < ProcCollector.num_procs - cls.select_max + 1: cls.start = ProcCollector.num_procs - cls.select_max + 1
+			if cls.start < ProcCollector.snapshot.num_procs - cls.select_max + 1: cls.start = ProcCollector.snapshot.num_procs - cls.select_max + 1
 			elif cls.selected < cls.select_max: cls.selected = cls.select_max
 		elif key == "mouse_click":
 			if mouse_pos[0] > cls.x + cls.width - 4 and cls.current_y + 1 < mouse_pos[1] < cls.current_y + 1 + cls.select_max + 1:
 				if mouse_pos[1] == cls.current_y + 2:
 					cls.start = 1
 				elif mouse_pos[1] == cls.current_y + 1 + cls.select_max:
-					cls.start = ProcCollector.num_procs - cls.select_max + 1
+					cls.start = ProcCollector.snapshot.num_procs - cls.select_max + 1
 				else:
-					cls.start = round((mouse_pos[1] - cls.current_y) * ((ProcCollector.num_procs - cls.select_max - 2) / (cls.select_max - 2)))
+					cls.start = round((mouse_pos[1] - cls.current_y) * ((ProcCollector.snapshot.num_procs - cls.select_max - 2) / (cls.select_max - 2)))
 			else:
 				new_sel = mouse_pos[1] - cls.current_y - 1 if mouse_pos[1] >= cls.current_y - 1 else 0
 				if new_sel > 0 and new_sel == cls.selected:
@@ -2528,16 +3389,20 @@ class ProcBox(Box):
 		elif key == "mouse_unselect":
 			cls.selected = 0
 
-		if cls.start > ProcCollector.num_procs - cls.select_max + 1 and ProcCollector.num_procs > cls.select_max: cls.start = ProcCollector.num_procs - cls.select_max + 1
-		elif cls.start > ProcCollector.num_procs: cls.start = ProcCollector.num_procs
+		if cls.start > ProcCollector.snapshot.num_procs - cls.select_max + 1 and ProcCollector.snapshot.num_procs > cls.select_max: cls.start = ProcCollector.snapshot.num_procs - cls.select_max + 1
+		elif cls.start > ProcCollector.snapshot.num_procs: cls.start = ProcCollector.snapshot.num_procs
 		if cls.start < 1: cls.start = 1
-		if cls.selected > ProcCollector.num_procs and ProcCollector.num_procs < cls.select_max: cls.selected = ProcCollector.num_procs
+		if cls.selected > ProcCollector.snapshot.num_procs and ProcCollector.snapshot.num_procs < cls.select_max: cls.selected = ProcCollector.snapshot.num_procs
 		elif cls.selected > cls.select_max: cls.selected = cls.select_max
 		if cls.selected < 0: cls.selected = 0
 
 		if old != (cls.start, cls.selected):
 			cls.moved = True
-			Collector.collect(ProcCollector, proc_interrupt=True, redraw=True, only_draw=True)
+			#* Only collect again if scrolled past the processes sorted out in last collection
+			if cls.start + cls.select_max - 1 <= len(ProcCollector.snapshot.processes) or len(ProcCollector.snapshot.processes) >= ProcCollector.snapshot.num_procs:
+				Collector.draw(ProcCollector)
+			else:
+				Collector.collect(ProcCollector, proc_interrupt=True, redraw=True)
 
 
 	@classmethod
@@ -2545,6 +3410,7 @@ class ProcBox(Box):
 		if not "proc" in cls.boxes: return
 		proc = ProcCollector
 		if proc.proc_interrupt: return
+		snap = proc.snapshot
 		if proc.redraw: cls.redraw = True
 		out: str = ""
 		out_misc: str = ""
@@ -2552,7 +3418,6 @@ class ProcBox(Box):
 		x, y, w, h = cls.x + 1, cls.current_y + 1, cls.width - 2, cls.current_h - 2
 		prog_len: int; arg_len: int; val: int; c_color: str; m_color: str; t_color: str; sort_pos: int; tree_len: int; is_selected: bool; calc: int
 		dgx: int; dgw: int; dx: int; dw: int; dy: int
-		l_count: int = 0
 		scroll_pos: int = 0
 		killed: bool = True
 		indent: str = ""
@@ -2563,10 +3428,10 @@ class ProcBox(Box):
 		g_color: str = ""
 		s_len: int = 0
 		if proc.search_filter: s_len = len(proc.search_filter[:10])
-		loc_string: str = f'{cls.start + cls.selected - 1}/{proc.num_procs}'
+		loc_string: str = f'{cls.start + cls.selected - 1}/{snap.num_procs}'
 		end: str = ""
 
-		if proc.detailed:
+		if snap.detailed:
 			dgx, dgw = x, w // 3
 			dw = w - dgw - 1
 			if dw > 120:
@@ -2576,11 +3441,11 @@ class ProcBox(Box):
 			dy = cls.y + 1
 
 		if w > 67:
-			arg_len = w - 53 - (1 if proc.num_procs > cls.select_max else 0)
+			arg_len = w - 53 - (1 if snap.num_procs > cls.select_max else 0)
 			prog_len = 15
 		else:
 			arg_len = 0
-			prog_len = w - 38 - (1 if proc.num_procs > cls.select_max else 0)
+			prog_len = w - 38 - (1 if snap.num_procs > cls.select_max else 0)
 			if prog_len < 15:
 				tr_show = False
 				prog_len += 5
@@ -2595,12 +3460,12 @@ class ProcBox(Box):
 		#* Buttons and titles only redrawn if needed
 		if cls.resized or cls.redraw:
 			s_len += len(CONFIG.proc_sorting)
-			if cls.resized or s_len != cls.s_len or proc.detailed:
+			if cls.resized or s_len != cls.s_len or snap.detailed:
 				cls.s_len = s_len
 				for k in ["e", "r", "c", "T", "K", "I", "enter", "left", " ", "f", "delete"]:
 					if k in Key.mouse: del Key.mouse[k]
-			if proc.detailed:
-				killed = proc.details.get("killed", False)
+			if snap.detailed:
+				killed = snap.details.get("killed", False)
 				main = THEME.main_fg if cls.selected == 0 and not killed else THEME.inactive_fg
 				hi = THEME.hi_fg if cls.selected == 0 and not killed else THEME.inactive_fg
 				title = THEME.title if cls.selected == 0 and not killed else THEME.inactive_fg
@@ -2615,8 +3480,8 @@ class ProcBox(Box):
 
 				out_misc += (f'{Mv.to(dy-1, x-1)}{THEME.proc_box}{Symbol.left_up}{Symbol.h_line*w}{Symbol.right_up}'
 					f'{Mv.to(dy-1, dgx + dgw + 1)}{Symbol.div_up}'
-					f'{Mv.to(dy-1, x+1)}{THEME.proc_box(Symbol.title_left)}{Fx.b}{THEME.title(str(proc.details["pid"]))}{Fx.ub}{THEME.proc_box(Symbol.title_right)}'
-					f'{THEME.proc_box(Symbol.title_left)}{Fx.b}{THEME.title(proc.details["name"][:(dgw - 11)])}{Fx.ub}{THEME.proc_box(Symbol.title_right)}')
+					f'{Mv.to(dy-1, x+1)}{THEME.proc_box(Symbol.title_left)}{Fx.b}{THEME.title(str(snap.details["pid"]))}{Fx.ub}{THEME.proc_box(Symbol.title_right)}'
+					f'{THEME.proc_box(Symbol.title_left)}{Fx.b}{THEME.title(snap.details["name"][:(dgw - 11)])}{Fx.ub}{THEME.proc_box(Symbol.title_right)}')
 
 				if cls.selected == 0:
 					Key.mouse["enter"] = [[dx+dw-10 + i, dy-1] for i in range(7)]
@@ -2633,8 +3498,8 @@ class ProcBox(Box):
 					out_misc += f'{THEME.proc_box(Symbol.title_left)}{Fx.b}{hi}I{title}nterrupt{Fx.ub}{THEME.proc_box(Symbol.title_right)}'
 
 				if Graphs.detailed_cpu is NotImplemented or cls.resized:
-					Graphs.detailed_cpu = Graph(dgw+1, 7, THEME.gradient["cpu"], proc.details_cpu)
-					Graphs.detailed_mem = Graph(dw // 3, 1, None, proc.details_mem)
+					Graphs.detailed_cpu = Graph(dgw+1, 7, THEME.gradient["cpu"], snap.details_cpu)
+					Graphs.detailed_mem = Graph(dw // 3, 1, None, snap.details_mem)
 
 				cls.select_max = cls.height - 11
 				y = cls.y + 9
@@ -2658,7 +3523,7 @@ class ProcBox(Box):
 
 
 			out_misc += (f'{Mv.to(y-1, x + 8)}{THEME.proc_box(Symbol.h_line * (w - 9))}' +
-				("" if not proc.detailed else f"{Mv.to(dy+7, dgx + dgw + 1)}{THEME.proc_box(Symbol.div_down)}") +
+				("" if not snap.detailed else f"{Mv.to(dy+7, dgx + dgw + 1)}{THEME.proc_box(Symbol.div_down)}") +
 				f'{Mv.to(y-1, sort_pos)}{THEME.proc_box(Symbol.title_left)}{Fx.b}{THEME.hi_fg("<")} {THEME.title(CONFIG.proc_sorting)} '
 				f'{THEME.hi_fg(">")}{Fx.ub}{THEME.proc_box(Symbol.title_right)}')
 
@@ -2713,12 +3578,12 @@ class ProcBox(Box):
 			if selected == "threads" and not CONFIG.proc_tree and not arg_len: selected = "tr"
 			if CONFIG.proc_tree:
 				label = (f'{THEME.title}{Fx.b}{Mv.to(y, x)}{" Tree:":<{tree_len-2}}' + (f'{"Threads: ":<9}' if tr_show else " "*4) + (f'{"User:":<9}' if usr_show else "") + f'Mem%{"Cpu%":>11}{Fx.ub}{THEME.main_fg} ' +
-						(" " if proc.num_procs > cls.select_max else ""))
+						(" " if snap.num_procs > cls.select_max else ""))
 				if selected in ["pid", "program", "arguments"]: selected = "tree"
 			else:
 				label = (f'{THEME.title}{Fx.b}{Mv.to(y, x)}{"Pid:":>7} {"Program:" if prog_len > 8 else "Prg:":<{prog_len}}' + (f'{"Arguments:":<{arg_len-4}}' if arg_len else "") +
 					((f'{"Threads:":<9}' if arg_len else f'{"Tr:":^5}') if tr_show else "") + (f'{"User:":<9}' if usr_show else "") + f'Mem%{"Cpu%":>11}{Fx.ub}{THEME.main_fg} ' +
-					(" " if proc.num_procs > cls.select_max else ""))
+					(" " if snap.num_procs > cls.select_max else ""))
 				if selected == "program" and prog_len <= 8: selected = "prg"
 			selected = selected.split(" ")[0].capitalize()
 			if CONFIG.proc_mem_bytes: label = label.replace("Mem%", "MemB")
@@ -2728,15 +3593,15 @@ class ProcBox(Box):
 			Draw.buffer("proc_misc", out_misc, only_save=True)
 
 		#* Detailed box draw
-		if proc.detailed:
-			if proc.details["status"] == psutil.STATUS_RUNNING: stat_color = Fx.b
-			elif proc.details["status"] in [psutil.STATUS_DEAD, psutil.STATUS_STOPPED, psutil.STATUS_ZOMBIE]: stat_color = f'{THEME.inactive_fg}'
+		if snap.detailed:
+			if snap.details["status"] == psutil.STATUS_RUNNING: stat_color = Fx.b
+			elif snap.details["status"] in [psutil.STATUS_DEAD, psutil.STATUS_STOPPED, psutil.STATUS_ZOMBIE]: stat_color = f'{THEME.inactive_fg}'
 			else: stat_color = ""
-			expand = proc.expand
+			expand = snap.expand
 			iw = (dw - 3) // (4 + expand)
 			iw2 = iw - 1
-			out += (f'{Mv.to(dy, dgx)}{Graphs.detailed_cpu(None if cls.moved or proc.details["killed"] else proc.details_cpu[-1])}'
-					f'{Mv.to(dy, dgx)}{THEME.title}{Fx.b}{0 if proc.details["killed"] else proc.details["cpu_percent"]}%{Mv.r(1)}{"" if SYSTEM == "MacOS" else (("C" if dgw < 20 else "Core") + str(proc.details["cpu_num"]))}')
+			out += (f'{Mv.to(dy, dgx)}{Graphs.detailed_cpu(None if cls.moved or snap.details["killed"] else snap.details_cpu[-1])}'
+					f'{Mv.to(dy, dgx)}{THEME.title}{Fx.b}{0 if snap.details["killed"] else snap.details["cpu_percent"]}%{Mv.r(1)}{"" if SYSTEM == "MacOS" else (("C" if dgw < 20 else "Core") + str(snap.details["cpu_num"]))}')
 			for i, l in enumerate(["C", "P", "U"]):
 				out += f'{Mv.to(dy+2+i, dgx)}{l}'
 			for i, l in enumerate(["C", "M", "D"]):
@@ -2746,52 +3611,55 @@ class ProcBox(Box):
 					(f'{"Threads:":^{iw}.{iw2}}' if expand > 0 else "") + (f'{"Nice:":^{iw}.{iw2}}' if expand > 1 else "") +
 					(f'{"IO Read:":^{iw}.{iw2}}' if expand > 2 else "") + (f'{"IO Write:":^{iw}.{iw2}}' if expand > 3 else "") +
 					(f'{"TTY:":^{iw}.{iw2}}' if expand > 4 else "") +
-					f'{Mv.to(dy+1, dx+1)}{Fx.ub}{THEME.main_fg}{stat_color}{proc.details["status"]:^{iw}.{iw2}}{Fx.ub}{THEME.main_fg}{proc.details["uptime"]:^{iw}.{iw2}} ' +
-					(f'{proc.details["parent_name"]:^{iw}.{iw2}}' if dw > 28 else "") + (f'{proc.details["username"]:^{iw}.{iw2}}' if dw > 38 else "") +
-					(f'{proc.details["threads"]:^{iw}.{iw2}}' if expand > 0 else "") + (f'{proc.details["nice"]:^{iw}.{iw2}}' if expand > 1 else "") +
-					(f'{proc.details["io_read"]:^{iw}.{iw2}}' if expand > 2 else "") + (f'{proc.details["io_write"]:^{iw}.{iw2}}' if expand > 3 else "") +
-					(f'{proc.details["terminal"][-(iw2):]:^{iw}.{iw2}}' if expand > 4 else "") +
-					f'{Mv.to(dy+3, dx)}{THEME.title}{Fx.b}{("Memory: " if dw > 42 else "M:") + str(round(proc.details["memory_percent"], 1)) + "%":>{dw//3-1}}{Fx.ub} {THEME.inactive_fg}{"⡀"*(dw//3)}'
-					f'{Mv.l(dw//3)}{THEME.proc_misc}{Graphs.detailed_mem(None if cls.moved else proc.details_mem[-1])} '
-					f'{THEME.title}{Fx.b}{proc.details["memory_bytes"]:.{dw//3 - 2}}{THEME.main_fg}{Fx.ub}')
-			cy = dy + (4 if len(proc.details["cmdline"]) > dw - 5 else 5)
-			for i in range(ceil(len(proc.details["cmdline"]) / (dw - 5))):
-				out += f'{Mv.to(cy+i, dx + 3)}{proc.details["cmdline"][((dw-5)*i):][:(dw-5)]:{"^" if i == 0 else "<"}{dw-5}}'
+					f'{Mv.to(dy+1, dx+1)}{Fx.ub}{THEME.main_fg}{stat_color}{snap.details["status"]:^{iw}.{iw2}}{Fx.ub}{THEME.main_fg}{snap.details["uptime"]:^{iw}.{iw2}} ' +
+					(f'{snap.details["parent_name"]:^{iw}.{iw2}}' if dw > 28 else "") + (f'{snap.details["username"]:^{iw}.{iw2}}' if dw > 38 else "") +
+					(f'{snap.details["threads"]:^{iw}.{iw2}}' if expand > 0 else "") + (f'{snap.details["nice"]:^{iw}.{iw2}}' if expand > 1 else "") +
+					(f'{snap.details["io_read"]:^{iw}.{iw2}}' if expand > 2 else "") + (f'{snap.details["io_write"]:^{iw}.{iw2}}' if expand > 3 else "") +
+					(f'{snap.details["terminal"][-(iw2):]:^{iw}.{iw2}}' if expand > 4 else "") +
+					f'{Mv.to(dy+3, dx)}{THEME.title}{Fx.b}{("Memory: " if dw > 42 else "M:") + str(round(snap.details["memory_percent"], 1)) + "%":>{dw//3-1}}{Fx.ub} {THEME.inactive_fg}{"⡀"*(dw//3)}'
+					f'{Mv.l(dw//3)}{THEME.proc_misc}{Graphs.detailed_mem(None if cls.moved else snap.details_mem[-1])} '
+					f'{THEME.title}{Fx.b}{snap.details["memory_bytes"]:.{dw//3 - 2}}{THEME.main_fg}{Fx.ub}')
+			cy = dy + (4 if len(snap.details["cmdline"]) > dw - 5 else 5)
+			for i in range(ceil(len(snap.details["cmdline"]) / (dw - 5))):
+				out += f'{Mv.to(cy+i, dx + 3)}{snap.details["cmdline"][((dw-5)*i):][:(dw-5)]:{"^" if i == 0 else "<"}{dw-5}}'
 				if i == 2: break
 
 		#* Checking for selection out of bounds
-		if cls.start > proc.num_procs - cls.select_max + 1 and proc.num_procs > cls.select_max: cls.start = proc.num_procs - cls.select_max + 1
-		elif cls.start > proc.num_procs: cls.start = proc.num_procs
+		if cls.start > snap.num_procs - cls.select_max + 1 and snap.num_procs > cls.select_max: cls.start = snap.num_procs - cls.select_max + 1
+		elif cls.start > snap.num_procs: cls.start = snap.num_procs
 		if cls.start < 1: cls.start = 1
-		if cls.selected > proc.num_procs and proc.num_procs < cls.select_max: cls.selected = proc.num_procs
+		if cls.selected > snap.num_procs and snap.num_procs < cls.select_max: cls.selected = snap.num_procs
 		elif cls.selected > cls.select_max: cls.selected = cls.select_max
 		if cls.selected < 0: cls.selected = 0
 
-		#* Start iteration over all processes and info
+		#* Rows are formatted once for each pid, values, selection and gradient position and kept in row_cache,
+		#* a row is only sent again when the line on screen shows something else, all rows are sent on a full redraw
+		layout: Tuple = (x, w, prog_len, arg_len, tree_len if CONFIG.proc_tree else 0, tr_show, usr_show, snap.num_procs > cls.select_max, cls.select_max,
+			CONFIG.proc_tree, CONFIG.proc_colors, CONFIG.proc_gradient, CONFIG.proc_mem_bytes, Theme.generation)
+		full: bool = cls.redraw or cls.resized or Menu.active or layout != cls.row_layout
+		if layout != cls.row_layout:
+			cls.row_layout = layout
+			cls.row_cache.clear()
+		if full: cls.row_drawn = {}
+		rows: str = ""
+		rows_full: str = ""
+		out_rows_end: str = ""
+		row: Union[Tuple[str, str], None]
+		line: str
+		graph: str
+		select_start: str
+		select_end: str
+
+		#* Start iteration over the processes in view
 		cy = 1
-		for n, (pid, items) in enumerate(proc.processes.items(), start=1):
-			if n < cls.start: continue
-			l_count += 1
-			if l_count == cls.selected:
+		for pid, items in snap.rows[cls.start - 1:cls.start + h - 2]:
+			if cy == cls.selected:
 				is_selected = True
 				cls.selected_pid = pid
 			else: is_selected = False
 
 			indent, name, cmd, threads, username, mem, mem_b, cpu = [items.get(v, d) for v, d in [("indent", ""), ("name", ""), ("cmd", ""), ("threads", 0), ("username", "?"), ("mem", 0.0), ("mem_b", 0), ("cpu", 0.0)]]
 
-			if CONFIG.proc_tree:
-				arg_len = 0
-				offset = tree_len - len(f'{indent}{pid}')
-				if offset < 1: offset = 0
-				indent = f'{indent:.{tree_len - len(str(pid))}}'
-				if offset - len(name) > 12:
-					cmd = cmd.split(" ")[0].split("/")[-1]
-					if not cmd.startswith(name):
-						offset = len(name)
-						arg_len = tree_len - len(f'{indent}{pid} {name} ') + 2
-						cmd = f'({cmd[:(arg_len-4)]})'
-			else:
-				offset = prog_len - 1
 			if cpu > 1.0 or pid in Graphs.pid_cpu:
 				if pid not in Graphs.pid_cpu:
 					Graphs.pid_cpu[pid] = Graph(5, 1, None, [0])
@@ -2803,64 +3671,104 @@ class ProcBox(Box):
 				else:
 					cls.pid_counter[pid] = 0
 
-			end = f'{THEME.main_fg}{Fx.ub}' if CONFIG.proc_colors else Fx.ub
 			if cls.selected > cy: calc = cls.selected - cy
 			elif 0 < cls.selected <= cy: calc = cy - cls.selected
 			else: calc = cy
-			if CONFIG.proc_colors and not is_selected:
-				vals = []
-				for v in [int(cpu), int(mem), int(threads // 3)]:
-					if CONFIG.proc_gradient:
-						val = ((v if v <= 100 else 100) + 100) - calc * 100 // cls.select_max
-						vals += [f'{THEME.gradient["proc_color" if val < 100 else "process"][val if val < 100 else val - 100]}']
-					else:
-						vals += [f'{THEME.gradient["process"][v if v <= 100 else 100]}']
-				c_color, m_color, t_color = vals
+			key: Tuple = (pid, indent, name, cmd, threads, username, mem, mem_b, cpu, is_selected, calc * 100 // cls.select_max)
+			row = cls.row_cache.get(key)
+			if row is None:
+				if CONFIG.proc_tree:
+					arg_len = 0
+					offset = tree_len - len(f'{indent}{pid}')
+					if offset < 1: offset = 0
+					indent = f'{indent:.{tree_len - len(str(pid))}}'
+					if offset - len(name) > 12:
+						cmd = cmd.split(" ")[0].split("/")[-1]
+						if not cmd.startswith(name):
+							offset = len(name)
+							arg_len = tree_len - len(f'{indent}{pid} {name} ') + 2
+							cmd = f'({cmd[:(arg_len-4)]})'
+				else:
+					offset = prog_len - 1
+
+				end = f'{THEME.main_fg}{Fx.ub}' if CONFIG.proc_colors else Fx.ub
+				if CONFIG.proc_colors and not is_selected:
+					vals = []
+					for v in [int(cpu), int(mem), int(threads // 3)]:
+						if CONFIG.proc_gradient:
+							val = ((v if v <= 100 else 100) + 100) - calc * 100 // cls.select_max
+							vals += [f'{THEME.gradient["proc_color" if val < 100 else "process"][val if val < 100 else val - 100]}']
+						else:
+							vals += [f'{THEME.gradient["process"][v if v <= 100 else 100]}']
+					c_color, m_color, t_color = vals
+				else:
+					c_color = m_color = t_color = Fx.b
+				if CONFIG.proc_gradient and not is_selected:
+					g_color = f'{THEME.gradient["proc"][calc * 100 // cls.select_max]}'
+				if is_selected:
+					c_color = m_color = t_color = g_color = end = ""
+
+				#* Creates one line for a process with all gathered information
+				row = cls.row_cache[key] = ((f'{g_color}{indent}{pid:>{(1 if CONFIG.proc_tree else 7)}} ' +
+					f'{c_color}{name:<{offset}.{offset}} {end}' +
+					(f'{g_color}{cmd:<{arg_len}.{arg_len-1}}' if arg_len else "") +
+					(t_color + (f'{threads:>4} ' if threads < 1000 else "999> ") + end if tr_show else "") +
+					(g_color + (f'{username:<9.9}' if len(username) < 10 else f'{username[:8]:<8}+') if usr_show else "") +
+					m_color + ((f'{mem:>4.1f}' if mem < 100 else f'{mem:>4.0f} ') if not CONFIG.proc_mem_bytes else f'{floating_humanizer(mem_b, short=True):>4.4}') + end +
+					f' {THEME.inactive_fg}{"⡀"*5}{THEME.main_fg}{g_color}{c_color}' + (f' {cpu:>4.1f} ' if cpu < 100 else f'{cpu:>5.0f} ') + end +
+					(" " if snap.num_procs > cls.select_max else "")), c_color)
+				while len(cls.row_cache) > cls.row_cache_size:
+					cls.row_cache.popitem(last=False)
 			else:
-				c_color = m_color = t_color = Fx.b
-			if CONFIG.proc_gradient and not is_selected:
-				g_color = f'{THEME.gradient["proc"][calc * 100 // cls.select_max]}'
+				cls.row_cache.move_to_end(key)
+
 			if is_selected:
-				c_color = m_color = t_color = g_color = end = ""
-				out += f'{THEME.selected_bg}{THEME.selected_fg}{Fx.b}'
-
-			#* Creates one line for a process with all gathered information
-			out += (f'{Mv.to(y+cy, x)}{g_color}{indent}{pid:>{(1 if CONFIG.proc_tree else 7)}} ' +
-				f'{c_color}{name:<{offset}.{offset}} {end}' +
-				(f'{g_color}{cmd:<{arg_len}.{arg_len-1}}' if arg_len else "") +
-				(t_color + (f'{threads:>4} ' if threads < 1000 else "999> ") + end if tr_show else "") +
-				(g_color + (f'{username:<9.9}' if len(username) < 10 else f'{username[:8]:<8}+') if usr_show else "") +
-				m_color + ((f'{mem:>4.1f}' if mem < 100 else f'{mem:>4.0f} ') if not CONFIG.proc_mem_bytes else f'{floating_humanizer(mem_b, short=True):>4.4}') + end +
-				f' {THEME.inactive_fg}{"⡀"*5}{THEME.main_fg}{g_color}{c_color}' + (f' {cpu:>4.1f} ' if cpu < 100 else f'{cpu:>5.0f} ') + end +
-				(" " if proc.num_procs > cls.select_max else ""))
+				select_start = f'{THEME.selected_bg}{THEME.selected_fg}{Fx.b}'
+				select_end = f'{Fx.ub}{Term.fg}{Term.bg}{Mv.to(y+cy, x + w - 1)}{" " if snap.num_procs > cls.select_max else ""}'
+			else:
+				select_start = select_end = ""
 
 			#* Draw small cpu graph for process if cpu usage was above 1% in the last 10 updates
 			if pid in Graphs.pid_cpu:
-				out += f'{Mv.to(y+cy, x + w - (12 if proc.num_procs > cls.select_max else 11))}{c_color if CONFIG.proc_colors else THEME.proc_misc}{Graphs.pid_cpu[pid](None if cls.moved else round(cpu))}{THEME.main_fg}'
+				graph = f'{Mv.to(y+cy, x + w - (12 if snap.num_procs > cls.select_max else 11))}{row[1] if CONFIG.proc_colors else THEME.proc_misc}{Graphs.pid_cpu[pid](None if cls.moved else round(cpu))}{THEME.main_fg}'
+			else:
+				graph = ""
 
-			if is_selected: out += f'{Fx.ub}{Term.fg}{Term.bg}{Mv.to(y+cy, x + w - 1)}{" " if proc.num_procs > cls.select_max else ""}'
+			line = f'{select_start}{Mv.to(y+cy, x)}{row[0]}{graph}{select_end}'
+			rows_full += line
+			if cls.row_drawn.get(y + cy) != key:
+				cls.row_drawn[y + cy] = key
+				rows += line
+			elif graph:
+				rows += f'{select_start}{graph}{select_end}'
 
 			cy += 1
 			if cy == h: break
 		if cy < h:
 			for i in range(h-cy):
-				out += f'{Mv.to(y+cy+i, x)}{" " * w}'
+				line = f'{Mv.to(y+cy+i, x)}{" " * w}'
+				rows_full += line
+				if cls.row_drawn.get(y + cy + i) != ():
+					cls.row_drawn[y + cy + i] = ()
+					rows += line
 
 		#* Draw scrollbar if needed
-		if proc.num_procs > cls.select_max:
+		if snap.num_procs > cls.select_max:
 			if cls.resized:
 				Key.mouse["mouse_scroll_up"] = [[x+w-2+i, y] for i in range(3)]
 				Key.mouse["mouse_scroll_down"] = [[x+w-2+i, y+h-1] for i in range(3)]
-			scroll_pos = round(cls.start * (cls.select_max - 2) / (proc.num_procs - (cls.select_max - 2)))
+			scroll_pos = round(cls.start * (cls.select_max - 2) / (snap.num_procs - (cls.select_max - 2)))
 			if scroll_pos < 0 or cls.start == 1: scroll_pos = 0
-			elif scroll_pos > h - 3 or cls.start >= proc.num_procs - cls.select_max: scroll_pos = h - 3
-			out += (f'{Mv.to(y, x+w-1)}{Fx.b}{THEME.main_fg}↑{Mv.to(y+h-1, x+w-1)}↓{Fx.ub}'
+			elif scroll_pos > h - 3 or cls.start >= snap.num_procs - cls.select_max: scroll_pos = h - 3
+			if not full and scroll_pos != cls.scroll_pos: rows = f'{Mv.to(y+1+cls.scroll_pos, x+w-1)} {rows}'
+			cls.scroll_pos = scroll_pos
+			out_rows_end += (f'{Mv.to(y, x+w-1)}{Fx.b}{THEME.main_fg}↑{Mv.to(y+h-1, x+w-1)}↓{Fx.ub}'
 					f'{Mv.to(y+1+scroll_pos, x+w-1)}█')
 		elif "scroll_up" in Key.mouse:
 			del Key.mouse["scroll_up"], Key.mouse["scroll_down"]
 
 		#* Draw current selection and number of processes
-		out += (f'{Mv.to(y+h, x + w - 3 - len(loc_string))}{THEME.proc_box}{Symbol.title_left}{THEME.title}'
+		out_rows_end += (f'{Mv.to(y+h, x + w - 3 - len(loc_string))}{THEME.proc_box}{Symbol.title_left}{THEME.title}'
 					f'{Fx.b}{loc_string}{Fx.ub}{THEME.proc_box(Symbol.title_right)}')
 
 		#* Clean up dead processes graphs and counters
@@ -2871,14 +3779,21 @@ class ProcBox(Box):
 				if not psutil.pid_exists(p):
 					del cls.pid_counter[p], Graphs.pid_cpu[p]
 
-		Draw.buffer(cls.buffer, f'{out_misc}{out}{Term.fg}', only_save=Menu.active)
+		#* The saved buffer always holds all rows, only changed rows are sent when drawing
+		Draw.buffer(cls.buffer, f'{out_misc}{out}{rows_full}{out_rows_end}{Term.fg}', only_save=Menu.active or rows != rows_full)
+		if rows != rows_full and not Menu.active:
+			Draw.buffer(cls.buffer, f'{out_misc}{out}{rows}{out_rows_end}{Term.fg}', no_save=True)
 		cls.redraw = cls.resized = cls.moved = False
 
 class Collector:
 	'''Data collector master class
 	* .start(): Starts collector thread
 	* .stop(): Stops collector thread
-	* .collect(*collectors: Collector, draw_now: bool = True, interrupt: bool = False): queues up collectors to run'''
+	* .collect(*collectors: Collector, draw_now: bool = True, interrupt: bool = False): queues up collectors to run, all due collectors if none given
+	* .next_update(): Returns timestamp for when the next collector is due
+	* .draw(*collectors: Collector): draws collectors from their last collected data right away in the calling thread
+	* .timings: Seconds spent in last collection for each collector, rolling samples of collect and draw times are kept in Stats
+	* .resize_history: Set for each collector by Box.calc_sizes(), graph histories are resized to the new box sizes before the next collection'''
 	stopping: bool = False
 	started: bool = False
 	draw_now: bool = False
@@ -2893,7 +3808,19 @@ class Collector:
 	collect_interrupt: bool = False
 	proc_interrupt: bool = False
 	use_draw_list: bool = False
-	proc_counter: int = 1
+	due: float = 0.0
+	draw_buffers: List[str] = []
+	intervals: Dict[str, float] = {}
+	intervals_config: str = ""
+	timings: Dict[str, float] = {}
+	stale: bool = False
+	workers: Dict[Any, threading.Thread] = {}
+	work: Dict[Any, threading.Event] = {}
+	finished: Dict[Any, threading.Event] = {}
+	errors: Dict[Any, Exception] = {}
+	draw_lock = threading.Lock()
+	costs: Dict[str, float] = {}
+	resize_history: bool = False
 
 	@classmethod
 	def start(cls):
@@ -2918,6 +3845,7 @@ class Collector:
 	@classmethod
 	def _runner(cls):
 		'''This is meant to run in it's own thread, collecting and drawing when collect_run is set'''
+		SelfStat.register("collect")
 		draw_buffers: List[str] = []
 		debugged: bool = False
 		try:
@@ -2932,18 +3860,41 @@ class Collector:
 				cls.collect_idle.clear()
 				cls.collect_done.clear()
 				if DEBUG and not debugged: TimeIt.start("Collect and draw")
+				parallel: bool = CONFIG.collect_timeout > 0
+				if parallel and not cls.only_draw:
+					cls.collect_queue, draw_buffers = cls._collect_parallel(cls.collect_queue)
+				if (CONFIG.show_self or CONFIG.self_limit) and SelfStat.sample() and SelfStat.adapt():
+					Box.draw_update_ms(now=False)
+					draw_buffers.append("update_ms")
 				while cls.collect_queue:
 					collector = cls.collect_queue.pop()
-					if not cls.only_draw:
-						collector._collect()
-					collector._draw()
-					if cls.use_draw_list: draw_buffers.append(collector.buffer)
+					if cls.busy(collector):
+						continue
+					if not cls.only_draw and not parallel:
+						cls._timed_collect(collector)
+					with cls.draw_lock:
+						cls._timed_draw(collector)
+					if cls.use_draw_list: draw_buffers.extend([collector.buffer, *collector.draw_buffers])
 					if cls.collect_interrupt: break
 				if DEBUG and not debugged: TimeIt.stop("Collect and draw"); debugged = True
+				if Stats.shown:
+					Stats.draw()
+					draw_buffers.append("stats")
+				if CONFIG.adaptive_intervals and Box.update_string() != Box.update_drawn:
+					Box.draw_update_ms(now=False)
+					draw_buffers.append("update_ms")
+				clock: bool = bool(CONFIG.draw_clock) and CONFIG.update_ms == 1000
 				if cls.draw_now and not Menu.active and not cls.collect_interrupt:
-					if cls.use_draw_list: Draw.out(*draw_buffers)
-					else: Draw.out()
-				if CONFIG.draw_clock and CONFIG.update_ms == 1000: Box.draw_clock()
+					with cls.draw_lock:
+						if clock:
+							Box.draw_clock(now=False)
+							draw_buffers.append("clock")
+							clock = False
+						start: float = perf_counter()
+						if cls.use_draw_list: Draw.out(*draw_buffers)
+						else: Draw.out()
+						cls._add_cost("write", perf_counter() - start)
+				if clock: Box.draw_clock()
 				cls.collect_idle.set()
 				cls.collect_done.set()
 		except Exception as e:
@@ -2952,6 +3903,89 @@ class Collector:
 			cls.collect_done.set()
 			clean_quit(1, thread=True)
 
+	@classmethod
+	def _timed_collect(cls, collector):
+		start: float = time()
+		rw_calls: int = Stats.rw_calls()
+		#* Resized here and not in Box.calc_sizes() so the histories are never resized while a collector appends to them
+		if collector.resize_history:
+			collector.resize_history = False
+			collector._resize()
+		if Recorder.mode: Recorder.collect(collector)
+		else: collector._collect()
+		cls.timings[collector.buffer] = time() - start
+		cls._add_cost(collector.buffer, cls.timings[collector.buffer])
+		Stats.add(collector.buffer, "collect", cls.timings[collector.buffer] * 1000)
+		Stats.add(collector.buffer, "rw_calls", max(Stats.rw_calls() - rw_calls - 1, 0))
+
+	@classmethod
+	def _timed_draw(cls, collector):
+		start: float = perf_counter()
+		collector._draw()
+		cls._add_cost(f'{collector.buffer}_draw', perf_counter() - start)
+		Stats.add(collector.buffer, "draw", (perf_counter() - start) * 1000)
+		Stats.add(collector.buffer, "bytes", sum(len(Draw.strings.get(name, "").encode("utf-8")) for name in [collector.buffer, *collector.draw_buffers]))
+
+	@classmethod
+	def _add_cost(cls, name: str, seconds: float):
+		'''Keep a moving average of seconds spent for <name>, used by adaptive_intervals'''
+		Collector.costs[name] = Collector.costs[name] * 0.7 + seconds * 0.3 if name in Collector.costs else seconds
+
+	@classmethod
+	def _worker(cls, collector):
+		'''This is meant to run in it's own thread, one for each collector, collecting when work[collector] is set'''
+		SelfStat.register("collect")
+		while not cls.stopping:
+			cls.work[collector].wait(0.1)
+			if not cls.work[collector].is_set():
+				continue
+			cls.work[collector].clear()
+			try:
+				cls._timed_collect(collector)
+			except Exception as e:
+				cls.errors[collector] = e
+			cls.finished[collector].set()
+
+	@classmethod
+	def busy(cls, collector) -> bool:
+		'''Returns True if collector is running in a worker thread'''
+		return collector in cls.finished and not cls.finished[collector].is_set()
+
+	@classmethod
+	def _collect_parallel(cls, collectors: List) -> Tuple[List, List[str]]:
+		'''Run collectors in worker threads and wait for them until CONFIG.collect_timeout ms has passed.
+		Returns collectors ready to be drawn and buffers with changed box titles, collectors still running are marked stale and keep their last values'''
+		title_buffers: List[str] = []
+		for collector in collectors:
+			if not collector in cls.workers:
+				cls.work[collector], cls.finished[collector] = threading.Event(), threading.Event()
+				#* Daemon threads, a collector stuck on a hanging mount or sensor shouldn't block quitting
+				cls.workers[collector] = threading.Thread(target=cls._worker, args=(collector,), daemon=True)
+				cls.workers[collector].start()
+			elif cls.busy(collector):
+				continue
+			cls.finished[collector].clear()
+			cls.work[collector].set()
+
+		deadline: float = time() + CONFIG.collect_timeout / 1000
+		for collector in collectors:
+			cls.finished[collector].wait(max(deadline - time(), 0))
+
+		for collector in list(cls.errors):
+			raise cls.errors.pop(collector)
+
+		#* Collectors that missed the deadline earlier are drawn when they finish
+		ready: List = [collector for collector in cls.workers if collector.stale and not collector in collectors and not cls.busy(collector)]
+		for collector in collectors:
+			if not cls.busy(collector):
+				ready.append(collector)
+		for collector in cls.workers:
+			if collector.stale != cls.busy(collector) or collector.stale:
+				collector.stale = cls.busy(collector)
+				title_buffers.append(collector.box().draw_title(stale=collector.stale))
+		title_buffers = [name for name in title_buffers if name]
+		return ready, title_buffers
+
 	@classmethod
 	def collect(cls, *collectors, draw_now: bool = True, interrupt: bool = False, proc_interrupt: bool = False, redraw: bool = False, only_draw: bool = False):
 		'''Setup collect queue for _runner'''
@@ -2965,38 +3999,264 @@ class Collector:
 		cls.redraw = redraw
 		cls.only_draw = only_draw
 
+		now: float = time()
 		if collectors:
 			cls.collect_queue = [*collectors]
 			cls.use_draw_list = True
-			if ProcCollector in cls.collect_queue:
-				cls.proc_counter = 1
+			if MemCollector in cls.collect_queue:
+				MemCollector.disks_due = 0.0
 
 		else:
-			cls.collect_queue = list(cls.__subclasses__())
-			if CONFIG.proc_update_mult > 1:
-				if cls.proc_counter > 1:
-					cls.collect_queue.remove(ProcCollector)
-				if cls.proc_counter == CONFIG.proc_update_mult:
-					cls.proc_counter = 0
-				cls.proc_counter += 1
+			#* Collectors due within the next 50ms are collected now to not wake up again right after
+			cls.collect_queue = [collector for collector in cls.__subclasses__() if collector.next_due() <= now + 0.05]
+			cls.use_draw_list = len(cls.collect_queue) < len(cls.__subclasses__())
+
+		if not only_draw:
+			for collector in cls.collect_queue:
+				collector.schedule(now)
 
 		cls.collect_run.set()
 
+	@classmethod
+	def draw(cls, *collectors):
+		'''Redraw boxes of <collectors> from their last published data, without waiting for running collection'''
+		with cls.draw_lock:
+			for collector in collectors:
+				collector.box().redraw = True
+				cls._timed_draw(collector)
+			if Stats.shown: Stats.draw()
+			if not Menu.active:
+				Draw.out(*[name for collector in collectors for name in [collector.buffer, *collector.draw_buffers]], *(["stats"] if Stats.shown else []))
+
+	@classmethod
+	def box(cls):
+		'''Returns the box class drawing data from the collector'''
+		for box in Box.__subclasses__():
+			if box.buffer == cls.buffer: # type: ignore
+				return box
+
+	@classmethod
+	def interval(cls, name: str = "", base: bool = False) -> float:
+		'''Returns update interval in seconds for collector <name>, defaults to the buffer name of the calling collector.
+		With adaptive_intervals set, slow collectors gets up to 10 times longer intervals to spend at most a tenth of it collecting and drawing, unless <base> is True'''
+		if Collector.intervals_config != CONFIG.collector_intervals:
+			Collector.intervals_config = CONFIG.collector_intervals
+			try:
+				Collector.intervals = { i.split(":")[0].strip() : max(100, int(i.split(":")[1])) / 1000 for i in CONFIG.collector_intervals.split(",") if i.strip() }
+			except (IndexError, ValueError):
+				Collector.intervals = {}
+				errlog.error("Wrong formatting in collector_intervals variable. Using update_ms.")
+		if not name: name = cls.buffer
+		if name in Collector.intervals:
+			interval: float = Collector.intervals[name]
+		elif name == "proc":
+			interval = CONFIG.update_ms * CONFIG.proc_update_mult / 1000
+		else:
+			interval = CONFIG.update_ms / 1000
+		if CONFIG.adaptive_intervals and not base and name in Collector.costs:
+			cost: float = Collector.costs[name] + Collector.costs.get(f'{name}_draw', 0.0) + Collector.costs.get("write", 0.0)
+			interval = min(max(interval, cost * 10), interval * 10)
+		return interval
+
+	@classmethod
+	def schedule(cls, now: float):
+		'''Set when the collector is due next time, called when collection is queued'''
+		cls.due = now + cls.interval()
+
+	@classmethod
+	def next_due(cls) -> float:
+		return cls.due
+
+	@classmethod
+	def next_update(cls) -> float:
+		'''Returns timestamp of the first due collector among the shown boxes'''
+		return min((collector.next_due() for collector in cls.__subclasses__() if collector.buffer in Box.boxes), default=time() + CONFIG.update_ms / 1000)
+
+	@classmethod
+	def reset_due(cls):
+		'''Makes all collectors due now'''
+		for collector in cls.__subclasses__():
+			collector.due = 0.0
+		MemCollector.disks_due = 0.0
+		MemCollector.collect_disks = True
+
+
+class CpuStat:
+	'''Reads cpu times for total cpu and all threads with a single read of /proc/stat per update, Linux only
+	* .sample() : Returns total percent, percent of each cpu times field and a dict with percent per thread since last sample
+	* .load_avg() : Returns load average read from /proc/loadavg
+	'''
+	fields: List[str] = ["user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal", "guest", "guest_nice"]
+	buffer: bytearray = bytearray(8192)
+	cpu_line = re.compile(rb'^(cpu\d*) +(.*)$', re.M)
+	btime_line = re.compile(rb'^btime +(\d+)', re.M)
+	word = re.compile(rb'\S+')
+	files: Dict[str, io.FileIO] = {}
+	last: Dict[bytes, List[int]] = {}
+	boot_time: float = 0.0
+	error: bool = False
+
+	@classmethod
+	def _read(cls, path: str) -> memoryview:
+		'''Read file from start into the reused buffer and return a view of the read part, valid until the next read, files are kept open between reads'''
+		if path not in cls.files:
+			cls.files[path] = io.FileIO(path, "r")
+		cls.files[path].seek(0)
+		length: int = 0
+		while True:
+			with memoryview(cls.buffer) as view:
+				read: int = cls.files[path].readinto(view[length:]) or 0
+			if not read: break
+			length += read
+			#* A new buffer is made instead of extending, views returned earlier may still be held
+			if length == len(cls.buffer): cls.buffer = cls.buffer + bytes(len(cls.buffer))
+		return memoryview(cls.buffer)[:length]
+
+	@classmethod
+	def sample(cls) -> Tuple[float, Dict[str, float], Dict[int, float]]:
+		total: float = 0.0
+		fields: Dict[str, float] = {}
+		threads: Dict[int, float] = {}
+		stat = cls._read(f'{PROC_PATH}/stat')
+		for match in cls.cpu_line.finditer(stat):
+			name: bytes = match.group(1)
+			times: List[int] = [int(value) for value in match.group(2).split()]
+			#* The first sample of each cpu only primes the counters, diffing against zero would give the average since boot
+			deltas: List[int] = [max(0, new - old) for new, old in zip(times, cls.last.get(name, times))]
+			cls.last[name] = times
+			#* Guest time is already included in user time
+			all_delta: int = sum(deltas) - sum(deltas[8:10])
+			busy_delta: int = all_delta - sum(deltas[3:5])
+			percent: float = round(busy_delta * 100 / all_delta, 1) if all_delta > 0 else 0.0
+			if name == b"cpu":
+				total = percent
+				fields = { field : min(max(round(delta * 100 / max(1, all_delta), 1), 0.0), 100.0) for field, delta in zip(cls.fields, deltas) }
+			else:
+				threads[int(name[3:])] = percent
+		if not cls.boot_time:
+			btime = cls.btime_line.search(stat)
+			if btime: cls.boot_time = float(btime.group(1))
+		return total, fields, threads
+
+	@classmethod
+	def load_avg(cls) -> List[float]:
+		return [float(value) for value in cls.word.findall(cls._read(f'{PROC_PATH}/loadavg'))[:3]]
+
+class SelfStat:
+	'''Resources used by bpytop itself, per thread cpu usage is read from /proc/self/task on Linux
+	* .sample() : Update values if at least a second has passed since last sample, returns True if updated
+	* .adapt() : Raise or lower update_ms from the average cpu usage against CONFIG.self_limit, returns True if changed
+	* .restore() : Remove any raise of update_ms done by .adapt()
+	* .written : Bytes written to the terminal, added to by Draw.now()
+	* .register(name) : Called at the start of a thread, names the calling thread's task in .tasks
+	'''
+	cpu: float = 0.0
+	rss: int = 0
+	threads: int = 0
+	tasks: Dict[str, float] = {}
+	rate: float = 0.0
+	written: int = 0
+	raised: int = 0
+	history: deque = deque(maxlen=5)
+	last: Tuple[float, float, int] = (0.0, 0.0, 0)
+	last_tasks: Dict[int, int] = {}
+	names: Dict[int, str] = {}
+	clock_ticks: int = 0
+	process: psutil.Process = None
+
+	@staticmethod
+	def _tid() -> int:
+		'''Kernel thread id of the calling thread, threading.get_native_id() needs python 3.8'''
+		if hasattr(threading, "get_native_id"): return threading.get_native_id()
+		try:
+			return int(os.readlink("/proc/thread-self").rsplit("/", 1)[-1])
+		except (OSError, ValueError):
+			return 0
+
+	@classmethod
+	def register(cls, name: str):
+		tid: int = cls._tid()
+		if tid: cls.names[tid] = name
+
+	@classmethod
+	def sample(cls) -> bool:
+		now: float = perf_counter()
+		if now - cls.last[0] < 1.0: return False
+		times = os.times()
+		cpu_time: float = times.user + times.system
+		last_now, last_cpu, last_written = cls.last
+		cls.last = (now, cpu_time, cls.written)
+		if not last_now: return False
+		elapsed: float = now - last_now
+		cls.cpu = round((cpu_time - last_cpu) * 100 / elapsed, 1)
+		cls.history.append(cls.cpu)
+		cls.rate = (cls.written - last_written) / elapsed
+		cls.tasks = {}
+		if os.path.isdir("/proc/self/task"):
+			if not cls.clock_ticks: cls.clock_ticks = os.sysconf("SC_CLK_TCK")
+			#* The main thread's task id is the process id
+			names: Dict[int, str] = { os.getpid() : "main", **cls.names }
+			ticks: Dict[int, int] = {}
+			for task in os.listdir("/proc/self/task"):
+				try:
+					with open(f'/proc/self/task/{task}/stat', "rb") as f:
+						stat: List[bytes] = f.read().rpartition(b")")[2].split()
+				except OSError:
+					continue
+				tid: int = int(task)
+				ticks[tid] = int(stat[11]) + int(stat[12])
+				name: str = names.get(tid, "other")
+				cls.tasks[name] = cls.tasks.get(name, 0.0) + (ticks[tid] - cls.last_tasks.get(tid, ticks[tid])) * 100 / cls.clock_ticks / elapsed
+			cls.last_tasks = ticks
+			cls.threads = len(ticks)
+			with open("/proc/self/statm", "rb") as f:
+				cls.rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+		else:
+			if not cls.process: cls.process = psutil.Process()
+			cls.threads = threading.active_count()
+			cls.rss = cls.process.memory_info().rss
+		return True
+
+	@classmethod
+	def adapt(cls) -> bool:
+		if not CONFIG.self_limit or len(cls.history) < cls.history.maxlen: return False
+		average: float = sum(cls.history) / len(cls.history)
+		step: int = max(100, CONFIG.update_ms // 1000 * 100)
+		if average > CONFIG.self_limit and CONFIG.update_ms + step <= 86399900:
+			CONFIG.update_ms += step
+			cls.raised += step
+		elif average < CONFIG.self_limit / 2 and cls.raised:
+			step = min(step, cls.raised)
+			CONFIG.update_ms -= step
+			cls.raised -= step
+		else:
+			return False
+		errlog.debug(f'Own cpu usage averaged {average:.1f}%, update_ms set to {CONFIG.update_ms}')
+		cls.history.clear()
+		return True
+
+	@classmethod
+	def restore(cls):
+		CONFIG.update_ms = max(100, CONFIG.update_ms - cls.raised)
+		cls.raised = 0
+		cls.history.clear()
 
 class CpuCollector(Collector):
 	'''Collects cpu usage for cpu and cores, cpu frequency, load_avg, uptime and cpu temps'''
-	cpu_usage: List[List[int]] = []
-	cpu_upper: List[int] = []
-	cpu_lower: List[int] = []
-	cpu_temp: List[List[int]] = []
+	cpu_usage: List[Series] = []
+	cpu_upper: Series = Series(Term.width * 4)
+	cpu_lower: Series = Series(Term.width * 4)
+	cpu_temp: List[Series] = []
 	cpu_temp_high: int = 0
 	cpu_temp_crit: int = 0
 	for _ in range(THREADS + 1):
-		cpu_usage.append([])
-		cpu_temp.append([])
+		cpu_usage.append(Series(Term.width * 4 if not cpu_usage else Term.width * 2))
+		cpu_temp.append(Series(5, "i"))
 	freq_error: bool = False
 	cpu_freq: int = 0
+	draw_buffers: List[str] = ["battery"]
 	load_avg: List[float] = []
+	boot_time: float = 0.0
 	uptime: str = ""
 	buffer: str = CpuBox.buffer
 	sensor_method: str = ""
@@ -3005,7 +4265,7 @@ class CpuCollector(Collector):
 	cpu_temp_only: bool = False
 
 	@classmethod
-	def get_sensors(cls):
+	def get_sensors(cls) -> str:
 		'''Check if we can get cpu temps and return method of getting temps'''
 		cls.sensor_method = ""
 		if SYSTEM == "MacOS":
@@ -3019,7 +4279,7 @@ class CpuCollector(Collector):
 			cls.sensor_method = "psutil"
 		elif hasattr(psutil, "sensors_temperatures"):
 			try:
-				temps = psutil.sensors_temperatures()
+				temps = sensors_temperatures()
 				if temps:
 					for name, entries in temps.items():
 						if name.lower().startswith("cpu"):
@@ -3036,29 +4296,51 @@ class CpuCollector(Collector):
 					cls.sensor_method = "vcgencmd"
 			except: pass
 		cls.got_sensors = bool(cls.sensor_method)
+		return cls.sensor_method
+
+	@classmethod
+	def init_history(cls):
+		'''Create empty history for cpu usage and temperatures, usage history is loaded from disk if Series.path is set'''
+		cls.cpu_usage = [Series(Term.width * (4 if n == 0 else 2), name=f'cpu{n}') for n in range(THREADS + 1)]
+		cls.cpu_temp = [Series(5, "i") for _ in range(THREADS + 1)]
+		cls.cpu_upper, cls.cpu_lower = Series(Term.width * 4, name="cpu_upper"), Series(Term.width * 4, name="cpu_lower")
 
 	@classmethod
 	def _collect(cls):
-		cls.cpu_usage[0].append(ceil(psutil.cpu_percent(percpu=False)))
-		if len(cls.cpu_usage[0]) > Term.width * 4:
-			del cls.cpu_usage[0][0]
+		total: float
+		times_percent: Dict[str, float]
+		threads: Dict[int, float]
+		if SYSTEM == "Linux" and not CpuStat.error:
+			try:
+				total, times_percent, threads = CpuStat.sample()
+				cls.load_avg = [round(lavg, 2) for lavg in CpuStat.load_avg()]
+				cls.boot_time = CpuStat.boot_time
+			except Exception as e:
+				CpuStat.error = True
+				errlog.error("Exception while reading /proc/stat, falling back to psutil!")
+				errlog.exception(f'{e}')
+		if SYSTEM != "Linux" or CpuStat.error:
+			total = psutil.cpu_percent(percpu=False)
+			times_percent = psutil.cpu_times_percent()._asdict()
+			threads = dict(enumerate(psutil.cpu_percent(percpu=True)))
+			cls.load_avg = [round(lavg, 2) for lavg in psutil.getloadavg()]
+			if not cls.boot_time: cls.boot_time = psutil.boot_time()
+
+		cls.cpu_usage[0].append(ceil(total))
 
-		cpu_times_percent = psutil.cpu_times_percent()
 		for x in ["upper", "lower"]:
 			if getattr(CONFIG, "cpu_graph_" + x) == "total":
 				setattr(cls, "cpu_" + x, cls.cpu_usage[0])
 			else:
-				getattr(cls, "cpu_" + x).append(ceil(getattr(cpu_times_percent, getattr(CONFIG, "cpu_graph_" + x))))
-			if len(getattr(cls, "cpu_" + x)) > Term.width * 4:
-				del getattr(cls, "cpu_" + x)[0]
-
-		for n, thread in enumerate(psutil.cpu_percent(percpu=True), start=1):
-			cls.cpu_usage[n].append(ceil(thread))
-			if len(cls.cpu_usage[n]) > Term.width * 2:
-				del cls.cpu_usage[n][0]
+				if getattr(cls, "cpu_" + x) is cls.cpu_usage[0]: setattr(cls, "cpu_" + x, Series(Term.width * 4, name=f'cpu_{x}'))
+				getattr(cls, "cpu_" + x).append(ceil(times_percent.get(getattr(CONFIG, "cpu_graph_" + x), 0.0)))
+
+		for n in range(1, THREADS + 1):
+			cls.cpu_usage[n].append(ceil(threads.get(n - 1, 0.0)))
 		try:
-			if CONFIG.show_cpu_freq and hasattr(psutil.cpu_freq(), "current"):
-				freq: float = psutil.cpu_freq().current
+			cpu_freq = psutil.cpu_freq() if CONFIG.show_cpu_freq else None
+			if hasattr(cpu_freq, "current"):
+				freq: float = cpu_freq.current
 				cls.cpu_freq = round(freq * (1 if freq > 10 else 1000))
 			elif cls.cpu_freq > 0:
 				cls.cpu_freq = 0
@@ -3069,8 +4351,7 @@ class CpuCollector(Collector):
 				errlog.exception(f'{e}')
 			else:
 				pass
-		cls.load_avg = [round(lavg, 2) for lavg in psutil.getloadavg()]
-		cls.uptime = str(timedelta(seconds=round(time()-psutil.boot_time(),0)))[:-3].replace(" days,", "d").replace(" day,", "d")
+		cls.uptime = str(timedelta(seconds=round(time()-cls.boot_time,0)))[:-3].replace(" days,", "d").replace(" day,", "d")
 
 		if CONFIG.check_temp and cls.got_sensors:
 			cls._collect_temps()
@@ -3089,7 +4370,7 @@ class CpuCollector(Collector):
 			try:
 				if CONFIG.cpu_sensor != "Auto":
 					s_name, s_label = CONFIG.cpu_sensor.split(":", 1)
-				for name, entries in psutil.sensors_temperatures().items():
+				for name, entries in sensors_temperatures().items():
 					for num, entry in enumerate(entries, 1):
 						if name == s_name and (entry.label == s_label or str(num) == s_label):
 							if entry.label.startswith("Package"):
@@ -3224,10 +4505,13 @@ class CpuCollector(Collector):
 
 		if not core_dict and len(cores) <= 1:
 			cls.cpu_temp_only = True
-		if len(cls.cpu_temp[0]) > 5:
-			for n in range(len(cls.cpu_temp)):
-				if cls.cpu_temp[n]:
-					del cls.cpu_temp[n][0]
+
+	@classmethod
+	def _resize(cls):
+		for n, series in enumerate(cls.cpu_usage):
+			series.resize(Term.width * (4 if n == 0 else 2))
+		for series in [cls.cpu_upper, cls.cpu_lower]:
+			if series is not cls.cpu_usage[0]: series.resize(Term.width * 4)
 
 	@classmethod
 	def _draw(cls):
@@ -3236,19 +4520,20 @@ class CpuCollector(Collector):
 class MemCollector(Collector):
 	'''Collects memory and disks information'''
 	values: Dict[str, int] = {}
-	vlist: Dict[str, List[int]] = {}
+	vlist: Dict[str, Series] = {}
 	percent: Dict[str, int] = {}
 	string: Dict[str, str] = {}
 
 	swap_values: Dict[str, int] = {}
-	swap_vlist: Dict[str, List[int]] = {}
+	swap_vlist: Dict[str, Series] = {}
 	swap_percent: Dict[str, int] = {}
 	swap_string: Dict[str, str] = {}
 
 	disks: Dict[str, Dict]
+	disk_values: Dict[str, Dict[str, int]] = {}
 	disk_hist: Dict[str, Tuple] = {}
 	timestamp: float = time()
-	disks_io_dict: Dict[str, Dict[str, List[int]]] = {}
+	disks_io_dict: Dict[str, Dict[str, Series]] = {}
 	recheck_diskutil: bool = True
 	diskutil_map: Dict[str, str] = {}
 
@@ -3263,6 +4548,33 @@ class MemCollector(Collector):
 	if SYSTEM == "BSD": excludes += ["devfs", "tmpfs", "procfs", "linprocfs", "gvfs", "fusefs"]
 
 	buffer: str = MemBox.buffer
+	disks_due: float = 0.0
+	collect_disks: bool = True
+
+	@classmethod
+	def schedule(cls, now: float):
+		'''Disks has their own interval, memory is collected every time disks are'''
+		cls.collect_disks = cls.disks_due <= now + 0.05
+		if cls.collect_disks:
+			cls.disks_due = now + cls.interval("disks")
+		cls.due = now + cls.interval()
+
+	@classmethod
+	def next_due(cls) -> float:
+		return min(cls.due, cls.disks_due) if CONFIG.show_disks else cls.due
+
+	@staticmethod
+	def _read_fstab() -> List[str]:
+		'''Returns mountpoints in /etc/fstab that isn't swap'''
+		mountpoints: List[str] = []
+		with open('/etc/fstab','r') as fstab:
+			for line in fstab:
+				line = line.strip()
+				if line and not line.startswith('#'):
+					mount_data = (line.split())
+					if mount_data[2].lower() != "swap":
+						mountpoints += [mount_data[1]]
+		return mountpoints
 
 	@classmethod
 	def _collect(cls):
@@ -3280,9 +4592,8 @@ class MemCollector(Collector):
 			if key == "total": continue
 			cls.percent[key] = round(value * 100 / cls.values["total"])
 			if CONFIG.mem_graphs:
-				if not key in cls.vlist: cls.vlist[key] = []
+				if not key in cls.vlist: cls.vlist[key] = Series(MemBox.width, name=f'mem_{key}')
 				cls.vlist[key].append(cls.percent[key])
-				if len(cls.vlist[key]) > MemBox.width: del cls.vlist[key][0]
 
 		#* Collect swap
 		if CONFIG.show_swap or CONFIG.swap_disk:
@@ -3299,9 +4610,8 @@ class MemCollector(Collector):
 					if key == "total": continue
 					cls.swap_percent[key] = round(value * 100 / cls.swap_values["total"])
 					if CONFIG.mem_graphs:
-						if not key in cls.swap_vlist: cls.swap_vlist[key] = []
+						if not key in cls.swap_vlist: cls.swap_vlist[key] = Series(MemBox.width, name=f'swap_{key}')
 						cls.swap_vlist[key].append(cls.swap_percent[key])
-						if len(cls.swap_vlist[key]) > MemBox.width: del cls.swap_vlist[key][0]
 			else:
 				if MemBox.swap_on:
 					MemBox.redraw = True
@@ -3313,6 +4623,12 @@ class MemCollector(Collector):
 
 
 		if not CONFIG.show_disks: return
+		if not cls.collect_disks:
+			if "__swap" in cls.disks:
+				cls.disks["__swap"].update({ "used_percent" : cls.swap_percent["used"], "free_percent" : cls.swap_percent["free"] })
+				for name in ["total", "used", "free"]:
+					cls.disks["__swap"][name] = cls.swap_string[name]
+			return
 		#* Collect disks usage
 		disk_read: int = 0
 		disk_write: int = 0
@@ -3324,6 +4640,7 @@ class MemCollector(Collector):
 		io_string_w: str
 		u_percent: int
 		cls.disks = {}
+		cls.disk_values = {}
 
 		if CONFIG.disks_filter:
 			if CONFIG.disks_filter.startswith("exclude="):
@@ -3360,13 +4677,7 @@ class MemCollector(Collector):
 
 		if CONFIG.use_fstab and SYSTEM != "MacOS" and not cls.fstab_filter:
 			try:
-				with open('/etc/fstab','r') as fstab:
-					for line in fstab:
-						line = line.strip()
-						if line and not line.startswith('#'):
-							mount_data = (line.split())
-							if mount_data[2].lower() != "swap":
-								cls.fstab_filter += [mount_data[1]]
+				cls.fstab_filter = Probe.get("fstab_filter", cls._read_fstab)
 				errlog.debug(f'new fstab_filter set : {cls.fstab_filter}')
 			except IOError:
 				CONFIG.use_fstab = False
@@ -3394,8 +4705,9 @@ class MemCollector(Collector):
 
 			u_percent = round(getattr(disk_u, "percent", 0))
 			cls.disks[disk.device] = { "name" : disk_name, "used_percent" : u_percent, "free_percent" : 100 - u_percent }
+			cls.disk_values[disk.device] = { name : getattr(disk_u, name, 0) for name in ["total", "used", "free"] }
 			for name in ["total", "used", "free"]:
-				cls.disks[disk.device][name] = floating_humanizer(getattr(disk_u, name, 0))
+				cls.disks[disk.device][name] = floating_humanizer(cls.disk_values[disk.device][name])
 
 			#* Collect disk io
 			if io_counters:
@@ -3421,13 +4733,9 @@ class MemCollector(Collector):
 					disk_read = round((disk_io.read_bytes - cls.disk_hist[disk.device][0]) / (time() - cls.timestamp)) #type: ignore
 					disk_write = round((disk_io.write_bytes - cls.disk_hist[disk.device][1]) / (time() - cls.timestamp)) #type: ignore
 					if not disk.device in cls.disks_io_dict:
-						cls.disks_io_dict[disk.device] = {"read" : [], "write" : [], "rw" : []}
-					cls.disks_io_dict[disk.device]["read"].append(disk_read >> 20)
-					cls.disks_io_dict[disk.device]["write"].append(disk_write >> 20)
-					cls.disks_io_dict[disk.device]["rw"].append((disk_read + disk_write) >> 20)
-
-					if len(cls.disks_io_dict[disk.device]["read"]) > MemBox.width:
-						del cls.disks_io_dict[disk.device]["read"][0], cls.disks_io_dict[disk.device]["write"][0], cls.disks_io_dict[disk.device]["rw"][0]
+						cls.disks_io_dict[disk.device] = { name : Series(MemBox.width, "i", name=f'disk_{disk.device.replace("/", "_")}_{name}') for name in ["read", "write", "rw"] }
+					for name, value in [("read", disk_read), ("write", disk_write), ("rw", disk_read + disk_write)]:
+						cls.disks_io_dict[disk.device][name].append(value >> 20)
 
 				except:
 					disk_read = disk_write = 0
@@ -3448,6 +4756,7 @@ class MemCollector(Collector):
 					io_string_r += f'▼▲{floating_humanizer(disk_read + disk_write, short=True)}'
 
 			cls.disks[disk.device]["io"] = io_string_r + (" " if io_string_w and io_string_r else "") + io_string_w
+			cls.disk_values[disk.device].update({ "read" : disk_read if disk_io else 0, "write" : disk_write if disk_io else 0 })
 
 		if CONFIG.swap_disk and MemBox.swap_on:
 			cls.disks["__swap"] = { "name" : "swap", "used_percent" : cls.swap_percent["used"], "free_percent" : cls.swap_percent["free"], "io" : "" }
@@ -3470,6 +4779,11 @@ class MemCollector(Collector):
 
 		cls.timestamp = time()
 
+	@classmethod
+	def _resize(cls):
+		for series in [*cls.vlist.values(), *cls.swap_vlist.values(), *[series for io in cls.disks_io_dict.values() for series in io.values()]]:
+			series.resize(MemBox.width)
+
 	@classmethod
 	def _draw(cls):
 		MemBox._draw_fg()
@@ -3512,7 +4826,7 @@ class NetCollector(Collector):
 				cls.nic_error = True
 				errlog.exception(f'{e}')
 		if not io_all: return
-		up_stat = psutil.net_if_stats()
+		up_stat = net_if_stats()
 		for nic in sorted(io_all.keys(), key=lambda nic: (getattr(io_all[nic], "bytes_recv", 0) + getattr(io_all[nic], "bytes_sent", 0)), reverse=True):
 			if nic not in up_stat or not up_stat[nic].isup:
 				continue
@@ -3544,7 +4858,7 @@ class NetCollector(Collector):
 	def _collect(cls):
 		speed: int
 		stat: Dict
-		up_stat = psutil.net_if_stats()
+		up_stat = net_if_stats()
 
 		if sorted(cls.nics) != sorted(nic for nic in up_stat if up_stat[nic].isup):
 			old_nic = cls.nic
@@ -3572,7 +4886,7 @@ class NetCollector(Collector):
 			cls.stats[cls.nic] = {}
 			cls.strings[cls.nic] = { "download" : {}, "upload" : {}}
 			for direction, value in ["download", io_all.bytes_recv], ["upload", io_all.bytes_sent]:
-				cls.stats[cls.nic][direction] = { "total" : value, "last" : value, "top" : 0, "graph_top" : 0, "offset" : 0, "speed" : [], "redraw" : True, "graph_raise" : 0, "graph_lower" : 7 }
+				cls.stats[cls.nic][direction] = { "total" : value, "last" : value, "top" : 0, "graph_top" : 0, "offset" : 0, "speed" : Series(NetBox.width * 2, "q", name=f'net_{cls.nic.replace("/", "_")}_{direction}'), "redraw" : True, "graph_raise" : 0, "graph_lower" : 7 }
 				for v in ["total", "byte_ps", "bit_ps", "top", "graph_top"]:
 					cls.strings[cls.nic][direction][v] = ""
 
@@ -3609,9 +4923,6 @@ class NetCollector(Collector):
 					cls.reset = False
 					NetBox.redraw = True
 
-			if len(stat["speed"]) > NetBox.width * 2:
-				del stat["speed"][0]
-
 			strings["total"] = floating_humanizer(stat["total"] - stat["offset"])
 			strings["byte_ps"] = floating_humanizer(stat["speed"][-1], per_second=True)
 			strings["bit_ps"] = floating_humanizer(stat["speed"][-1], bit=True, per_second=True)
@@ -3647,11 +4958,117 @@ class NetCollector(Collector):
 				cls.sync_string = floating_humanizer(cls.sync_top, short=True)
 				NetBox.redraw = True
 
+	@classmethod
+	def _resize(cls):
+		for stats in cls.stats.values():
+			for direction in ["download", "upload"]:
+				stats[direction]["speed"].resize(NetBox.width * 2)
+
 	@classmethod
 	def _draw(cls):
 		NetBox._draw_fg()
 
 
+class ProcInfo:
+	'''Process info read by ProcReader, has the pid and info attributes used from psutil.Process objects'''
+	__slots__ = ("pid", "info")
+
+	def __init__(self, pid: int, info: Dict[str, Any]):
+		self.pid = pid
+		self.info = info
+
+class ProcReader:
+	'''Reads process info directly from /proc, Linux only
+	* .process_iter() : Returns a list of ProcInfo objects for all processes
+	Only stat is read for already known processes, name, arguments and username is read once for new processes.
+	'''
+	table: Dict[int, Dict[str, Any]] = {}
+	users: Dict[int, str] = {}
+	mem_info = namedtuple("mem_info", ["rss", "vms"])
+	mem_info.__qualname__ = "ProcReader.mem_info"
+	clock_ticks: int = 0
+	page_size: int = 0
+	mem_total: int = 0
+	boot_time: float = 0.0
+	error: bool = False
+
+	@classmethod
+	def process_iter(cls) -> List[ProcInfo]:
+		if not cls.clock_ticks:
+			cls.clock_ticks = os.sysconf("SC_CLK_TCK")
+			cls.page_size = os.sysconf("SC_PAGE_SIZE")
+			cls.mem_total = psutil.virtual_memory().total
+			cls.boot_time = psutil.boot_time()
+		out: List[ProcInfo] = []
+		table: Dict[int, Dict[str, Any]] = {}
+		timestamp: float = time()
+		with os.scandir(PROC_PATH) as entries:
+			for entry in entries:
+				if not entry.name.isdigit(): continue
+				pid: int = int(entry.name)
+				try:
+					with open(f'{PROC_PATH}/{pid}/stat', "rb") as f:
+						stat: bytes = f.read()
+					name_end: int = stat.rfind(b")")
+					#* Fields after process name, starting with field 3 "state" in proc(5)
+					fields: List[bytes] = stat[name_end + 2:].split()
+					ticks: int = int(fields[11]) + int(fields[12])
+					start: int = int(fields[19])
+					record: Union[Dict[str, Any], None] = cls.table.get(pid)
+					if record is None or record["start"] != start:
+						record = cls._new_process(pid, stat[stat.find(b"(") + 1:name_end].decode("utf-8", "replace"), start)
+						cpu: float = 0.0
+					else:
+						cpu = round((ticks - record["ticks"]) * 100 / cls.clock_ticks / (timestamp - record["time"]), 1) if timestamp > record["time"] else 0.0
+				except (OSError, IndexError, ValueError):
+					continue
+				record["ticks"], record["time"] = ticks, timestamp
+				table[pid] = record
+				rss: int = int(fields[21]) * cls.page_size
+				out.append(ProcInfo(pid, {
+					"pid" : pid,
+					"ppid" : int(fields[1]),
+					"name" : record["name"],
+					"cmdline" : record["cmdline"],
+					"num_threads" : int(fields[17]),
+					"username" : record["username"],
+					"memory_percent" : rss * 100 / cls.mem_total,
+					"memory_info" : cls.mem_info(rss, int(fields[20])),
+					"cpu_percent" : cpu,
+					"cpu_times" : (int(fields[11]) / cls.clock_ticks, int(fields[12]) / cls.clock_ticks),
+					"create_time" : cls.boot_time + start / cls.clock_ticks }))
+		cls.table = table
+		return out
+
+	@classmethod
+	def _new_process(cls, pid: int, name: str, start: int) -> Dict[str, Any]:
+		'''Read arguments and username for a new process, raises OSError if process has exited'''
+		cmdline: List[str] = []
+		uid: int = -1
+		try:
+			with open(f'{PROC_PATH}/{pid}/cmdline', "r", encoding="utf-8", errors="replace") as f:
+				data: str = f.read()
+		except PermissionError:
+			data = ""
+		if data:
+			sep: str = "\x00" if data.endswith("\x00") else " "
+			cmdline = data[:-1].split(sep) if data.endswith(sep) else data.split(sep)
+			if sep == "\x00" and len(cmdline) == 1 and " " in cmdline[0]: cmdline = cmdline[0].split(" ")
+		#* Name in stat is cut to 15 characters, use executable from arguments if it starts with the same
+		if len(name) >= 15 and cmdline and os.path.basename(cmdline[0]).startswith(name):
+			name = os.path.basename(cmdline[0])
+		with open(f'{PROC_PATH}/{pid}/status', "r", encoding="utf-8", errors="replace") as f:
+			for line in f:
+				if line.startswith("Uid:"):
+					uid = int(line.split()[1])
+					break
+		if uid not in cls.users:
+			try:
+				cls.users[uid] = pwd.getpwuid(uid).pw_name
+			except KeyError:
+				cls.users[uid] = str(uid)
+		return { "start" : start, "name" : name, "cmdline" : cmdline, "username" : cls.users[uid], "ticks" : 0, "time" : 0.0 }
+
 class ProcCollector(Collector):
 	'''Collects process stats'''
 	buffer: str = ProcBox.buffer
@@ -3663,21 +5080,40 @@ class ProcCollector(Collector):
 	detailed: bool = False
 	detailed_pid: Union[int, None] = None
 	details: Dict[str, Any] = {}
-	details_cpu: List[int] = []
-	details_mem: List[int] = []
+	details_cpu: Series = Series(1, "i")
+	details_mem: Series = Series(1, "i")
 	expand: int = 0
 	collapsed: Dict = {}
 	tree_counter: int = 0
 	p_values: List[str] = ["pid", "name", "cmdline", "num_threads", "username", "memory_percent", "cpu_percent", "cpu_times", "create_time"]
-	sort_expr: Dict = {}
-	sort_expr["pid"] = compile("p.info['pid']", "str", "eval")
-	sort_expr["program"] = compile("'' if p.info['name'] == 0.0 else p.info['name']", "str", "eval")
-	sort_expr["arguments"] = compile("' '.join(str(p.info['cmdline'])) or ('' if p.info['name'] == 0.0 else p.info['name'])", "str", "eval")
-	sort_expr["threads"] = compile("0 if p.info['num_threads'] == 0.0 else p.info['num_threads']", "str", "eval")
-	sort_expr["user"] = compile("'' if p.info['username'] == 0.0 else p.info['username']", "str", "eval")
-	sort_expr["memory"] = compile("p.info['memory_percent']", "str", "eval")
-	sort_expr["cpu lazy"] = compile("(sum(p.info['cpu_times'][:2] if not p.info['cpu_times'] == 0.0 else [0.0, 0.0]) * 1000 / (time() - p.info['create_time']))", "str", "eval")
-	sort_expr["cpu responsive"] = compile("(p.info['cpu_percent'] if CONFIG.proc_per_core else (p.info['cpu_percent'] / THREADS))", "str", "eval")
+	sort_index: Dict[int, int] = {}
+	sort_margin: int = 2
+	#* Data read by ProcBox, replaced as a whole when a collection is done, processes and details are built in new objects and the detail graph histories copied before being published
+	Snapshot = namedtuple("Snapshot", ["processes", "num_procs", "detailed", "details", "details_cpu", "details_mem", "expand", "rows"])
+	snapshot: Any = Snapshot({}, 0, False, {}, [], [], 0, [])
+
+	@staticmethod
+	def sort_key(sorting: str) -> Callable:
+		'''Returns a key function for sorting processes by <sorting>, one of CONFIG.sorting_options'''
+		if sorting == "pid":
+			return lambda p: p.info["pid"]
+		elif sorting == "program":
+			return lambda p: "" if p.info["name"] == 0.0 else p.info["name"]
+		elif sorting == "arguments":
+			return lambda p: " ".join(p.info["cmdline"]) if p.info["cmdline"] else ("" if p.info["name"] == 0.0 else p.info["name"])
+		elif sorting == "threads":
+			return lambda p: 0 if p.info["num_threads"] == 0.0 else p.info["num_threads"]
+		elif sorting == "user":
+			return lambda p: "" if p.info["username"] == 0.0 else p.info["username"]
+		elif sorting == "memory":
+			return lambda p: p.info["memory_percent"]
+		elif sorting == "cpu lazy":
+			now: float = time()
+			return lambda p: 0.0 if p.info["cpu_times"] == 0.0 else sum(p.info["cpu_times"][:2]) * 1000 / (now - p.info["create_time"])
+		elif CONFIG.proc_per_core:
+			return lambda p: p.info["cpu_percent"]
+		else:
+			return lambda p: p.info["cpu_percent"] / THREADS
 
 	@classmethod
 	def _collect(cls):
@@ -3700,12 +5136,15 @@ class ProcCollector(Collector):
 		if CONFIG.proc_tree and sorting == "arguments":
 			sorting = "program"
 
-		sort_cmd = cls.sort_expr[sorting]
+		sort_key = cls.sort_key(sorting)
 
 		if CONFIG.proc_tree:
-			cls._tree(sort_cmd=sort_cmd, reverse=reverse, proc_per_cpu=proc_per_cpu, search=search)
+			cls._tree(sort_key=sort_key, reverse=reverse, proc_per_cpu=proc_per_cpu, search=search)
 		else:
-			for p in sorted(psutil.process_iter(cls.p_values + (["memory_info"] if CONFIG.proc_mem_bytes else []), err), key=lambda p: eval(sort_cmd), reverse=reverse):
+			#* Processes shown last update are put first in their old order, keeps equal values in place and gives heap selection a good start
+			shown: List = [None] * len(cls.sort_index)
+			procs: List = []
+			for p in cls._process_iter(err):
 				if cls.collect_interrupt or cls.proc_interrupt:
 					return
 				if p.info["name"] == "idle" or p.info["name"] == err or p.info["pid"] == err:
@@ -3716,9 +5155,9 @@ class ProcCollector(Collector):
 					p.info["username"] = ""
 				if p.info["num_threads"] == err:
 					p.info["num_threads"] = 0
+				if cls.detailed and p.info["pid"] == cls.detailed_pid:
+					cls.det_cpu = p.info["cpu_percent"]
 				if search:
-					if cls.detailed and p.info["pid"] == cls.detailed_pid:
-						cls.det_cpu = p.info["cpu_percent"]
 					for value in [ p.info["name"], " ".join(p.info["cmdline"]), str(p.info["pid"]), p.info["username"] ]:
 						if not cls.case_sensitive:
 							value = value.lower()
@@ -3728,7 +5167,21 @@ class ProcCollector(Collector):
 						else: continue
 						break
 					else: continue
+				index = cls.sort_index.get(p.info["pid"])
+				if index is None: procs.append(p)
+				else: shown[index] = p
+			procs[:0] = [p for p in shown if p is not None]
+			n = len(procs)
+
+			#* Only the processes up to a few pages below the visible ones are sorted out, ProcBox.selector collects again if scrolling past them
+			limit: int = ProcBox.start + ProcBox.select_max * (cls.sort_margin + 1)
+			if limit < n:
+				procs = (nlargest if reverse else nsmallest)(limit, procs, key=sort_key)
+			else:
+				procs.sort(key=sort_key, reverse=reverse)
+			cls.sort_index = {p.info["pid"] : i for i, p in enumerate(procs)}
 
+			for p in procs:
 				cpu = p.info["cpu_percent"] if proc_per_cpu else round(p.info["cpu_percent"] / THREADS, 2)
 				mem = p.info["memory_percent"]
 				if CONFIG.proc_mem_bytes and hasattr(p.info["memory_info"], "rss"):
@@ -3747,8 +5200,6 @@ class ProcCollector(Collector):
 					"mem_b" : mem_b,
 					"cpu" : cpu }
 
-				n += 1
-
 			cls.num_procs = n
 			cls.processes = out.copy()
 
@@ -3831,11 +5282,23 @@ class ProcCollector(Collector):
 				elif mem > 5: mem = round(mem * 10)
 				else: mem = round(mem * 20)
 				cls.details_mem.append(mem)
-				if len(cls.details_cpu) > ProcBox.width: del cls.details_cpu[0]
-				if len(cls.details_mem) > ProcBox.width: del cls.details_mem[0]
+
+		cls.snapshot = cls.Snapshot(cls.processes, cls.num_procs, cls.detailed, cls.details.copy(), cls.details_cpu[:], cls.details_mem[:], cls.expand, list(cls.processes.items()))
 
 	@classmethod
-	def _tree(cls, sort_cmd, reverse: bool, proc_per_cpu: bool, search: List[str]):
+	def _process_iter(cls, err: float) -> Iterable:
+		'''Returns ProcInfo objects from ProcReader if enabled and on Linux, otherwise psutil.Process objects'''
+		if CONFIG.proc_native and SYSTEM == "Linux" and not ProcReader.error:
+			try:
+				return ProcReader.process_iter()
+			except Exception as e:
+				ProcReader.error = True
+				errlog.error("Exception while reading processes from /proc, falling back to psutil!")
+				errlog.exception(f'{e}')
+		return psutil.process_iter(cls.p_values + (["memory_info"] if CONFIG.proc_mem_bytes else []) + (["ppid"] if CONFIG.proc_tree else []), err)
+
+	@classmethod
+	def _tree(cls, sort_key: Callable, reverse: bool, proc_per_cpu: bool, search: List[str]):
 		'''List all processess in a tree view with pid, name, threads, username, memory percent and cpu percent'''
 		out: Dict = {}
 		err: float = 0.0
@@ -3843,38 +5306,33 @@ class ProcCollector(Collector):
 		infolist: Dict = {}
 		cls.tree_counter += 1
 		tree = defaultdict(list)
-		n: int = 0
-		for p in sorted(psutil.process_iter(cls.p_values + (["memory_info"] if CONFIG.proc_mem_bytes else []), err), key=lambda p: eval(sort_cmd), reverse=reverse):
+		for p in sorted(cls._process_iter(err), key=sort_key, reverse=reverse):
 			if cls.collect_interrupt: return
-			try:
-				tree[p.ppid()].append(p.pid)
-			except (psutil.NoSuchProcess, psutil.ZombieProcess):
-				pass
-			else:
-				infolist[p.pid] = p.info
-				n += 1
+			if isinstance(p.info["ppid"], float): continue
+			tree[p.info["ppid"]].append(p.pid)
+			infolist[p.pid] = p.info
 		if 0 in tree and 0 in tree[0]:
 			tree[0].remove(0)
+		if not tree: return
+
+		#* Indentation for children of a process, shared by all processes with the same indentation
+		prefixes: Dict[str, Tuple[str, str, str, str]] = {}
+		empty: Dict = {}
+		name: str; threads: int; username: str; mem: float; cpu: float; collapse: bool; cont: bool; getinfo: Dict; collapsed_info: Dict
 
-		def create_tree(pid: int, tree: defaultdict, indent: str = "", inindent: str = " ", found: bool = False, depth: int = 0, collapse_to: Union[None, int] = None):
-			nonlocal infolist, proc_per_cpu, search, out, det_cpu
-			name: str; threads: int; username: str; mem: float; cpu: float; collapse: bool = False
-			cont: bool = True
-			getinfo: Dict = {}
+		#* Depth first walk with a stack of (pid, indent, inindent, found, depth, collapse_to), children are pushed in reverse order
+		stack: List[Tuple[int, str, str, bool, int, int]] = [(min(tree), "", " ", False, 0, 0)]
+		while stack:
 			if cls.collect_interrupt: return
-			try:
-				name = psutil.Process(pid).name()
-				if name == "idle": return
-			except psutil.Error:
-				pass
-				cont = False
-				name = ""
-			if pid in infolist:
-				getinfo = infolist[pid]
+			pid, indent, inindent, found, depth, collapse_to = stack.pop()
+			getinfo = infolist.get(pid, empty)
+			cont = getinfo is not empty
+			name = "" if not cont or getinfo["name"] == err else getinfo["name"]
+			if name == "idle": continue
 
 			if search and not found:
 				if cls.detailed and pid == cls.detailed_pid:
-						det_cpu = getinfo["cpu_percent"]
+					det_cpu = getinfo["cpu_percent"]
 				if "username" in getinfo and isinstance(getinfo["username"], float): getinfo["username"] = ""
 				if "cmdline" in getinfo and isinstance(getinfo["cmdline"], float): getinfo["cmdline"] = ""
 				for value in [ name, str(pid), getinfo.get("username", ""), " ".join(getinfo.get("cmdline", "")) ]:
@@ -3887,24 +5345,17 @@ class ProcCollector(Collector):
 					else: continue
 					break
 				else: cont = False
+
+			collapse = False
 			if cont:
-				if getinfo:
-					if getinfo["num_threads"] == err: threads = 0
-					else: threads = getinfo["num_threads"]
-					if getinfo["username"] == err: username = ""
-					else: username = getinfo["username"]
-					cpu = getinfo["cpu_percent"] if proc_per_cpu else round(getinfo["cpu_percent"] / THREADS, 2)
-					mem = getinfo["memory_percent"]
-					if getinfo["cmdline"] == err: cmd = ""
-					else: cmd = " ".join(getinfo["cmdline"]) or "[" + getinfo["name"] + "]"
-					if CONFIG.proc_mem_bytes and hasattr(getinfo["memory_info"], "rss"):
-						mem_b = getinfo["memory_info"].rss
-					else:
-						mem_b = 0
+				if getinfo["num_threads"] == err: threads = 0
+				else: threads = getinfo["num_threads"]
+				cpu = getinfo["cpu_percent"] if proc_per_cpu else round(getinfo["cpu_percent"] / THREADS, 2)
+				mem = getinfo["memory_percent"]
+				if CONFIG.proc_mem_bytes and hasattr(getinfo["memory_info"], "rss"):
+					mem_b = getinfo["memory_info"].rss
 				else:
-					threads = mem_b = 0
-					username = ""
-					mem = cpu = 0.0
+					mem_b = 0
 
 				if pid in cls.collapsed:
 					collapse = cls.collapsed[pid]
@@ -3913,14 +5364,18 @@ class ProcCollector(Collector):
 					cls.collapsed[pid] = collapse
 
 				if collapse_to and not search:
-					out[collapse_to]["threads"] += threads
-					out[collapse_to]["mem"] += mem
-					out[collapse_to]["mem_b"] += mem_b
-					out[collapse_to]["cpu"] += cpu
+					collapsed_info = out[collapse_to]
+					collapsed_info["threads"] += threads
+					collapsed_info["mem"] += mem
+					collapsed_info["mem_b"] += mem_b
+					collapsed_info["cpu"] += cpu
 				else:
-					if pid in tree and len(tree[pid]) > 0:
-						sign: str = "+" if collapse else "-"
-						inindent = inindent.replace(" ├─ ", "[" + sign + "]─").replace(" └─ ", "[" + sign + "]─")
+					if getinfo["username"] == err: username = ""
+					else: username = getinfo["username"]
+					if getinfo["cmdline"] == err: cmd = ""
+					else: cmd = " ".join(getinfo["cmdline"]) or "[" + name + "]"
+					if tree.get(pid) and inindent.endswith("─ "):
+						inindent = f'{inindent[:-4]}[{"+" if collapse else "-"}]─'
 					out[pid] = {
 						"indent" : inindent,
 						"name": name,
@@ -3937,22 +5392,23 @@ class ProcCollector(Collector):
 			elif collapse and not collapse_to:
 				collapse_to = pid
 
-			if pid not in tree:
-				return
-			children = tree[pid][:-1]
-
-			for child in children:
-				create_tree(child, tree, indent + " │ ", indent + " ├─ ", found=found, depth=depth+1, collapse_to=collapse_to)
-			create_tree(tree[pid][-1], tree, indent + "  ", indent + " └─ ", depth=depth+1, collapse_to=collapse_to)
+			children = tree.get(pid)
+			if not children: continue
+			if indent not in prefixes:
+				prefixes[indent] = (indent + " │ ", indent + " ├─ ", indent + "  ", indent + " └─ ")
+			c_indent, c_inindent, l_indent, l_inindent = prefixes[indent]
+			#* Last child doesn't inherit found from parent
+			stack.append((children[-1], l_indent, l_inindent, False, depth + 1, collapse_to))
+			for child in reversed(children[:-1]):
+				stack.append((child, c_indent, c_inindent, found, depth + 1, collapse_to))
 
-		create_tree(min(tree), tree)
 		cls.det_cpu = det_cpu
 
 		if cls.collect_interrupt: return
 		if cls.tree_counter >= 100:
 			cls.tree_counter = 0
 			for pid in list(cls.collapsed):
-				if not psutil.pid_exists(pid):
+				if not pid in infolist:
 					del cls.collapsed[pid]
 		cls.num_procs = len(out)
 		cls.processes = out.copy()
@@ -3966,10 +5422,136 @@ class ProcCollector(Collector):
 		if "left" in Key.mouse: del Key.mouse["left"]
 		Collector.collect(ProcCollector, interrupt=True, redraw=True)
 
+	@classmethod
+	def _resize(cls):
+		cls.details_cpu.resize(ProcBox.width)
+		cls.details_mem.resize(ProcBox.width)
+
 	@classmethod
 	def _draw(cls):
 		ProcBox._draw_fg()
 
+class Recorder:
+	'''Records the data collectors reads from psutil, /proc and the clock to a compressed file and feeds recordings back to the collectors
+	* .start(path: str): Record inputs of all following collections to <path>
+	* .stop(): Close the recording
+	* .load(path: str): Replay samples from <path> in following collections and set config to the values used when recording, only load trusted files!
+	* .collect(collector: Collector): Runs collector._collect() recording or replaying it's inputs, raises EOFError if a replay is out of samples
+	* .ticks(collector: Collector): Number of samples left to replay for <collector>'''
+	mode: str = ""
+	file: Any = None
+	config_saved: bool = False
+	installed: bool = False
+	lock = threading.Lock()
+	local = threading.local()
+	#* Recorded samples per collector buffer name, each sample is a dict with a list of values for each input read during one collection
+	samples: Dict[str, List[Dict[str, List[Any]]]] = {}
+	position: Dict[str, int] = {}
+	psutil_calls: List[str] = ["cpu_percent", "cpu_times_percent", "getloadavg", "boot_time", "cpu_freq", "sensors_temperatures", "virtual_memory", "swap_memory",
+								"disk_io_counters", "disk_partitions", "disk_usage", "net_io_counters", "net_if_stats", "net_if_addrs"]
+
+	@classmethod
+	def _source(cls, name: str, func: Callable) -> Callable:
+		'''Returns <func> wrapped to record or replay it's return values when called from a collection, calls from within another recorded input are not recorded'''
+		def source(*args, **kwargs):
+			inputs: Union[Dict[str, Any], None] = getattr(cls.local, "inputs", None)
+			if inputs is None or cls.local.depth:
+				return func(*args, **kwargs)
+			if cls.mode == "replay":
+				try:
+					return inputs[name].popleft()
+				except (KeyError, IndexError):
+					raise EOFError(f'No more "{name}" values in sample, recorded with different settings?')
+			cls.local.depth += 1
+			try:
+				value = func(*args, **kwargs)
+				if name == "procs": value = [ProcInfo(p.pid, p.info) for p in value]
+			finally:
+				cls.local.depth -= 1
+			inputs.setdefault(name, []).append(value)
+			return value
+		return source
+
+	@classmethod
+	def _install(cls):
+		'''Replace the psutil module, clock, /proc/stat reader and process iterator used by collectors with recorded sources'''
+		global psutil, time
+		if cls.installed: return
+		cls.installed = True
+		module = types.ModuleType("psutil")
+		module.__dict__.update(psutil.__dict__)
+		for name in cls.psutil_calls:
+			if hasattr(psutil, name): setattr(module, name, cls._source(name, getattr(psutil, name)))
+		psutil = module
+		time = cls._source("time", time)
+		read = CpuStat._read
+		CpuStat._read = cls._source("cpustat", lambda path: bytes(read(path))) # type: ignore
+		ProcCollector._process_iter = cls._source("procs", ProcCollector._process_iter) # type: ignore
+
+	@classmethod
+	def start(cls, path: str):
+		cls.file = gzip.open(path, "wb")
+		cls._install()
+		cls.mode = "record"
+		cls.config_saved = False
+		errlog.info(f'Recording collector samples to {path}')
+
+	@classmethod
+	def stop(cls):
+		if cls.mode != "record": return
+		with cls.lock:
+			cls.mode = ""
+			cls.file.close()
+
+	@classmethod
+	def load(cls, path: str):
+		cls.samples = {}
+		cls.position = {}
+		class Unpickler(pickle.Unpickler):
+			def find_class(self, module, name):
+				#* Classes are saved with the module name bpytop was started or imported as
+				return super().find_class(__name__ if module in ["__main__", "bpytop"] else module, name)
+		with gzip.open(path, "rb") as f:
+			while True:
+				try:
+					name, sample = Unpickler(f).load()
+				except EOFError:
+					break
+				if name == "config":
+					for key, value in sample.items():
+						if key in CONFIG.keys: setattr(CONFIG, key, value)
+				else:
+					cls.samples.setdefault(name, []).append(sample)
+		cls._install()
+		cls.mode = "replay"
+
+	@classmethod
+	def ticks(cls, collector) -> int:
+		return len(cls.samples.get(collector.buffer, [])) - cls.position.get(collector.buffer, 0)
+
+	@classmethod
+	def collect(cls, collector):
+		if cls.mode == "replay":
+			if not cls.ticks(collector):
+				raise EOFError(f'No samples left to replay for {collector.buffer} collector')
+			cls.local.inputs = { name : deque(values) for name, values in cls.samples[collector.buffer][cls.position.get(collector.buffer, 0)].items() }
+			cls.position[collector.buffer] = cls.position.get(collector.buffer, 0) + 1
+		else:
+			cls.local.inputs = {}
+		cls.local.depth = 0
+		try:
+			collector._collect()
+		finally:
+			inputs, cls.local.inputs = cls.local.inputs, None
+		if cls.mode == "record":
+			with cls.lock:
+				if not cls.mode: return
+				#* Config is saved with the first sample to get any changes done after start, i.e. in headless mode
+				if not cls.config_saved:
+					pickle.dump(("config", { key : getattr(CONFIG, key) for key in CONFIG.keys }), cls.file, pickle.HIGHEST_PROTOCOL)
+					cls.config_saved = True
+				pickle.dump((collector.buffer, inputs), cls.file, pickle.HIGHEST_PROTOCOL)
+
 class Menu:
 	'''Holds all menus'''
 	active: bool = False
@@ -4119,6 +5701,8 @@ class Menu:
 			"(3)" : "Toggle NET box.",
 			"(4)" : "Toggle PROC box.",
 			"(d)" : "Toggle disks view in MEM box.",
+			"(p)" : "Toggle overlay with collect/draw times of each box.",
+			"(shift+p)" : "Write collect/draw time stats to stats.json.",
 			"(F2, o)" : "Shows options.",
 			"(F1, shift+h)" : "Shows this window.",
 			"(ctrl+z)" : "Sleep program and put in background.",
@@ -4302,6 +5886,38 @@ class Menu:
 					'',
 					'Min value: 100 ms',
 					'Max value: 86400000 ms = 24 hours.'],
+				"collector_intervals" : [
+					'Separate update times for collectors.',
+					'',
+					'Update time in milliseconds for single',
+					'collectors, the ones not set uses "update_ms".',
+					'',
+					'Available: "cpu" "mem" "disks" "net" "proc".',
+					'Format: "collector:ms" separated by comma.',
+					'',
+					'Example: "cpu:250, net:250, proc:5000".',
+					'Min value: 100 ms'],
+				"adaptive_intervals" : [
+					'Stretch update time of slow collectors.',
+					'',
+					'Collectors spending more than a tenth of',
+					'their update time collecting and drawing',
+					'gets their update time raised to match,',
+					'up to 10 times the normal update time.',
+					'',
+					'Shown as "~ms" after "update_ms" in the',
+					'CPU box when any shown box is stretched.',
+					'',
+					'True or False.'],
+				"collect_timeout" : [
+					'Max time to wait for collectors.',
+					'',
+					'Collectors runs in parallel and drawing waits',
+					'this many milliseconds for them to finish.',
+					'Boxes with collectors not done in time keeps',
+					'their last values and gets a greyed out title.',
+					'',
+					'Set to 0 to run collectors one after another.'],
 				"draw_clock" : [
 					'Draw a clock at top of screen.',
 					'(Only visible if cpu box is enabled!)',
@@ -4326,12 +5942,61 @@ class Menu:
 					'',
 					'Set this to false if the menus is flickering',
 					'too much for a comfortable experience.'],
+				"diff_draw" : [
+					'Only draw changed characters.',
+					'',
+					'Keeps a copy of the screen and only sends the',
+					'characters that changed since last update to',
+					'the terminal.',
+					'',
+					'Greatly lowers the amount of data sent over',
+					'slow connections like ssh.',
+					'',
+					'True or False.'],
+				"minimize_escapes" : [
+					'Remove redundant escape sequences.',
+					'',
+					'Drops color changes and cursor moves that',
+					'doesn\'t change anything and combines the',
+					'rest before sending to the terminal.',
+					'',
+					'Sends about 9-16% less data for around',
+					'2 ms of cpu time per update.',
+					'',
+					'Not used when diff_draw is on.',
+					'',
+					'True or False.'],
+				"sync_output" : [
+					'Synchronized terminal output.',
+					'',
+					'Wraps each update in the synchronized output',
+					'sequences, terminals supporting it shows the',
+					'whole update at once instead of in parts.',
+					'',
+					'Lowers flickering and tearing over slow',
+					'connections, ignored by other terminals.',
+					'',
+					'True or False.'],
 				"show_battery" : [
 					'Show battery stats.',
 					'(Only visible if cpu box is enabled!)',
 					'',
 					'Show battery stats in the top right corner',
 					'if a battery is present.'],
+				"persist_history" : [
+					'Keep graph history between runs.',
+					'',
+					'Cpu, memory, network and disk io history',
+					'is kept in memory mapped files in',
+					'"~/.config/bpytop/history" and shown again',
+					'in the graphs after a restart.',
+					'',
+					'Only used by the first running instance,',
+					'others keep history in memory.',
+					'',
+					'Takes effect after a restart.',
+					'',
+					'True or False.'],
 				"show_init" : [
 					'Show init screen at startup.',
 					'',
@@ -4426,6 +6091,26 @@ class Menu:
 					'"/uptime" in the formatting.',
 					'',
 					'True or False.'],
+				"show_self" : [
+					'Show bpytop\'s own resource usage.',
+					'',
+					'Cpu usage in percent of one core, memory,',
+					'number of threads and terminal output rate',
+					'in the bottom of the CPU box, followed by',
+					'cpu usage of the main, collector and input',
+					'threads if there is room for it.',
+					'',
+					'True or False.'],
+				"self_limit" : [
+					'Limit for bpytop\'s own cpu usage.',
+					'',
+					'Raises "update_ms" in steps while the average',
+					'cpu usage of bpytop over the last 5 seconds',
+					'is above this percent of one core.',
+					'The raise is removed again when usage drops',
+					'below half of this value.',
+					'',
+					'0 to disable.'],
 			},
 			"mem" : {
 				"mem_graphs" : [
@@ -4611,6 +6296,15 @@ class Menu:
 					'Show memory as bytes in process list.',
 					' ',
 					'True or False.'],
+				"proc_native" : [
+					'Read process info directly from /proc.',
+					'(Only has effect on Linux)',
+					'',
+					'Skips psutil and only reads command line and',
+					'user for new processes, lowers cpu usage when',
+					'there is a lot of processes.',
+					'',
+					'True or False.'],
 			}
 		}
 
@@ -4767,7 +6461,12 @@ class Menu:
 									CONFIG.proc_update_mult = 1
 								else:
 									CONFIG.proc_update_mult = int(input_val)
-								Collector.proc_counter = 1
+								ProcCollector.due = 0.0
+							elif selected == "collect_timeout":
+								CONFIG.collect_timeout = int(input_val) if input_val else 0
+							elif selected == "self_limit":
+								CONFIG.self_limit = int(input_val) if input_val else 0
+								if not CONFIG.self_limit: SelfStat.restore()
 							elif selected == "tree_depth":
 								if not input_val or int(input_val) < 0:
 									CONFIG.tree_depth = 0
@@ -4792,6 +6491,8 @@ class Menu:
 									if not Box.clock_on: Draw.clear("clock", saved=True)
 								elif selected == "io_graph_speeds":
 									MemBox.graph_speeds = {}
+								elif selected == "collector_intervals":
+									Timer.finish()
 							Term.refresh(force=True)
 							cls.resized = False
 					elif key == "backspace" and len(input_val):
@@ -4824,7 +6525,7 @@ class Menu:
 					cat_int = int(key) - 1
 					change_cat = True
 				elif key == "enter" and selected in ["update_ms", "disks_filter", "custom_cpu_name", "net_download",
-					 "net_upload", "draw_clock", "tree_depth", "proc_update_mult", "shown_boxes", "net_iface", "io_graph_speeds"]:
+					 "net_upload", "draw_clock", "tree_depth", "proc_update_mult", "shown_boxes", "net_iface", "io_graph_speeds", "collector_intervals", "collect_timeout", "self_limit"]:
 					inputting = True
 					input_val = str(getattr(CONFIG, selected))
 				elif key == "left" and selected == "update_ms" and CONFIG.update_ms - 100 >= 100:
@@ -4835,10 +6536,10 @@ class Menu:
 					Box.draw_update_ms()
 				elif key == "left" and selected == "proc_update_mult" and CONFIG.proc_update_mult > 1:
 					CONFIG.proc_update_mult -= 1
-					Collector.proc_counter = 1
+					ProcCollector.due = 0.0
 				elif key == "right" and selected == "proc_update_mult":
 					CONFIG.proc_update_mult += 1
-					Collector.proc_counter = 1
+					ProcCollector.due = 0.0
 				elif key == "left" and selected == "tree_depth" and CONFIG.tree_depth > 0:
 					CONFIG.tree_depth -= 1
 					ProcCollector.collapsed = {}
@@ -4859,8 +6560,13 @@ class Menu:
 					if selected == "theme_background":
 						Term.bg = f'{THEME.main_bg}' if CONFIG.theme_background else "\033[49m"
 						Draw.now(Term.bg)
+					if selected == "proc_native":
+						ProcReader.error = False
 					if selected == "show_battery":
 						Draw.clear("battery", saved=True)
+					if selected in ["diff_draw", "minimize_escapes"]:
+						Screen.reset()
+						Minimizer.reset()
 					Term.refresh(force=True)
 					cls.resized = False
 				elif key in ["left", "right"] and selected == "color_theme" and len(Theme.themes) > 1:
@@ -4978,22 +6684,116 @@ class Timer:
 		if cls.return_zero:
 			cls.return_zero = False
 			return False
-		return cls.timestamp + (CONFIG.update_ms / 1000) > time()
+		return Collector.next_update() > time()
 
 	@classmethod
 	def left(cls) -> float:
-		t_left: float = cls.timestamp + (CONFIG.update_ms / 1000) - time()
-		if t_left > CONFIG.update_ms / 1000:
-			cls.stamp()
-			return CONFIG.update_ms / 1000
-		return t_left
+		t_left: float = Collector.next_update() - time()
+		if t_left > max(Collector.interval(name) for name in CONFIG.collector_names):
+			Collector.reset_due()
+			return 0.0
+		return max(t_left, 0.0)
 
 	@classmethod
 	def finish(cls):
 		cls.return_zero = True
 		cls.timestamp = time() - (CONFIG.update_ms / 1000)
+		Collector.reset_due()
 		Key.break_wait()
 
+class Probe:
+	'''Hardware probes not needed to draw the first frame, run in a thread while the banner is shown and the theme loaded.
+	Results are cached in CONFIG_DIR/probes.json for the next start, the cache is only used if the boot id, cpu count, fs root,
+	cpu_sensor config value and modification times of the files and directories probed are the same, --refresh-probes ignores it
+	* .start(): Start probing in a separate thread
+	* .wait(): Wait for probing to finish, probes in the calling thread if not started
+	* .get(name, func): Returns the cached value for <name> or the result of <func>, which is then cached
+	* .save(): Write the cache if anything was added'''
+	thread: threading.Thread
+	started: bool = False
+	done = threading.Event()
+	version: int = 1
+	cache: Dict[str, Any] = {}
+	changed: bool = False
+	lock = threading.Lock()
+
+	@staticmethod
+	def key() -> Dict[str, Any]:
+		'''Values that invalidates the cache when changed'''
+		mtimes: Dict[str, int] = {}
+		for path in [f'{SYS_PATH}/class/hwmon', f'{SYS_PATH}/class/power_supply', "/etc/fstab", THEME_DIR, USER_THEME_DIR]:
+			try:
+				mtimes[path] = os.stat(path).st_mtime_ns
+			except OSError:
+				mtimes[path] = 0
+		return { "version" : Probe.version, "bpytop" : VERSION, "root" : PROC_PATH, "threads" : THREADS, "cores" : CORES,
+			"boot_id" : readfile(f'{PROC_PATH}/sys/kernel/random/boot_id') if SYSTEM == "Linux" else str(psutil.boot_time()),
+			"cpu_sensor" : CONFIG.cpu_sensor, "mtimes" : mtimes }
+
+	@classmethod
+	def load(cls):
+		key: Dict[str, Any] = cls.key()
+		if not ARG_REFRESH_PROBES:
+			try:
+				with open(f'{CONFIG_DIR}/probes.json', "r") as f:
+					cache: Dict[str, Any] = json.load(f)
+				if cache.get("key") == key:
+					cls.cache = cache
+					return
+			except (OSError, ValueError):
+				pass
+		cls.cache, cls.changed = { "key" : key }, True
+
+	@classmethod
+	def get(cls, name: str, func: Callable[[], Any]) -> Any:
+		with cls.lock:
+			if not cls.cache: cls.load()
+			if name in cls.cache: return cls.cache[name]
+		value = func()
+		with cls.lock:
+			cls.cache[name], cls.changed = value, True
+		return value
+
+	@classmethod
+	def save(cls):
+		with cls.lock:
+			if not cls.changed: return
+			try:
+				with open(f'{CONFIG_DIR}/probes.json.tmp', "w") as f:
+					json.dump(cls.cache, f)
+				os.replace(f'{CONFIG_DIR}/probes.json.tmp', f'{CONFIG_DIR}/probes.json')
+				cls.changed = False
+			except OSError as e:
+				errlog.warning(f'Could not write probe cache: {e}')
+
+	@classmethod
+	def start(cls):
+		cls.started = True
+		cls.thread = threading.Thread(target=cls._runner, daemon=True)
+		cls.thread.start()
+
+	@classmethod
+	def wait(cls):
+		if not cls.started:
+			cls.started = True
+			cls._runner()
+		cls.done.wait()
+
+	@classmethod
+	def _runner(cls):
+		global CPU_NAME
+		try:
+			CPU_NAME = cls.get("cpu_name", get_cpu_name)
+			CONFIG.probe()
+			if CONFIG.check_temp:
+				CpuCollector.sensor_method = cls.get("sensor_method", CpuCollector.get_sensors)
+				CpuCollector.got_sensors = bool(CpuCollector.sensor_method)
+			cls.save()
+		except Exception as e:
+			errlog.exception(f'{e}')
+		finally:
+			cls.done.set()
+
 class UpdateChecker:
 	version: str = VERSION
 	thread: threading.Thread
@@ -5006,6 +6806,7 @@ class UpdateChecker:
 	@classmethod
 	def _checker(cls):
 		try:
+			import urllib.request #* Only needed here and slow to import
 			with urllib.request.urlopen("https://github.com/aristocratos/bpytop/raw/master/bpytop.py", timeout=5) as source: # type: ignore
 				for line in source:
 					line = line.decode("utf-8")
@@ -5084,6 +6885,168 @@ class Init:
 		if cls.resized: return
 		del cls.initbg_up, cls.initbg_down, cls.initbg_data, cls.initbg_colors
 
+class Headless:
+	'''Runs the collectors without the tui, writing one record to stdout or a file each time collectors has updated
+	* .run(): Setup collectors for the selected fields and write records until interrupted
+	* .fields: Available fields with the collector they are read from'''
+	fields: Dict[str, Tuple[Any, Callable[[], Any]]] = {
+		"cpu" : (CpuCollector, lambda: CpuCollector.cpu_usage[0][-1]),
+		"cpu_cores" : (CpuCollector, lambda: [core[-1] for core in CpuCollector.cpu_usage[1:]]),
+		"cpu_freq" : (CpuCollector, lambda: CpuCollector.cpu_freq),
+		"cpu_temp" : (CpuCollector, lambda: CpuCollector.cpu_temp[0][-1] if CpuCollector.got_sensors and CpuCollector.cpu_temp[0] else None),
+		"load_avg" : (CpuCollector, lambda: CpuCollector.load_avg),
+		"uptime" : (CpuCollector, lambda: CpuCollector.uptime),
+		"mem_total" : (MemCollector, lambda: MemCollector.values["total"]),
+		"mem_used" : (MemCollector, lambda: MemCollector.values["used"]),
+		"mem_available" : (MemCollector, lambda: MemCollector.values["available"]),
+		"mem_cached" : (MemCollector, lambda: MemCollector.values["cached"]),
+		"mem_free" : (MemCollector, lambda: MemCollector.values["free"]),
+		"swap_total" : (MemCollector, lambda: MemCollector.swap_values.get("total", 0)),
+		"swap_used" : (MemCollector, lambda: MemCollector.swap_values.get("used", 0)),
+		"swap_free" : (MemCollector, lambda: MemCollector.swap_values.get("free", 0)),
+		"disks" : (MemCollector, lambda: { disk : { "name" : MemCollector.disks[disk]["name"], "used_percent" : MemCollector.disks[disk]["used_percent"], **values } for disk, values in MemCollector.disk_values.items() if disk in MemCollector.disks }),
+		"net_nic" : (NetCollector, lambda: NetCollector.nic),
+		"net_download" : (NetCollector, lambda: Headless.net_stat("download", "speed")),
+		"net_upload" : (NetCollector, lambda: Headless.net_stat("upload", "speed")),
+		"net_download_total" : (NetCollector, lambda: Headless.net_stat("download", "total")),
+		"net_upload_total" : (NetCollector, lambda: Headless.net_stat("upload", "total")),
+		"procs_total" : (ProcCollector, lambda: ProcCollector.num_procs),
+		"procs" : (ProcCollector, lambda: [{ "pid" : pid, **values } for pid, values in islice(ProcCollector.processes.items(), ARG_TOP or None)]),
+	}
+
+	@staticmethod
+	def net_stat(direction: str, name: str) -> int:
+		'''Returns last speed or total for <direction> of the current network device, 0 if no device was found'''
+		stat: Dict[str, Any] = NetCollector.stats.get(NetCollector.nic, {}).get(direction, {})
+		if name == "speed":
+			return stat["speed"][-1] if stat.get("speed") else 0
+		return stat.get(name, 0) - stat.get("offset", 0)
+
+	@classmethod
+	def setup(cls, selected: List[str]) -> List:
+		'''Enable only what the <selected> fields needs and returns the collectors to run'''
+		collectors: List = []
+		for name in selected:
+			if not cls.fields[name][0] in collectors: collectors.append(cls.fields[name][0])
+
+		#* The config is never saved in headless or batch mode
+		CONFIG.show_disks = "disks" in selected
+		CONFIG.show_swap = bool([name for name in selected if name.startswith("swap_")])
+		CONFIG.swap_disk = CONFIG.mem_graphs = False
+		CONFIG.show_cpu_freq = "cpu_freq" in selected
+		CONFIG.check_temp = CONFIG.check_temp and "cpu_temp" in selected
+		Probe.wait()
+		#* Box sizes limits the length of the collectors history lists
+		Term.width, Term.height = 80, 24
+		CONFIG.shown_boxes = " ".join(collector.buffer for collector in collectors)
+		Box.calc_sizes()
+		ProcBox.start, ProcBox.select_max = 1, ARG_TOP or sys.maxsize // 4
+		return collectors
+
+	@classmethod
+	def table(cls, width: int) -> str:
+		'''Returns a plain text summary and process table like "top -b", <width> characters wide'''
+		cpu, mem = CpuCollector, MemCollector
+		cpu_line: str = f'Cpu: {cpu.cpu_usage[0][-1]:>3}% total, {THREADS} threads'
+		if cpu.cpu_freq: cpu_line += f', {cpu.cpu_freq / 1000:.1f} GHz'
+		if cpu.got_sensors and cpu.cpu_temp[0]:
+			temp, unit = temperature(cpu.cpu_temp[0][-1], CONFIG.temp_scale)
+			cpu_line += f', {temp}{unit}'
+		lines: List[str] = [
+			f'bpytop - {strftime("%X")} up {cpu.uptime}, load average: {", ".join(f"{lavg:.2f}" for lavg in cpu.load_avg)}',
+			cpu_line,
+			f'Mem:  {mem.string["total"]} total, {mem.string["used"]} used, {mem.string["available"]} available, {mem.string["cached"]} cached, {mem.string["free"]} free']
+		if mem.swap_values.get("total"):
+			lines.append(f'Swap: {mem.swap_string["total"]} total, {mem.swap_string["used"]} used, {mem.swap_string["free"]} free')
+		if NetCollector.nic in NetCollector.strings:
+			strings = NetCollector.strings[NetCollector.nic]
+			lines.append(f'Net {NetCollector.nic}: {strings["download"]["byte_ps"]} down, {strings["upload"]["byte_ps"]} up, '
+				f'{strings["download"]["total"]} / {strings["upload"]["total"]} total')
+		lines.append(f'Tasks: {ProcCollector.num_procs} total, sorted by {CONFIG.proc_sorting}{" reversed" if CONFIG.proc_reversed else ""}'
+			f'{", tree view" if CONFIG.proc_tree else ""}{", filter: " + ProcCollector.search_filter if ProcCollector.search_filter else ""}')
+		lines = [line[:width] for line in lines]
+		lines.append("")
+		lines.append(f'{"PID":>7} {"USER":<9} {"THR":>4} {"MemB" if CONFIG.proc_mem_bytes else "Mem%":>5} {"Cpu%":>5} {"Command" if CONFIG.proc_tree else "Program:  Arguments"}'[:width])
+		for pid, proc in islice(ProcCollector.processes.items(), ARG_TOP or None):
+			mem_string: str = floating_humanizer(proc["mem_b"], short=True) if CONFIG.proc_mem_bytes else f'{proc["mem"]:.1f}'
+			command: str = f'{proc["indent"]}{proc["name"]}' if CONFIG.proc_tree else f'{proc["name"]:<15.15} {proc["cmd"]}'
+			lines.append(f'{pid:>7} {proc["username"]:<9.9} {proc["threads"]:>4} {mem_string:>5} {proc["cpu"]:>5.1f} {command}'[:width])
+		return "\n".join(lines) + "\n"
+
+	@classmethod
+	def batch(cls):
+		'''Collect ARG_COUNT times with ARG_DELAY seconds between and print Headless.table() after each, without any terminal setup'''
+		delay: float = ARG_DELAY if ARG_DELAY is not None else CONFIG.update_ms / 1000
+		ProcCollector.search_filter = ARG_FILTER
+		collectors: List = cls.setup(["cpu", "cpu_freq", "cpu_temp", "mem_total", "swap_total", "net_nic", "procs"])
+		width: int = os.get_terminal_size().columns if sys.stdout.isatty() else 200
+		try:
+			for count in range(ARG_COUNT):
+				start: float = time()
+				for collector in collectors:
+					Collector._timed_collect(collector)
+				sys.stdout.write(("\n" if count else "") + cls.table(width))
+				sys.stdout.flush()
+				if count < ARG_COUNT - 1: sleep(max(delay - (time() - start), 0))
+		except KeyboardInterrupt:
+			pass
+		except BrokenPipeError:
+			os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+		finally:
+			Recorder.stop()
+			Probe.save()
+
+	@classmethod
+	def run(cls):
+		selected: List[str] = [name.strip() for name in ARG_FIELDS.split(",") if name.strip()] if ARG_FIELDS else list(cls.fields)
+		if "list" in selected or [name for name in selected if not name in cls.fields]:
+			if not "list" in selected: print(f'Unknown field(s): {", ".join(name for name in selected if not name in cls.fields)}', file=sys.stderr)
+			print(f'Available fields: {", ".join(cls.fields)}', file=sys.stderr)
+			raise SystemExit(0 if "list" in selected else 1)
+		CONFIG.proc_tree = False
+		collectors: List = cls.setup(selected)
+
+		try:
+			out = open(ARG_OUTPUT, "a", encoding="utf-8", newline="") if ARG_OUTPUT else sys.stdout
+		except OSError as e:
+			print(f'Could not open output file: {e}', file=sys.stderr)
+			raise SystemExit(1)
+		writer = csv.writer(out) if ARG_FORMAT == "csv" else None
+		if writer and not (ARG_OUTPUT and out.tell()):
+			writer.writerow(["time", *selected])
+		errlog.info(f'Headless mode writing {ARG_FORMAT} records to {ARG_OUTPUT or "stdout"}, fields: {", ".join(selected)}')
+
+		try:
+			while True:
+				now: float = time()
+				queue: List = [collector for collector in collectors if collector.next_due() <= now + 0.05]
+				for collector in queue:
+					collector.schedule(now)
+					Collector._timed_collect(collector)
+				if queue:
+					record: Dict[str, Any] = { "time" : round(now, 3) }
+					for name in selected:
+						record[name] = cls.fields[name][1]()
+					if writer:
+						writer.writerow([value if isinstance(value, (int, float, str)) else json.dumps(value, separators=(",", ":")) for value in record.values()])
+					else:
+						out.write(json.dumps(record, separators=(",", ":")) + "\n")
+					out.flush()
+				sleep(max(min(collector.next_due() for collector in collectors) - time(), 0))
+		except KeyboardInterrupt:
+			pass
+		except BrokenPipeError:
+			#* Reader went away, point stdout to devnull to not get another error when python flushes it at exit
+			os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+		except Exception as e:
+			errlog.exception(f'{e}')
+			raise SystemExit(1)
+		finally:
+			if ARG_OUTPUT: out.close()
+			Recorder.stop()
+			Probe.save()
+		errlog.info(f'Exiting headless mode. Runtime {timedelta(seconds=round(time() - SELF_START, 0))} \n')
+
 
 #? Functions ------------------------------------------------------------------------------------->
 
@@ -5091,20 +7054,23 @@ def get_cpu_name() -> str:
 	'''Fetch a suitable CPU identifier from the CPU model name string'''
 	name: str = ""
 	nlist: List = []
-	command: str = ""
+	command: List[str] = []
 	cmd_out: str = ""
 	rem_line: str = ""
 	if SYSTEM == "Linux":
-		command = "cat /proc/cpuinfo"
 		rem_line = "model name"
 	elif SYSTEM == "MacOS":
-		command ="sysctl -n machdep.cpu.brand_string"
+		command = ["sysctl", "-n", "machdep.cpu.brand_string"]
 	elif SYSTEM == "BSD":
-		command ="sysctl hw.model"
+		command = ["sysctl", "hw.model"]
 		rem_line = "hw.model"
 
 	try:
-		cmd_out = subprocess.check_output("LANG=C " + command, shell=True, universal_newlines=True)
+		if SYSTEM == "Linux":
+			with open(f'{PROC_PATH}/cpuinfo', "r") as f:
+				cmd_out = f.read()
+		elif command:
+			cmd_out = subprocess.check_output(command, universal_newlines=True, env=dict(os.environ, LANG="C"))
 	except:
 		pass
 	if rem_line:
@@ -5136,11 +7102,11 @@ def get_cpu_core_mapping() -> List[int]:
 	mapping: List[int] = []
 	core_ids: List[int] = []
 
-	if SYSTEM == "Linux" and os.path.isfile("/proc/cpuinfo"):
+	if SYSTEM == "Linux" and os.path.isfile(f'{PROC_PATH}/cpuinfo'):
 		try:
 			mapping = [0] * THREADS
 			num = 0
-			with open("/proc/cpuinfo", "r") as f:
+			with open(f'{PROC_PATH}/cpuinfo', "r") as f:
 				for line in f:
 					if line.startswith("processor"):
 						num = int(line.strip()[(line.index(": ")+2):])
@@ -5237,6 +7203,9 @@ def clean_quit(errcode: int = 0, errmsg: str = "", thread: bool = False):
 	if THREAD_ERROR: errcode = THREAD_ERROR
 	Key.stop()
 	Collector.stop()
+	Recorder.stop()
+	SelfStat.restore()
+	Probe.save()
 	if not errcode: CONFIG.save_config()
 	Draw.now(Term.clear, Term.normal_screen, Term.show_cursor, Term.mouse_off, Term.mouse_direct_off, Term.title())
 	Term.echo(True)
@@ -5340,6 +7309,76 @@ def readfile(file: str, default: str = "") -> str:
 			pass
 	return default if out is None else out
 
+SensorTemp = namedtuple("SensorTemp", ["label", "current", "high", "critical"])
+SensorBattery = namedtuple("SensorBattery", ["percent", "secsleft", "power_plugged"])
+NicStat = namedtuple("NicStat", ["isup"])
+
+def sensors_temperatures() -> Dict[str, List]:
+	'''Returns psutil.sensors_temperatures(), or temperatures read from hwmon devices in SYS_PATH if set to another root than /sys'''
+	if SYS_PATH == "/sys":
+		return psutil.sensors_temperatures()
+	out: Dict[str, List] = {}
+	hwmon: str = f'{SYS_PATH}/class/hwmon'
+	for device in sorted(os.listdir(hwmon)) if os.path.isdir(hwmon) else []:
+		name: str = readfile(f'{hwmon}/{device}/name', default=device)
+		for sensor in sorted(f[:-6] for f in os.listdir(f'{hwmon}/{device}') if f.startswith("temp") and f.endswith("_input")):
+			try:
+				current: float = int(readfile(f'{hwmon}/{device}/{sensor}_input')) / 1000
+			except ValueError:
+				continue
+			high: str = readfile(f'{hwmon}/{device}/{sensor}_max')
+			critical: str = readfile(f'{hwmon}/{device}/{sensor}_crit')
+			out.setdefault(name, []).append(SensorTemp(readfile(f'{hwmon}/{device}/{sensor}_label'), current,
+				int(high) / 1000 if high.isdigit() else None, int(critical) / 1000 if critical.isdigit() else None))
+	return out
+
+def sensors_battery():
+	'''Returns psutil.sensors_battery(), or the first battery in SYS_PATH if set to another root than /sys, None if no battery is found'''
+	if SYS_PATH == "/sys":
+		return psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+	path: str = f'{SYS_PATH}/class/power_supply'
+	for directory in sorted(os.listdir(path)) if os.path.isdir(path) else []:
+		if directory.startswith("BAT") or "battery" in directory.lower():
+			status: str = readfile(f'{path}/{directory}/status', default="Unknown")
+			try:
+				percent: int = int(readfile(f'{path}/{directory}/capacity', default="0"))
+			except ValueError:
+				percent = 0
+			return SensorBattery(percent, -2 if status != "Discharging" else -1, status != "Discharging")
+	return None
+
+def net_if_stats() -> Dict[str, Any]:
+	'''Returns psutil.net_if_stats(), or up state of network devices in SYS_PATH if set to another root than /sys'''
+	if SYS_PATH == "/sys":
+		return psutil.net_if_stats()
+	path: str = f'{SYS_PATH}/class/net'
+	return { nic : NicStat(readfile(f'{path}/{nic}/operstate') == "up") for nic in (os.listdir(path) if os.path.isdir(path) else []) }
+
+def set_fs_root(root: str = ""):
+	'''Read procfs and sysfs from <root>/proc and <root>/sys instead of /proc and /sys, Linux only.
+	Thread count, core mapping and per thread history are set up again from the new root, empty <root> goes back to the system'''
+	global PROC_PATH, SYS_PATH, THREADS, CORES, CORE_MAP
+	PROC_PATH, SYS_PATH = f'{root}/proc', f'{root}/sys'
+	psutil.PROCFS_PATH = PROC_PATH
+	CpuStat.files, CpuStat.last, CpuStat.boot_time = {}, {}, 0.0
+	ProcReader.table, ProcReader.clock_ticks = {}, 0
+	CpuBox.battery_path = ""
+	Probe.cache = {}
+	if root:
+		THREADS = len([name for name, _ in CpuStat.cpu_line.findall(CpuStat._read(f'{PROC_PATH}/stat')) if name != b"cpu"]) or 1
+		cores: set = set()
+		physical: str = "0"
+		for line in readfile(f'{PROC_PATH}/cpuinfo').splitlines():
+			if line.startswith("physical id"): physical = line.split(":")[1].strip()
+			elif line.startswith("core id"): cores.add((physical, line.split(":")[1].strip()))
+		CORES = len(cores) or THREADS
+	else:
+		THREADS = psutil.cpu_count(logical=True) or 1
+		CORES = psutil.cpu_count(logical=False) or 1
+	CORE_MAP = get_cpu_core_mapping()
+	CpuCollector.init_history()
+	Graphs.cores, Graphs.temps = [NotImplemented] * THREADS, [NotImplemented] * (THREADS + 1)
+
 def temperature(value: int, scale: str = "celsius") -> Tuple[int, str]:
 	"""Returns a tuple with integer value and string unit converted from an integer in celsius to: celsius, fahrenheit, kelvin or rankine."""
 	if scale == "celsius":
@@ -5372,7 +7411,7 @@ def process_keys():
 		if ProcBox.filtering:
 			if key in ["enter", "mouse_click", "mouse_unselect"]:
 				ProcBox.filtering = False
-				Collector.collect(ProcCollector, redraw=True, only_draw=True)
+				Collector.draw(ProcCollector)
 				continue
 			elif key in ["escape", "delete"]:
 				ProcCollector.search_filter = ""
@@ -5412,6 +7451,16 @@ def process_keys():
 			CONFIG.shown_boxes = " ".join(Box.view_modes[Box.view_mode])
 			Draw.clear(saved=True)
 			Term.refresh(force=True)
+		elif key == "p":
+			Stats.shown = not Stats.shown
+			if Stats.shown:
+				Stats.draw()
+				Draw.out("stats")
+			else:
+				Draw.clear("stats", saved=True)
+				Term.refresh(force=True)
+		elif key == "P":
+			Stats.dump()
 		elif key in box_keys:
 			boxes = CONFIG.shown_boxes.split()
 			if box_keys[key] in boxes:
@@ -5448,7 +7497,7 @@ def process_keys():
 				ProcBox.filtering = True
 				ProcCollector.case_sensitive = key == "F"
 				if not ProcCollector.search_filter: ProcBox.start = 0
-				Collector.collect(ProcCollector, redraw=True, only_draw=True)
+				Collector.draw(ProcCollector)
 			elif key in ["T", "K", "I"] and (ProcBox.selected > 0 or ProcCollector.detailed):
 				pid: int = ProcBox.selected_pid if ProcBox.selected > 0 else ProcCollector.detailed_pid # type: ignore
 				if psutil.pid_exists(pid):
@@ -5470,19 +7519,19 @@ def process_keys():
 					ProcBox.selected = 0
 					ProcCollector.detailed_pid = ProcBox.selected_pid
 					ProcBox.resized = True
-					Collector.proc_counter = 1
+					ProcCollector.due = 0.0
 				elif ProcCollector.detailed:
 					ProcBox.selected = ProcBox.last_selection
 					ProcBox.last_selection = 0
 					ProcCollector.detailed = False
 					ProcCollector.detailed_pid = None
 					ProcBox.resized = True
-					Collector.proc_counter = 1
+					ProcCollector.due = 0.0
 				else:
 					continue
 				ProcCollector.details = {}
-				ProcCollector.details_cpu = []
-				ProcCollector.details_mem = []
+				ProcCollector.details_cpu = Series(ProcBox.width, "i")
+				ProcCollector.details_mem = Series(ProcBox.width, "i")
 				Graphs.detailed_cpu = NotImplemented
 				Graphs.detailed_mem = NotImplemented
 				Collector.collect(ProcCollector, proc_interrupt=True, redraw=True)
@@ -5527,7 +7576,7 @@ def process_keys():
 #? Pre main -------------------------------------------------------------------------------------->
 
 
-CPU_NAME: str = get_cpu_name()
+CPU_NAME: str = ""
 
 CORE_MAP: List[int] = get_cpu_core_mapping()
 
@@ -5547,7 +7596,8 @@ def main():
 	Term.echo(False)
 	#Term.refresh(force=True)
 
-	#? Start a thread checking for updates while running init
+	#? Start threads probing hardware and checking for updates while running init
+	Probe.start()
 	if CONFIG.update_check: UpdateChecker.run()
 
 	#? Draw banner and init status
@@ -5568,7 +7618,7 @@ def main():
 	if CONFIG.show_init:
 		Draw.buffer("+init!", f'{Mv.restore}{Fx.trans("Doing some maths and drawing... ")}{Mv.save}')
 	try:
-		if CONFIG.check_temp: CpuCollector.get_sensors()
+		Probe.wait()
 		Box.calc_sizes()
 		Box.draw_bg(now=False)
 	except Exception as e:
@@ -5576,6 +7626,21 @@ def main():
 	else:
 		Init.success()
 
+	#? Load graph history kept from earlier runs
+	if CONFIG.persist_history:
+		if CONFIG.show_init:
+			Draw.buffer("+init!", f'{Mv.restore}{Fx.trans("Loading graph history... ")}{Mv.save}')
+		try:
+			os.makedirs(f'{CONFIG_DIR}/history', exist_ok=True)
+			if Series.use(f'{CONFIG_DIR}/history'):
+				CpuCollector.init_history()
+			else:
+				errlog.warning("Graph history is used by another running bpytop, keeping history in memory only")
+		except Exception as e:
+			Init.fail(e)
+		else:
+			Init.success()
+
 	#? Setup signal handlers for SIGSTP, SIGCONT, SIGINT and SIGWINCH
 	if CONFIG.show_init:
 		Draw.buffer("+init!", f'{Mv.restore}{Fx.trans("Setting up signal handlers... ")}{Mv.save}')
@@ -5584,6 +7649,7 @@ def main():
 		signal.signal(signal.SIGCONT, now_awake)	#* Resume
 		signal.signal(signal.SIGINT, quit_sigint)	#* Ctrl-C
 		signal.signal(signal.SIGWINCH, Term.refresh) #* Terminal resized
+		signal.signal(signal.SIGUSR1, Stats.dump)	#* Write stats to file
 	except Exception as e:
 		Init.fail(e)
 	else:
@@ -5664,4 +7730,16 @@ def main():
 
 
 if __name__ == "__main__":
-	main()
+	parse_args()
+	if ARG_RECORD:
+		try:
+			Recorder.start(ARG_RECORD)
+		except OSError as e:
+			print(f'Could not open recording file: {e}', file=sys.stderr)
+			raise SystemExit(1)
+	if ARG_COUNT > 0:
+		Headless.batch()
+	elif HEADLESS:
+		Headless.run()
+	else:
+		main()
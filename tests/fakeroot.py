@@ -0,0 +1,130 @@
+'''Generates a synthetic procfs and sysfs tree for tests and benchmarks, use with bpytop.set_fs_root(root)
+usage: python3 tests/fakeroot.py root [cpus] [processes] [depth] [disks] [nics] [sensors] [batteries]'''
+
+import os, sys, random
+from time import time
+from typing import List, Dict
+
+class FakeRoot:
+	'''Creates <root>/proc and <root>/sys with the files read by bpytop and psutil
+	* .create(): Write the whole tree
+	* .tick(seconds): Advance cpu, disk and network counters as if <seconds> had passed'''
+	def __init__(self, root: str, cpus: int = 8, processes: int = 500, depth: int = 10, disks: int = 4, nics: int = 2, sensors: int = 2, batteries: int = 1, seed: int = 0):
+		self.root = os.path.abspath(root)
+		self.proc = f'{self.root}/proc'
+		self.sys = f'{self.root}/sys'
+		self.cpus, self.processes, self.depth = max(1, cpus), max(1, processes), max(1, depth)
+		self.disks, self.nics, self.sensors, self.batteries = disks, nics, sensors, batteries
+		self.random = random.Random(seed)
+		self.boot_time: int = int(time()) - 86400
+		self.cpu_times: List[List[int]] = [[0] * 10 for _ in range(self.cpus)]
+		self.disk_io: List[List[int]] = [[0, 0] for _ in range(self.disks)]
+		self.net_io: List[List[int]] = [[0, 0] for _ in range(self.nics)]
+
+	@staticmethod
+	def _write(path: str, data: str):
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		with open(path, "w") as f:
+			f.write(data)
+
+	@staticmethod
+	def disk_name(num: int) -> str:
+		'''Device names like the kernel gives them, sda to sdz, then sdaa and onwards'''
+		name: str = ""
+		num += 1
+		while num:
+			num, rest = divmod(num - 1, 26)
+			name = chr(97 + rest) + name
+		return f'sd{name}'
+
+	def create(self):
+		self._write(f'{self.proc}/cpuinfo', "".join(f'processor\t: {n}\nmodel name\t: Fake CPU 9000 @ 2.00GHz\nphysical id\t: 0\ncore id\t\t: {n % max(1, self.cpus // 2)}\ncpu MHz\t\t: 2000.000\n\n' for n in range(self.cpus)))
+		self._write(f'{self.proc}/meminfo', "".join(f'{name}:{value:>16} kB\n' for name, value in [("MemTotal", 67108864), ("MemFree", 16777216), ("MemAvailable", 33554432), ("Buffers", 1048576),
+			("Cached", 8388608), ("SwapCached", 0), ("Active", 20971520), ("Inactive", 8388608), ("SwapTotal", 8388608), ("SwapFree", 4194304), ("Shmem", 524288), ("SReclaimable", 1048576)]))
+		self._write(f'{self.proc}/loadavg', f'{self.cpus * 0.5:.2f} {self.cpus * 0.4:.2f} {self.cpus * 0.3:.2f} 2/{self.processes} {self.processes + 1}\n')
+		self._write(f'{self.proc}/uptime', f'{time() - self.boot_time:.2f} 0.00\n')
+		self._write(f'{self.proc}/vmstat', "pswpin 1000\npswpout 2000\n")
+		self._write(f'{self.proc}/filesystems', "nodev\tsysfs\nnodev\tproc\nnodev\ttmpfs\n\text4\n\txfs\n")
+		mounts: str = ""
+		for n in range(self.disks):
+			os.makedirs(f'{self.root}/mnt/disk{n}', exist_ok=True)
+			mounts += f'/dev/{self.disk_name(n)}1 {self.root}/mnt/disk{n} {"ext4" if n % 2 == 0 else "xfs"} rw,relatime 0 0\n'
+		self._write(f'{self.proc}/self/mounts', mounts)
+		for n in range(self.nics):
+			self._write(f'{self.sys}/class/net/eth{n}/operstate', "up\n" if n < self.nics - 1 or self.nics == 1 else "down\n")
+		self._create_sensors()
+		for n in range(self.batteries):
+			self._write(f'{self.sys}/class/power_supply/BAT{n}/status', "Discharging\n" if n == 0 else "Full\n")
+			self._write(f'{self.sys}/class/power_supply/BAT{n}/capacity', f'{80 - n * 10}\n')
+		self._create_processes()
+		self.tick(1.0)
+
+	def _create_sensors(self):
+		cores: int = max(1, self.cpus // 2)
+		coretemp: str = f'{self.sys}/class/hwmon/hwmon0'
+		self._write(f'{coretemp}/name', "coretemp\n")
+		for n, label in enumerate(["Package id 0"] + [f'Core {c}' for c in range(cores)], start=1):
+			self._write(f'{coretemp}/temp{n}_label', f'{label}\n')
+			self._write(f'{coretemp}/temp{n}_input', f'{self.random.randint(35, 85) * 1000}\n')
+			self._write(f'{coretemp}/temp{n}_max', "80000\n")
+			self._write(f'{coretemp}/temp{n}_crit', "100000\n")
+		for n in range(1, self.sensors + 1):
+			self._write(f'{self.sys}/class/hwmon/hwmon{n}/name', "acpitz\n")
+			self._write(f'{self.sys}/class/hwmon/hwmon{n}/temp1_input', f'{self.random.randint(25, 60) * 1000}\n')
+
+	def _create_processes(self):
+		'''Processes with pid 1 as root of all, parents are mostly the previous process to get deep trees'''
+		depths: Dict[int, int] = {1 : 0}
+		names: List[str] = ["bash", "python3", "postgres", "nginx", "java", "node", "sshd", "kworker/0:1", "systemd-journald", "containerd-shim-runc-v2"]
+		for pid in range(1, self.processes + 1):
+			if pid == 1:
+				ppid = 0
+			elif depths[pid - 1] < self.depth and self.random.random() < 0.6:
+				ppid = pid - 1
+			else:
+				ppid = self.random.randint(1, pid - 1)
+				while depths[ppid] >= self.depth: ppid = self.random.randint(1, ppid)
+			if pid > 1: depths[pid] = depths[ppid] + 1
+			name: str = "init" if pid == 1 else self.random.choice(names)
+			threads: int = self.random.randint(1, 64)
+			rss: int = self.random.randint(100, 200000)
+			utime, stime = self.random.randint(0, 100000), self.random.randint(0, 10000)
+			start: int = self.random.randint(0, 8640000)
+			uid: int = self.random.choice([0, 0, 1000, 65534])
+			self._write(f'{self.proc}/{pid}/stat', f'{pid} ({name[:15]}) S {ppid} {pid} {pid} 0 -1 4194560 1000 0 0 0 {utime} {stime} 0 0 20 0 {threads} 0 {start} {rss * 8192} {rss}'
+				f' 18446744073709551615 1 1 0 0 0 0 0 0 0 0 0 0 17 {pid % self.cpus} 0 0 0 0 0 0 0 0 0 0 0 0 0\n')
+			self._write(f'{self.proc}/{pid}/statm', f'{rss * 2} {rss} {rss // 4} 100 0 {rss} 0\n')
+			self._write(f'{self.proc}/{pid}/status', f'Name:\t{name[:15]}\nUmask:\t0022\nState:\tS (sleeping)\nTgid:\t{pid}\nNgid:\t0\nPid:\t{pid}\nPPid:\t{ppid}\nTracerPid:\t0\n'
+				f'Uid:\t{uid}\t{uid}\t{uid}\t{uid}\nGid:\t{uid}\t{uid}\t{uid}\t{uid}\nVmRSS:\t{rss * 4} kB\nThreads:\t{threads}\n'
+				f'voluntary_ctxt_switches:\t100\nnonvoluntary_ctxt_switches:\t10\n')
+			self._write(f'{self.proc}/{pid}/cmdline', "" if name.startswith("kworker") else f'/usr/bin/{name}\x00--worker\x00{pid}\x00')
+
+	def tick(self, seconds: float = 1.0):
+		'''Rewrite cpu times, disk io and network counters with usage added for <seconds>'''
+		ticks: int = round(100 * seconds)
+		for times in self.cpu_times:
+			busy: int = self.random.randint(0, ticks)
+			user: int = self.random.randint(0, busy)
+			times[0] += user
+			times[2] += busy - user
+			times[3] += ticks - busy
+		total: List[int] = [sum(times[n] for times in self.cpu_times) for n in range(10)]
+		self._write(f'{self.proc}/stat', f'cpu  {" ".join(str(t) for t in total)}\n' + "".join(f'cpu{n} {" ".join(str(t) for t in times)}\n' for n, times in enumerate(self.cpu_times)) +
+			f'intr 0\nctxt 0\nbtime {self.boot_time}\nprocesses {self.processes}\nprocs_running 1\nprocs_blocked 0\n')
+		for io in self.disk_io:
+			io[0] += self.random.randint(0, 200000)
+			io[1] += self.random.randint(0, 200000)
+		self._write(f'{self.proc}/diskstats', "".join(f'   8 {n * 16:>7} {self.disk_name(n)} 1000 0 {io[0]} 100 500 0 {io[1]} 50 0 150 150 0 0 0 0\n'
+			f'   8 {n * 16 + 1:>7} {self.disk_name(n)}1 1000 0 {io[0]} 100 500 0 {io[1]} 50 0 150 150 0 0 0 0\n' for n, io in enumerate(self.disk_io)))
+		for io in self.net_io:
+			io[0] += self.random.randint(0, 10 << 20)
+			io[1] += self.random.randint(0, 1 << 20)
+		self._write(f'{self.proc}/net/dev', "Inter-|   Receive                                                |  Transmit\n"
+			" face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n" +
+			"".join(f'  eth{n}: {io[0]} 1000 0 0 0 0 0 0 {io[1]} 1000 0 0 0 0 0 0\n' for n, io in enumerate(self.net_io)))
+
+if __name__ == "__main__":
+	if len(sys.argv) < 2:
+		print(__doc__.splitlines()[-1])
+		raise SystemExit(1)
+	FakeRoot(sys.argv[1], *[int(arg) for arg in sys.argv[2:9]]).create()
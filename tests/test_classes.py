@@ -1,7 +1,10 @@
-import bpytop, pytest
-from bpytop import Box, SubBox, CpuBox, MemBox, NetBox, ProcBox, Term, Draw
-from bpytop import Graph, Fx, Meter, Color, Banner
-from bpytop import Collector, CpuCollector, MemCollector, NetCollector, ProcCollector
+import bpytop, pytest, io, os, sys, threading
+from contextlib import redirect_stdout
+from typing import List
+from time import sleep, perf_counter
+from bpytop import Box, SubBox, CpuBox, MemBox, NetBox, ProcBox, Term, Draw, Screen
+from bpytop import Graph, Fx, Meter, Color, Banner, Series
+from bpytop import Collector, CpuCollector, MemCollector, NetCollector, ProcCollector, CpuStat, Recorder, Stats, SelfStat
 bpytop.Term.width, bpytop.Term.height = 80, 25
 
 def test_Fx_uncolor():
@@ -18,6 +21,59 @@ def test_Theme():
 	assert list(bpytop.THEME.main_fg) == [204, 204, 204]
 	assert len(bpytop.THEME.gradient["cpu"]) == 101
 
+def test_Screen_render():
+	Screen.reset()
+	frame = f'{Fx.reset}{bpytop.Mv.to(2, 3)}{Color.fg("#00ff00")}TEST{bpytop.create_box(x=10, y=5, width=20, height=5, title="test")}'
+	first = Screen.render(frame)
+	assert "TEST" in first
+	assert Screen.render(frame) == ""
+	assert Fx.uncolor(Screen.render(f'{Fx.reset}{bpytop.Mv.to(2, 3)}{Color.fg("#00ff00")}TEXT')) == "\x1b[2;5fX"
+	Screen.reset()
+	updates = Screen.render(frame) + Screen.render(bpytop.create_box(x=12, y=6, width=30, height=8, title="test2"))
+	glyphs, styles = [row[:] for row in Screen.glyphs], [row[:] for row in Screen.styles]
+	Screen.resize()
+	Screen.render(updates)
+	assert Screen.glyphs == glyphs and Screen.styles == styles
+
+def test_Minimizer():
+	size = bpytop.Term.width, bpytop.Term.height
+	bpytop.Term.width, bpytop.Term.height = 80, 24
+	bpytop.Minimizer.reset()
+	Mv = bpytop.Mv
+	out = bpytop.Minimizer.render(f'\033[0m{Mv.to(1, 1)}\033[38;5;1m\033[38;5;1mab\033[22m{Mv.to(1, 3)}c{Mv.r(2)}{Mv.d(1)}\033[1md\033[0m{Mv.save}\033[1m{Mv.to(5, 5)}{Mv.restore}e')
+	assert out == "\033[1;1f\033[0;38;5;1mabc\033[2;6f\033[1md\033[s\033[39me"
+	assert bpytop.Minimizer.render("\033[1mf") == "f"
+	bpytop.Term.width, bpytop.Term.height = size
+
+def test_Draw_write(monkeypatch):
+	read_fd, write_fd = os.pipe()
+	os.set_blocking(write_fd, False)
+	monkeypatch.setattr(sys, "stdout", os.fdopen(write_fd, "w"))
+	monkeypatch.setattr(sys, "__stdout__", sys.stdout)
+	monkeypatch.setattr(bpytop.CONFIG, "diff_draw", False)
+	monkeypatch.setattr(bpytop.CONFIG, "minimize_escapes", False)
+	monkeypatch.setattr(bpytop.CONFIG, "sync_output", True)
+	received: List[bytes] = []
+	def read():
+		sleep(0.05)
+		received.extend(iter(lambda: os.read(read_fd, 4096), b""))
+	reader = threading.Thread(target=read)
+	reader.start()
+	Draw.now("ab€" * 100000, sync=True)
+	Draw.now("c")
+	sys.stdout.close()
+	reader.join()
+	os.close(read_fd)
+	assert b"".join(received) == f'{Term.sync_start}{"ab€" * 100000}{Term.sync_end}c'.encode("utf-8")
+
+def test_Draw_write_redirected(monkeypatch):
+	monkeypatch.setattr(bpytop.CONFIG, "diff_draw", False)
+	monkeypatch.setattr(bpytop.CONFIG, "minimize_escapes", False)
+	buffer = io.StringIO()
+	with redirect_stdout(buffer):
+		Draw.now("ab€")
+	assert buffer.getvalue() == "ab€"
+
 def test_Box_calc_sizes():
 	Box.calc_sizes()
 	assert CpuBox.width == MemBox.width + ProcBox.width == NetBox.width + ProcBox.width == 80
@@ -29,13 +85,134 @@ def test_Graph():
 	assert str(test_graph).endswith("⣀⣤⣴⣾⣿⣿⣿⣿⣿")
 	assert test_graph(5).endswith("⣧")
 
+def test_Series():
+	series = Series(4)
+	assert not series and series[:] == []
+	for value in range(1, 7):
+		series.append(value)
+	assert len(series) == 4 and series == [3, 4, 5, 6]
+	assert series[0] == 3 and series[-1] == 6 and series[-3:] == [4, 5, 6] and series[::2] == [3, 5]
+	with pytest.raises(IndexError):
+		series[4]
+	series.resize(2)
+	assert series == [5, 6]
+	series.resize(5)
+	series.append(7)
+	assert series == [5, 6, 7] and series.capacity == 5
+	data = Series(40)
+	for value in range(40):
+		data.append(value)
+	assert str(Graph(20, 10, None, data)) == str(Graph(20, 10, None, list(range(40))))
+
+def test_Series_persist(tmp_path):
+	Series.path = str(tmp_path)
+	series = Series(4, "q", name="test")
+	for value in range(1, 7):
+		series.append(value << 40)
+	assert series.file is not None and (tmp_path / "test.ring").exists()
+	assert Series(2, "q", name="test") == [value << 40 for value in [3, 4, 5, 6]]
+	series.resize(2)
+	assert Series(1, "q", name="test") == [5 << 40, 6 << 40]
+	assert Series(8, "q", name="test") == [5 << 40, 6 << 40]
+	assert Series(4, "h", name="test") == []
+	Series.path = ""
+	assert Series(4, "q", name="test").file is None
+
+def test_Series_use(tmp_path):
+	other = os.open(tmp_path, os.O_RDONLY)
+	bpytop.fcntl.flock(other, bpytop.fcntl.LOCK_EX | bpytop.fcntl.LOCK_NB)
+	assert not Series.use(str(tmp_path)) and Series.path == ""
+	os.close(other)
+	assert Series.use(str(tmp_path)) and Series.path == str(tmp_path)
+	os.close(Series.lock_fd)
+	Series.lock_fd, Series.path = -1, ""
+
 def test_Meter():
 	test_meter = Meter(value=100, width=20, gradient_name="cpu", invert=False)
 	assert Fx.uncolor(str(test_meter)) == "■■■■■■■■■■■■■■■■■■■■"
 
+def test_Meter_cache():
+	first, second = Meter(10, 15, "used"), Meter(90, 15, "used")
+	assert first.saved is second.saved and len(first.saved) == 101
+	assert Fx.uncolor(first(50)) == "■" * 15 and first(100) != first(0)
+	assert Meter(10, 15, "used", invert=True).saved is not first.saved
+	bpytop.THEME(bpytop.THEME.current)
+	assert Meter(10, 15, "used").saved is not first.saved
+	assert len(Meter.cache) <= Meter.cache_size
+
+def test_Theme_compiled(tmp_path, monkeypatch):
+	monkeypatch.setattr(bpytop, "CONFIG_DIR", str(tmp_path))
+	monkeypatch.setattr(bpytop.Theme, "compiled", {})
+	theme = bpytop.Theme("Default")
+	gradient, main_fg = list(theme.gradient["cpu"]), theme.main_fg
+	assert len(gradient) == 101 and list(tmp_path.glob("cache/theme-Default-*.json"))
+	bpytop.Theme.compiled.clear()
+	theme("Default")
+	assert theme.gradient["cpu"] == gradient and str(theme.main_fg) == str(main_fg) and tuple(theme.main_fg) == tuple(main_fg)
+	assert theme._compile(bpytop.DEFAULT_THEME)["gradient"]["cpu"] == gradient
+
 def test_Banner():
 	assert len(Banner.draw(line=1, col=1, center=False, now=False)) == 2477
 
+def test_Collector_interval():
+	bpytop.CONFIG.update_ms = 1000
+	bpytop.CONFIG.proc_update_mult = 2
+	bpytop.CONFIG.collector_intervals = "cpu:250, disks:5000"
+	assert CpuCollector.interval() == 0.25
+	assert NetCollector.interval() == 1.0
+	assert ProcCollector.interval() == 2.0
+	MemCollector.disks_due = 0.0
+	MemCollector.schedule(100.0)
+	assert MemCollector.collect_disks and MemCollector.disks_due == 105.0 and MemCollector.due == 101.0
+	MemCollector.schedule(101.0)
+	assert not MemCollector.collect_disks and MemCollector.next_due() == 102.0
+	bpytop.CONFIG.collector_intervals = ""
+	Collector.reset_due()
+	assert MemCollector.collect_disks
+
+def test_Collector_adaptive_intervals():
+	bpytop.CONFIG.update_ms, bpytop.CONFIG.proc_update_mult = 1000, 2
+	bpytop.CONFIG.adaptive_intervals = True
+	Collector.costs = { "cpu" : 0.001, "proc" : 0.4, "proc_draw" : 0.1, "net" : 5.0 }
+	assert CpuCollector.interval() == 1.0
+	assert ProcCollector.interval() == 5.0 and ProcCollector.interval(base=True) == 2.0
+	assert NetCollector.interval() == 10.0
+	bpytop.Box.boxes = ["cpu", "proc"]
+	assert bpytop.Box.update_string() == "1000ms ~5000ms"
+	bpytop.CONFIG.adaptive_intervals = False
+	assert ProcCollector.interval() == 2.0 and bpytop.Box.update_string() == "1000ms"
+	Collector.costs = {}
+
+def test_Collector_collect_parallel():
+	bpytop.CONFIG.collect_timeout = 5000
+	bpytop.CONFIG.check_temp = False
+	bpytop.Box.boxes = ["cpu", "net"]
+	ready, titles = Collector._collect_parallel([CpuCollector, NetCollector])
+	assert ready == [CpuCollector, NetCollector] and titles == []
+	assert not CpuCollector.stale and not Collector.busy(NetCollector)
+	assert "cpu" in Collector.timings and "net" in Collector.timings
+
+def test_Collector_resize_history(monkeypatch):
+	bpytop.CONFIG.check_temp = False
+	monkeypatch.setattr(Term, "width", 80)
+	monkeypatch.setattr(Term, "height", 25)
+	Box.calc_sizes()
+	assert CpuCollector.resize_history and NetCollector.resize_history
+	Collector._timed_collect(CpuCollector)
+	assert not CpuCollector.resize_history
+	assert CpuCollector.cpu_usage[0].capacity == 320 and CpuCollector.cpu_usage[1].capacity == 160
+
+def test_Stats():
+	for value in range(1, Stats.size + 101):
+		Stats.add("test", "collect", value)
+	assert len(Stats.samples["test"]["collect"]) == Stats.size
+	assert Stats.percentiles("test", "collect") == (229, 344, 356)
+	assert Stats.percentiles("test", "draw") == (0.0, 0.0, 0.0)
+	bpytop.CONFIG.check_temp = False
+	Collector._timed_collect(CpuCollector)
+	assert Stats.samples["cpu"]["collect"][-1] >= 0 and Stats.samples["cpu"]["rw_calls"][-1] >= 0
+	del Stats.samples["test"]
+
 def test_CpuCollector_collect():
 	bpytop.CONFIG.check_temp = False
 	CpuCollector._collect()
@@ -44,6 +221,56 @@ def test_CpuCollector_collect():
 	assert isinstance(CpuCollector.load_avg, list)
 	assert isinstance(CpuCollector.uptime, str)
 
+def test_CpuStat_sample():
+	if bpytop.SYSTEM != "Linux":
+		pytest.skip("Not testing /proc/stat sampling on other systems than Linux!")
+	CpuStat.last = {}
+	total, fields, threads = CpuStat.sample()
+	assert total == 0.0 and not any(fields.values()) and not any(threads.values())
+	total, fields, threads = CpuStat.sample()
+	assert 0.0 <= total <= 100.0
+	assert set(fields) <= set(CpuStat.fields) and "idle" in fields
+	assert len(threads) == bpytop.THREADS
+	assert CpuStat.boot_time > 0
+	assert len(CpuStat.load_avg()) == 3
+
+def test_SelfStat():
+	SelfStat.last = (0.0, 0.0, 0)
+	assert not SelfStat.sample()
+	SelfStat.last = (SelfStat.last[0] - 1.0, *SelfStat.last[1:])
+	assert SelfStat.sample()
+	assert SelfStat.rss > 0 and SelfStat.threads > 0 and SelfStat.cpu >= 0.0
+	bpytop.CONFIG.update_ms, bpytop.CONFIG.self_limit = 2000, 10
+	SelfStat.history.extend([50.0] * 5)
+	assert SelfStat.adapt() and bpytop.CONFIG.update_ms == 2200
+	SelfStat.history.extend([1.0] * 5)
+	assert SelfStat.adapt() and bpytop.CONFIG.update_ms == 2000 and not SelfStat.raised
+	SelfStat.history.extend([50.0] * 5)
+	SelfStat.adapt()
+	SelfStat.restore()
+	assert bpytop.CONFIG.update_ms == 2000 and not SelfStat.raised
+	bpytop.CONFIG.self_limit = 0
+
+def test_SelfStat_register(monkeypatch):
+	if not os.path.isdir("/proc/self/task"):
+		pytest.skip("Not testing thread names on systems without /proc/self/task!")
+	SelfStat.names.clear()
+	stop = threading.Event()
+	def task():
+		#* Thread startup itself uses threading.get_native_id on python 3.8+, only hide it while registering
+		monkeypatch.delattr(threading, "get_native_id", raising=False)
+		SelfStat.register("test")
+		monkeypatch.undo()
+		stop.wait(5)
+	thread = threading.Thread(target=task)
+	thread.start()
+	sleep(0.05)
+	assert list(SelfStat.names.values()) == ["test"] and str(list(SelfStat.names)[0]) in os.listdir("/proc/self/task")
+	SelfStat.last = (perf_counter() - 1.0, 0.0, 0)
+	assert SelfStat.sample() and "test" in SelfStat.tasks and "main" in SelfStat.tasks
+	stop.set()
+	thread.join()
+
 def test_CpuCollector_get_sensors():
 	bpytop.CONFIG.check_temp = True
 	bpytop.CONFIG.cpu_sensor = "Auto"
@@ -105,6 +332,120 @@ def test_ProcCollector_collect():
 	ProcCollector._collect()
 	assert len(ProcCollector.processes) > 0
 
+def test_ProcCollector_sort_key():
+	bpytop.CONFIG.proc_tree = False
+	bpytop.CONFIG.proc_sorting = "pid"
+	bpytop.CONFIG.proc_reversed = True
+	bpytop.Box.boxes = ["proc"]
+	ProcBox.start, ProcBox.select_max = 1, 1
+	ProcCollector._collect()
+	assert 0 < len(ProcCollector.processes) <= ProcCollector.num_procs
+	assert list(ProcCollector.processes) == sorted(ProcCollector.processes)
+	for sorting in bpytop.CONFIG.sorting_options:
+		assert callable(ProcCollector.sort_key(sorting))
+	bpytop.CONFIG.proc_reversed = False
+
+def test_ProcCollector_snapshot():
+	bpytop.CONFIG.proc_tree = False
+	bpytop.Box.boxes = ["proc"]
+	ProcCollector._collect()
+	snap = ProcCollector.snapshot
+	assert snap.processes is ProcCollector.processes and snap.num_procs == ProcCollector.num_procs
+	assert snap.rows == list(snap.processes.items())
+	assert snap.details_cpu == ProcCollector.details_cpu[:] and snap.details_cpu is not ProcCollector.details_cpu
+	ProcCollector._collect()
+	assert ProcCollector.snapshot is not snap and snap.processes is not ProcCollector.processes
+
+def test_ProcCollector_collect_native():
+	if bpytop.SYSTEM != "Linux":
+		pytest.skip("Not testing native /proc reading on other systems than Linux!")
+	bpytop.CONFIG.proc_native = True
+	bpytop.CONFIG.proc_tree = False
+	bpytop.Box.boxes = ["proc"]
+	ProcCollector._collect()
+	assert len(ProcCollector.processes) > 0 and bpytop.CONFIG.proc_native
+	bpytop.CONFIG.proc_tree = True
+	ProcCollector.processes = {}
+	ProcCollector._collect()
+	assert len(ProcCollector.processes) > 0 and bpytop.CONFIG.proc_native
+	bpytop.CONFIG.proc_native = False
+
+def test_ProcCollector_native_error(monkeypatch):
+	if bpytop.SYSTEM != "Linux":
+		pytest.skip("Not testing native /proc reading on other systems than Linux!")
+	def fail():
+		raise OSError("gone")
+	monkeypatch.setattr(bpytop.ProcReader, "process_iter", fail)
+	monkeypatch.setattr(bpytop.CONFIG, "proc_native", True)
+	assert not isinstance(ProcCollector._process_iter(0.0), list)
+	assert bpytop.ProcReader.error and bpytop.CONFIG.proc_native
+	bpytop.ProcReader.error = False
+
+def test_Probe():
+	bpytop.Probe.wait()
+	assert bpytop.Probe.done.is_set() and isinstance(bpytop.CPU_NAME, str)
+	assert bpytop.CONFIG.cpu_sensors[0] == "Auto" and "total" in bpytop.CONFIG.cpu_percent_fields
+	assert bpytop.CONFIG.cpu_sensor in bpytop.CONFIG.cpu_sensors and bpytop.CONFIG.cpu_graph_upper in bpytop.CONFIG.cpu_percent_fields
+
+def test_Probe_cache(tmp_path, monkeypatch):
+	monkeypatch.setattr(bpytop, "CONFIG_DIR", str(tmp_path))
+	monkeypatch.setattr(bpytop.Probe, "cache", {})
+	calls = []
+	def probe():
+		calls.append(1)
+		return "probed"
+	assert bpytop.Probe.get("test", probe) == "probed" and bpytop.Probe.get("test", probe) == "probed" and len(calls) == 1
+	bpytop.Probe.save()
+	assert (tmp_path / "probes.json").is_file()
+	bpytop.Probe.cache = {}
+	assert bpytop.Probe.get("test", probe) == "probed" and len(calls) == 1
+	monkeypatch.setattr(bpytop, "ARG_REFRESH_PROBES", True)
+	bpytop.Probe.cache = {}
+	assert bpytop.Probe.get("test", probe) == "probed" and len(calls) == 2
+	monkeypatch.setattr(bpytop, "ARG_REFRESH_PROBES", False)
+	monkeypatch.setattr(bpytop, "THREADS", bpytop.THREADS + 1)
+	bpytop.Probe.cache = {}
+	assert bpytop.Probe.get("test", probe) == "probed" and len(calls) == 3
+
+def test_Headless_fields():
+	bpytop.CONFIG.check_temp = False
+	bpytop.Box.boxes = ["cpu", "mem", "net", "proc"]
+	for collector in [CpuCollector, MemCollector, NetCollector, ProcCollector]:
+		collector._collect()
+	record = { name : get() for name, (collector, get) in bpytop.Headless.fields.items() }
+	assert isinstance(record["cpu"], int) and len(record["cpu_cores"]) == bpytop.THREADS
+	assert record["mem_total"] == MemCollector.values["total"]
+	assert all(isinstance(disk[name], int) for disk in record["disks"].values() for name in ["total", "used", "free", "read", "write"])
+	assert len(record["procs"]) <= bpytop.ARG_TOP and record["procs_total"] == ProcCollector.num_procs
+
+def test_Headless_table():
+	bpytop.CONFIG.check_temp = False
+	bpytop.Box.boxes = ["cpu", "mem", "net", "proc"]
+	for collector in [CpuCollector, MemCollector, NetCollector, ProcCollector]:
+		collector._collect()
+	table = bpytop.Headless.table(60).splitlines()
+	assert table[0].startswith("bpytop - ") and table[1].startswith("Cpu: ")
+	assert all(len(line) <= 60 for line in table) and "\033" not in "".join(table)
+	header = table.index("") + 1
+	assert table[header].split()[:2] == ["PID", "USER"]
+	assert 0 < len(table) - header - 1 <= bpytop.ARG_TOP
+
+def test_Recorder(tmp_path):
+	bpytop.CONFIG.show_disks = False
+	Recorder.start(str(tmp_path / "samples.gz"))
+	for _ in range(2):
+		Recorder.collect(MemCollector)
+	recorded = MemCollector.values.copy()
+	Recorder.stop()
+	Recorder.load(str(tmp_path / "samples.gz"))
+	assert Recorder.ticks(MemCollector) == 2 and Recorder.ticks(CpuCollector) == 0
+	Recorder.collect(MemCollector)
+	Recorder.collect(MemCollector)
+	assert MemCollector.values == recorded
+	with pytest.raises(EOFError):
+		Recorder.collect(MemCollector)
+	Recorder.mode = ""
+
 def test_CpuBox_draw():
 	Box.calc_sizes()
 	assert len(CpuBox._draw_bg()) > 1
@@ -129,3 +470,23 @@ def test_ProcBox_draw():
 	assert len(ProcBox._draw_bg()) > 1
 	ProcBox._draw_fg()
 	assert "proc" in Draw.strings
+
+def test_ProcBox_rows():
+	snapshot = ProcCollector.snapshot
+	processes = {pid : { "name" : f'prog{pid}', "cmd" : f'prog{pid} --arg', "threads" : 1, "username" : "user", "mem" : 0.5, "mem_b" : 1024, "cpu" : 0.0 } for pid in range(100, 150)}
+	ProcCollector.snapshot = ProcCollector.Snapshot(processes, len(processes), False, {}, [], [], 0, list(processes.items()))
+	Box.calc_sizes()
+	ProcBox.start, ProcBox.selected = 1, 0
+	ProcBox._draw_fg()
+	assert all(f'prog{pid}' in Draw.strings["proc"] for pid in range(100, 100 + ProcBox.select_max))
+	assert "prog150" not in Draw.strings["proc"]
+	ProcBox._draw_fg()
+	assert "prog" not in Draw.strings["proc"] and "prog100" in Draw.saved["proc"]
+	processes = {**processes, 101 : dict(processes[101], cpu=0.5)}
+	ProcCollector.snapshot = ProcCollector.Snapshot(processes, len(processes), False, {}, [], [], 0, list(processes.items()))
+	ProcBox._draw_fg()
+	assert "prog101" in Draw.strings["proc"] and "prog100" not in Draw.strings["proc"]
+	ProcBox.start = 2
+	ProcBox._draw_fg()
+	assert "prog101" in Draw.strings["proc"] and "prog100" not in Draw.strings["proc"]
+	ProcCollector.snapshot = snapshot
@@ -1,13 +1,29 @@
+import pytest
 from more_itertools import divide
 
 import bpytop
 from bpytop import (CORES, SYSTEM, THREADS, Fx, create_box, floating_humanizer,
-                    get_cpu_core_mapping, get_cpu_name, units_to_bytes)
+                    get_cpu_core_mapping, get_cpu_name, strtobool, units_to_bytes)
 
 
 def test_get_cpu_name():
 	assert isinstance(get_cpu_name(), str)
 
+def test_strtobool():
+	assert strtobool("True") and strtobool("on") and strtobool("1")
+	assert not strtobool("False") and not strtobool("no") and not strtobool("0")
+	with pytest.raises(ValueError):
+		strtobool("maybe")
+
+def test_parse_args(monkeypatch):
+	monkeypatch.setattr(bpytop.CONFIG, "shown_boxes", bpytop.CONFIG.shown_boxes)
+	bpytop.parse_args(["-b", "cpu foo proc", "--top", "5", "-n", "2"])
+	assert bpytop.ARG_TOP == 5 and bpytop.ARG_COUNT == 2 and bpytop.CONFIG.shown_boxes == "cpu proc"
+	bpytop.parse_args([])
+	assert bpytop.ARG_TOP == 10 and bpytop.ARG_COUNT == 0 and bpytop.ARG_DELAY is None
+	with pytest.raises(SystemExit):
+		bpytop.parse_args(["-v"])
+
 def test_get_cpu_core_mapping():
 	cpu_core_mapping = get_cpu_core_mapping()
 	assert isinstance(cpu_core_mapping, list)
@@ -32,3 +48,20 @@ def test_units_to_bytes():
 	assert units_to_bytes("10kbits") == 1280
 	assert units_to_bytes("100Mbytes") == 104857600
 	assert units_to_bytes("1gbit") == 134217728
+
+def test_set_fs_root(tmp_path):
+	if SYSTEM != "Linux":
+		pytest.skip("Not testing generated /proc and /sys on other systems than Linux!")
+	from tests.fakeroot import FakeRoot
+	FakeRoot(str(tmp_path), cpus=4, processes=50, disks=2, nics=1, sensors=1, batteries=1).create()
+	bpytop.set_fs_root(str(tmp_path))
+	try:
+		assert bpytop.THREADS == 4 and bpytop.CORES == 2 and len(bpytop.CORE_MAP) == 4
+		assert len(bpytop.CpuStat.sample()[2]) == 4
+		assert [entry.label for entry in bpytop.sensors_temperatures()["coretemp"]][:2] == ["Package id 0", "Core 0"]
+		assert bpytop.net_if_stats()["eth0"].isup
+		assert bpytop.sensors_battery().percent == 80
+		assert len(bpytop.ProcReader.process_iter()) == 50
+	finally:
+		bpytop.set_fs_root("")
+	assert bpytop.THREADS == THREADS and bpytop.PROC_PATH == "/proc"